@@ -0,0 +1,307 @@
+import argparse
+import json
+import os
+import sys
+from typing import Any
+
+from Controller.DaemonClient import DaemonClient
+from Model.Building.BuildResult import BuildResult
+from Model.Building.BuildScheduler import BuildScheduler
+from Model.Creators.Creator import Creator
+from Model.Creators.CreatorListener import CreatorListener
+from Model.Creators.CreatorsRegistry import CreatorsRegistry, CreatorEntry
+from Model.Creators.OperateVariablesCreator import OperateVariablesCreator
+from Model.Pipeline.Recipe import Recipe
+from Model.Pipeline.RecipeExecutor import RecipeExecutor
+from Model.Pipeline.RecipeListener import RecipeListener
+from Model.SourceFiles.FileStateCache import FileStateCache
+from Model.SourceFiles.SourceFilesLinker import SourceFilesLinker
+from Model.Variables.VariablesConsumer import VariablesConsumer
+from Model.Variables.VariablesFileOperator import VariablesFileOperator
+from Model.Variables.VariablesStore import VariablesStore
+from Model.Variables.variables_namespace import TEXT_EDITOR_VARIABLE
+from settings_namespace import GENERATED_FILES, ENCODING, SETTINGS_FILE_NAME
+from src.Model.Opening.ProjectOpener import ProjectOpener
+
+
+class CommandLineController(CreatorListener, RecipeListener):
+    """
+    Headless counterpart of MainController - project is linked, built and changed by creators
+    without GUI, so it can be used by scripts and CI. Qt is never imported on this path,
+    creators get their data from arguments instead of dialogs.
+    """
+    PROGRAM_NAME: str = 'latex-report-generator'
+    PARAMETER_SEPARATOR: str = '='
+    OPENING_ERROR_MESSAGE: str = 'Project cannot be opened'
+    LINKING_ERROR_MESSAGE: str = 'Linking error'
+    UNKNOWN_CREATOR_MESSAGE: str = 'Unknown creator'
+    INVALID_RECIPE_MESSAGE: str = 'Recipe cannot be read or its steps depend on each other in cycle'
+    PARAMETERS_ERROR_MESSAGE: str = 'Invalid parameters'
+    OPERATION_FAILURE_MESSAGE: str = 'Operation failed'
+    CREATOR_IMPORT_ERROR_MESSAGE: str = 'Creator cannot be imported'
+    SUCCESS_CODE: int = 0
+    FAILURE_CODE: int = 1
+
+    def __init__(self) -> None:
+        CreatorListener.__init__(self)
+        RecipeListener.__init__(self)
+        self.project_directory: str = ''
+        self.settings: dict[str, str] = {}
+        # variables of no project, until project is opened
+        self.variables: VariablesStore = VariablesStore('')
+        self.creators_registry: CreatorsRegistry = CreatorsRegistry()
+        # states of settings and variables files, when they were read or written by controller
+        self._project_state: tuple | None = None
+
+    @staticmethod
+    def create_parser() -> argparse.ArgumentParser:
+        parser: argparse.ArgumentParser = argparse.ArgumentParser(prog=CommandLineController.PROGRAM_NAME)
+        parser.add_argument('--no-daemon', action='store_true', help='run command in this process, not in daemon')
+        commands = parser.add_subparsers(dest='command', required=True)
+
+        link_parser: argparse.ArgumentParser = commands.add_parser('link', help='link source files into document')
+        link_parser.add_argument('project', help='directory of project')
+        link_parser.add_argument('--soft', action='store_true', help='replace marks in source files only')
+
+        build_parser: argparse.ArgumentParser = commands.add_parser('build', help='link source files and build pdf')
+        build_parser.add_argument('project', help='directory of project')
+        build_parser.add_argument('--only', nargs='+', metavar='SOURCE_FILE', default=[],
+                                  help='build only selected source files (\\includeonly)')
+
+        script_parser: argparse.ArgumentParser = commands.add_parser('run-script', help='run variables script')
+        script_parser.add_argument('project', help='directory of project')
+        script_parser.add_argument('script', help='python script with run(variables) function')
+
+        create_parser: argparse.ArgumentParser = commands.add_parser('create', help='use creator')
+        create_parser.add_argument('project', help='directory of project')
+        create_parser.add_argument('creator', help='title or class name of creator')
+        create_parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                                   help='parameter of creator, value is read as JSON if it is valid JSON')
+        create_parser.add_argument('--params', metavar='JSON_FILE', help='JSON object with parameters of creator')
+
+        recipe_parser: argparse.ArgumentParser = commands.add_parser('run-recipe',
+                                                                     help='run steps of recipe, which inputs changed')
+        recipe_parser.add_argument('project', help='directory of project')
+        recipe_parser.add_argument('recipe', help='JSON file with steps of recipe')
+        recipe_parser.add_argument('--force', action='store_true', help='run all steps')
+        recipe_parser.add_argument('--workers', type=int, default=RecipeExecutor.MAX_WORKERS,
+                                   help='maximal number of concurrently running steps')
+
+        commands.add_parser('list-creators', help='list creators and their parameters')
+        commands.add_parser('serve', help='run daemon, which keeps libraries and projects loaded for commands')
+        commands.add_parser('stop', help='stop running daemon')
+        return parser
+
+    def report(self, message: str) -> None:
+        print(message, file=sys.stderr)
+
+    def notify_about_result_of_main_function(self, result: bool):
+        if not result:
+            self.report(CommandLineController.OPERATION_FAILURE_MESSAGE)
+
+    def notify_about_build_progress(self, message: str) -> None:
+        self.report(message)
+
+    def notify_about_build_result(self, result: BuildResult) -> None:
+        self.report(result.get_summary())
+
+    def notify_about_step_result(self, step_name: str, status: str, message: str = '') -> None:
+        self.report(f'{step_name}: {status}: {message}' if message else f'{step_name}: {status}')
+
+    def get_project_state(self) -> tuple | None:
+        """
+        :return: states of settings and variables files of open project or None, if they can't be trusted
+        """
+        states: list[tuple[int, int, int] | None] = [
+            FileStateCache.get_file_state(filepath)
+            for filepath in [os.path.join(self.project_directory, SETTINGS_FILE_NAME),
+                             VariablesStore.get_manifest_path(self.project_directory)]]
+        if any(state is not None and FileStateCache.is_racy(state) for state in states):
+            return None
+        return tuple(states)
+
+    def open_project(self, project_directory: str) -> bool:
+        """
+        Project, which is already open and wasn't changed by anyone else (GUI...), isn't read again
+        """
+        project_directory = os.path.abspath(project_directory)
+        if (project_directory == self.project_directory and self._project_state is not None
+                and self._project_state == self.get_project_state()):
+            return True
+        self.project_directory = project_directory
+        self._project_state = None
+        opener: ProjectOpener = ProjectOpener(project_directory)
+        if not opener.open_project():
+            return False
+        self.settings = opener.get_settings()
+        self.variables = opener.get_variables()
+        if TEXT_EDITOR_VARIABLE not in self.variables:
+            self.variables[TEXT_EDITOR_VARIABLE] = ''
+        self._project_state = self.get_project_state()
+        return True
+
+    def save_variables(self) -> bool:
+        was_saved: bool = VariablesFileOperator(self.project_directory).save_variables(self.variables)
+        self._project_state = self.get_project_state() if was_saved else None
+        return was_saved
+
+    @staticmethod
+    def parse_parameters(raw_parameters: list[str], parameters_path: str | None) -> dict[str, Any] | None:
+        """
+        :return: parameters of creator - parameters from file are overridden by single ones,
+        None if they can't be read
+        """
+        parameters: dict[str, Any] = {}
+        if parameters_path is not None:
+            try:
+                with open(parameters_path, encoding=ENCODING) as parameters_file:
+                    parameters = json.load(parameters_file)
+            except (OSError, json.JSONDecodeError):
+                return None
+            if not isinstance(parameters, dict):
+                return None
+        for raw_parameter in raw_parameters:
+            name, separator, value = raw_parameter.partition(CommandLineController.PARAMETER_SEPARATOR)
+            if separator == '':
+                return None
+            try:
+                parameters[name] = json.loads(value)
+            except json.JSONDecodeError:
+                parameters[name] = value
+        return parameters
+
+    def perform_creator(self, creator_class: type[Creator], parameters: dict[str, Any]) -> bool:
+        creator: Creator = creator_class(self.settings, self)
+        if isinstance(creator, VariablesConsumer):
+            creator.set_variables(self.variables)
+        return creator.perform_with_parameters(parameters)
+
+    def link(self, soft_link: bool) -> int:
+        linker: SourceFilesLinker = SourceFilesLinker(self.settings)
+        _, mechanically_conducted_linking = linker.soft_link() if soft_link else linker.hard_link()
+        if not mechanically_conducted_linking:
+            self.report(CommandLineController.LINKING_ERROR_MESSAGE)
+            return CommandLineController.FAILURE_CODE
+        if not soft_link:
+            print(linker.get_output_path_of_hard_link())
+        return CommandLineController.SUCCESS_CODE
+
+    def build(self, selected_source_files: list[str]) -> int:
+        linker: SourceFilesLinker = SourceFilesLinker(self.settings)
+        if selected_source_files:
+            _, mechanically_conducted_linking = linker.hard_link_partial(
+                [os.path.abspath(source_file) for source_file in selected_source_files])
+            document_path: str = linker.get_output_path_of_partial_link()
+        else:
+            _, mechanically_conducted_linking = linker.hard_link()
+            document_path = linker.get_output_path_of_hard_link()
+        if not mechanically_conducted_linking:
+            self.report(linker.last_error or CommandLineController.LINKING_ERROR_MESSAGE)
+            return CommandLineController.FAILURE_CODE
+
+        # there is no event loop to wait for, so build runs in current thread
+        result: BuildResult = BuildScheduler(self).build(document_path, self.settings[GENERATED_FILES])
+        self.notify_about_build_result(result)
+        for error in result.errors:
+            self.report(error)
+        if not result.was_success:
+            return CommandLineController.FAILURE_CODE
+        print(result.output_path)
+        return CommandLineController.SUCCESS_CODE
+
+    def run_script(self, script_path: str) -> int:
+        if not self.perform_creator(OperateVariablesCreator, {'script_path': os.path.abspath(script_path)}):
+            self.report(CommandLineController.OPERATION_FAILURE_MESSAGE)
+            return CommandLineController.FAILURE_CODE
+        return CommandLineController.SUCCESS_CODE if self.save_variables() else CommandLineController.FAILURE_CODE
+
+    def create(self, creator_name: str, raw_parameters: list[str], parameters_path: str | None) -> int:
+        entry: CreatorEntry | None = self.creators_registry.find(creator_name)
+        if entry is None:
+            self.report(f'{CommandLineController.UNKNOWN_CREATOR_MESSAGE}: {creator_name}')
+            return CommandLineController.FAILURE_CODE
+        parameters: dict[str, Any] | None = CommandLineController.parse_parameters(raw_parameters, parameters_path)
+        creator_class: type[Creator] = entry.load_creator_class()
+        if parameters is None or any(name not in creator_class.PARAMETERS for name in parameters):
+            self.report(f'{CommandLineController.PARAMETERS_ERROR_MESSAGE}, parameters of {entry.title}: '
+                        f'{", ".join(creator_class.PARAMETERS)}')
+            return CommandLineController.FAILURE_CODE
+        if not self.perform_creator(creator_class, parameters):
+            self.report(CommandLineController.OPERATION_FAILURE_MESSAGE)
+            return CommandLineController.FAILURE_CODE
+        return CommandLineController.SUCCESS_CODE if self.save_variables() else CommandLineController.FAILURE_CODE
+
+    def run_recipe(self, recipe_path: str, should_force: bool, max_workers: int) -> int:
+        recipe: Recipe | None = Recipe.load(recipe_path)
+        if recipe is None:
+            self.report(CommandLineController.INVALID_RECIPE_MESSAGE)
+            return CommandLineController.FAILURE_CODE
+        executor: RecipeExecutor = RecipeExecutor(recipe, self.settings, self.variables, self.project_directory, self,
+                                                  max_workers, should_force)
+        was_success: bool = executor.execute()
+        # variables of successful steps are kept, even if some step failed
+        was_saved: bool = self.save_variables()
+        return CommandLineController.SUCCESS_CODE if was_success and was_saved else CommandLineController.FAILURE_CODE
+
+    def list_creators(self) -> int:
+        # creators modules are imported only to read their parameters
+        for entry in self.creators_registry.list_creators():
+            try:
+                parameters: list[str] = entry.load_creator_class().PARAMETERS
+            except ImportError as error:
+                # e.g. optional library of creator isn't installed, other creators are still listed
+                self.report(f'{CommandLineController.CREATOR_IMPORT_ERROR_MESSAGE} ({entry.class_name}): {error}')
+                parameters = []
+            print(f'{entry.title} ({entry.class_name}): {", ".join(parameters)}')
+        return CommandLineController.SUCCESS_CODE
+
+    def run(self, arguments: list[str] | None = None) -> int:
+        """
+        :return: exit code of command
+        """
+        namespace: argparse.Namespace = CommandLineController.create_parser().parse_args(arguments)
+        if namespace.command == 'list-creators':
+            return self.list_creators()
+        if namespace.command in ['serve', 'stop']:
+            return CommandLineController.FAILURE_CODE
+        if not self.open_project(namespace.project):
+            self.report(CommandLineController.OPENING_ERROR_MESSAGE)
+            return CommandLineController.FAILURE_CODE
+        if namespace.command == 'link':
+            code: int = self.link(namespace.soft)
+        elif namespace.command == 'build':
+            code = self.build(namespace.only)
+        elif namespace.command == 'run-script':
+            code = self.run_script(namespace.script)
+        elif namespace.command == 'run-recipe':
+            code = self.run_recipe(namespace.recipe, namespace.force, namespace.workers)
+        else:
+            code = self.create(namespace.creator, namespace.param, namespace.params)
+        if code != CommandLineController.SUCCESS_CODE:
+            # variables changed by failed command aren't saved, so project is read again by next command
+            self._project_state = None
+        return code
+
+
+def command_line_function(arguments: list[str] | None = None) -> int:
+    """
+    Command is passed to daemon, if it runs, otherwise it is run in this process
+    """
+    arguments = arguments if arguments is not None else sys.argv[1:]
+    namespace: argparse.Namespace = CommandLineController.create_parser().parse_args(arguments)
+    if namespace.command == 'serve':
+        from Controller.DaemonServer import DaemonServer
+        return DaemonServer(CommandLineController()).serve()
+    client: DaemonClient = DaemonClient()
+    if namespace.command == 'stop':
+        return CommandLineController.SUCCESS_CODE if client.stop() else CommandLineController.FAILURE_CODE
+    if not namespace.no_daemon:
+        code: int | None = client.submit(arguments, os.getcwd())
+        if code is not None:
+            return code
+    controller = CommandLineController()
+    return controller.run(arguments)
+
+
+if __name__ == '__main__':
+    sys.exit(command_line_function())
@@ -0,0 +1,169 @@
+import hmac
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+
+from settings_namespace import ENCODING
+
+
+class DaemonClient:
+    """
+    Client of DaemonServer - command is sent as one JSON line, daemon answers with JSON lines
+    of output of command (as it is printed) and finally with exit code of command.
+    Daemon listens on Unix socket in runtime directory of user (accessible only by user), on systems without
+    Unix sockets on port of localhost. Every request carries token, which daemon writes into runtime directory,
+    so only user, who can read it, can run commands in daemon.
+    """
+    RUNTIME_DIRECTORY_FORMAT: str = 'latex-report-generator-{user}'
+    SOCKET_NAME: str = 'daemon.sock'
+    TOKEN_FILE_NAME: str = 'daemon.token'
+    # runtime directory and files in it are accessible only by their owner
+    DIRECTORY_PERMISSIONS: int = stat.S_IRWXU
+    FILE_PERMISSIONS: int = stat.S_IRUSR | stat.S_IWUSR
+    HOST: str = '127.0.0.1'
+    PORT: int = 47613
+    CONNECTION_TIMEOUT: float = 1.0
+    JOB_REQUEST: str = 'job'
+    PING_REQUEST: str = 'ping'
+    SHUTDOWN_REQUEST: str = 'shutdown'
+    FAILURE_CODE: int = 1
+
+    def __init__(self, address: str | tuple[str, int] | None = None) -> None:
+        self.address: str | tuple[str, int] = address if address is not None else DaemonClient.get_address()
+        self.token: str | None = DaemonClient.read_token()
+
+    @staticmethod
+    def is_unix_socket_supported() -> bool:
+        return hasattr(socket, 'AF_UNIX')
+
+    @staticmethod
+    def get_runtime_directory() -> str:
+        user: str = str(os.getuid()) if hasattr(os, 'getuid') else os.getlogin()
+        return os.path.join(tempfile.gettempdir(), DaemonClient.RUNTIME_DIRECTORY_FORMAT.format(user=user))
+
+    @staticmethod
+    def is_private(path: str) -> bool:
+        """
+        :return: bool - is path owned by current user and inaccessible by others (always True on Windows,
+        where temporary directory of user is private)
+        """
+        try:
+            path_stat: os.stat_result = os.lstat(path)
+        except OSError:
+            return False
+        if not hasattr(os, 'getuid'):
+            return True
+        return path_stat.st_uid == os.getuid() and stat.S_IMODE(path_stat.st_mode) & ~stat.S_IRWXU == 0
+
+    @staticmethod
+    def prepare_runtime_directory() -> str | None:
+        """
+        Create runtime directory of user
+        :return: path of runtime directory or None, if it can be accessed by others
+        """
+        directory: str = DaemonClient.get_runtime_directory()
+        try:
+            os.makedirs(directory, DaemonClient.DIRECTORY_PERMISSIONS, exist_ok=True)
+        except OSError:
+            return None
+        return directory if os.path.isdir(directory) and DaemonClient.is_private(directory) else None
+
+    @staticmethod
+    def get_address() -> str | tuple[str, int]:
+        """
+        :return: path of Unix socket or host and port of daemon
+        """
+        if not DaemonClient.is_unix_socket_supported():
+            return DaemonClient.HOST, DaemonClient.PORT
+        return os.path.join(DaemonClient.get_runtime_directory(), DaemonClient.SOCKET_NAME)
+
+    @staticmethod
+    def get_token_path() -> str:
+        return os.path.join(DaemonClient.get_runtime_directory(), DaemonClient.TOKEN_FILE_NAME)
+
+    @staticmethod
+    def read_token() -> str | None:
+        """
+        :return: token of running daemon or None, if it doesn't exist or others could read or replace it
+        """
+        token_path: str = DaemonClient.get_token_path()
+        if not (DaemonClient.is_private(os.path.dirname(token_path)) and DaemonClient.is_private(token_path)):
+            return None
+        try:
+            with open(token_path, encoding=ENCODING) as token_file:
+                return token_file.read().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def is_token_valid(token: object, expected_token: str) -> bool:
+        return isinstance(token, str) and hmac.compare_digest(token.encode(ENCODING), expected_token.encode(ENCODING))
+
+    def _connect(self) -> socket.socket | None:
+        if self.token is None:
+            # daemon can't be trusted (or it doesn't run)
+            return None
+        family: int = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+        connection: socket.socket = socket.socket(family, socket.SOCK_STREAM)
+        connection.settimeout(DaemonClient.CONNECTION_TIMEOUT)
+        try:
+            connection.connect(self.address)
+        except OSError:
+            connection.close()
+            return None
+        # commands (builds) can take any time
+        connection.settimeout(None)
+        return connection
+
+    def _request(self, request: dict) -> list[dict] | None:
+        """
+        :return: all messages of daemon or None, if daemon doesn't run
+        """
+        connection: socket.socket | None = self._connect()
+        if connection is None:
+            return None
+        request = {**request, 'token': self.token}
+        with connection, connection.makefile('rw', encoding=ENCODING, newline='\n') as stream:
+            stream.write(f'{json.dumps(request)}\n')
+            stream.flush()
+            return [json.loads(line) for line in stream]
+
+    def is_running(self) -> bool:
+        return self._request({'type': DaemonClient.PING_REQUEST}) is not None
+
+    def stop(self) -> bool:
+        """
+        :return: bool - was daemon running
+        """
+        return self._request({'type': DaemonClient.SHUTDOWN_REQUEST}) is not None
+
+    def submit(self, arguments: list[str], working_directory: str) -> int | None:
+        """
+        Run command in daemon, output of command is printed as it comes
+        :return: exit code of command or None, if daemon doesn't run
+        """
+        connection: socket.socket | None = self._connect()
+        if connection is None:
+            return None
+        request: dict = {'type': DaemonClient.JOB_REQUEST, 'arguments': arguments, 'cwd': working_directory,
+                         'token': self.token}
+        code: int = DaemonClient.FAILURE_CODE
+        try:
+            with connection, connection.makefile('rw', encoding=ENCODING, newline='\n') as stream:
+                stream.write(f'{json.dumps(request)}\n')
+                stream.flush()
+                for line in stream:
+                    message: dict = json.loads(line)
+                    if 'code' in message:
+                        code = message['code']
+                    else:
+                        output = sys.stdout if message.get('stream') == 'stdout' else sys.stderr
+                        output.write(message.get('text', ''))
+                        output.flush()
+        except (OSError, json.JSONDecodeError):
+            # command was already passed to daemon, so it isn't run again in this process
+            return DaemonClient.FAILURE_CODE
+        return code
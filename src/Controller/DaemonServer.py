@@ -0,0 +1,173 @@
+import contextlib
+import json
+import os
+import secrets
+import socketserver
+import sys
+import threading
+
+from Controller.CommandLineController import CommandLineController
+from Controller.DaemonClient import DaemonClient
+from Model.utils import set_scripts_reuse
+from settings_namespace import ENCODING
+
+
+class DaemonOutput:
+    """
+    Output of command in daemon - every write is sent to client at once as JSON line
+    """
+
+    def __init__(self, stream, stream_name: str, lock: threading.Lock) -> None:
+        self.stream = stream
+        self.stream_name: str = stream_name
+        self._lock: threading.Lock = lock
+
+    def write(self, text: str) -> int:
+        if text:
+            with self._lock:
+                try:
+                    self.stream.write(f'{json.dumps({"stream": self.stream_name, "text": text})}\n')
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    # client has disconnected, command is finished anyway
+                    pass
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class DaemonServer:
+    """
+    Long-lived local daemon - libraries of creators (pandas, sympy, sklearn, matplotlib...) are imported once,
+    project stays open between commands and unchanged scripts aren't executed again, so commands sent
+    by DaemonClient from command line have no cold start (GUI keeps its own process loaded, it doesn't use daemon).
+    Commands are run one at a time in working directory of client, only for clients with token of daemon.
+    Scripts (variables operators, table scripts) are executed once and reused while their file is unchanged,
+    so their module level code runs only once per daemon - scripts reading data at import time should read it
+    in their functions instead. Modules imported by scripts aren't tracked, daemon has to be restarted after their change.
+    """
+    # daemon has no display, plots are only saved
+    PLOT_BACKEND: str = 'Agg'
+    TOKEN_BYTES: int = 32
+    # socket is created accessible only by user, there is no moment, in which others could connect
+    SOCKET_UMASK: int = 0o177
+    ALREADY_RUNNING_MESSAGE: str = 'Daemon is already running'
+    INSECURE_DIRECTORY_MESSAGE: str = 'Runtime directory of daemon is missing or accessible by other users'
+
+    def __init__(self, controller: CommandLineController, address: str | tuple[str, int] | None = None) -> None:
+        self.controller: CommandLineController = controller
+        self.address: str | tuple[str, int] = address if address is not None else DaemonClient.get_address()
+        self._server: socketserver.BaseServer | None = None
+        # commands change working directory and outputs of whole process, so only one runs at once
+        self._job_lock: threading.Lock = threading.Lock()
+        self.token: str = secrets.token_hex(DaemonServer.TOKEN_BYTES)
+
+    def warm_up(self) -> None:
+        """
+        Import all creators, and libraries they need with them
+        """
+        os.environ.setdefault('MPLBACKEND', DaemonServer.PLOT_BACKEND)
+        # scripts are reused only in process of daemon
+        set_scripts_reuse(True)
+        for entry in self.controller.creators_registry.list_creators():
+            try:
+                entry.load_creator_class()
+            except Exception:
+                # creator, which can't be loaded, fails when it is used, as without daemon
+                pass
+
+    def run_job(self, arguments: list[str], working_directory: str, stream) -> int:
+        output_lock: threading.Lock = threading.Lock()
+        with self._job_lock:
+            previous_directory: str = os.getcwd()
+            try:
+                os.chdir(working_directory)
+                with (contextlib.redirect_stdout(DaemonOutput(stream, 'stdout', output_lock)),
+                      contextlib.redirect_stderr(DaemonOutput(stream, 'stderr', output_lock))):
+                    return self.controller.run(arguments)
+            except SystemExit as exit_request:
+                return exit_request.code if isinstance(exit_request.code, int) else CommandLineController.FAILURE_CODE
+            except Exception as exception:
+                DaemonOutput(stream, 'stderr', output_lock).write(f'{exception}\n')
+                return CommandLineController.FAILURE_CODE
+            finally:
+                os.chdir(previous_directory)
+
+    def handle(self, stream) -> None:
+        try:
+            request: dict = json.loads(stream.readline())
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return
+        if not isinstance(request, dict) or not DaemonClient.is_token_valid(request.get('token'), self.token):
+            return
+        if request.get('type') == DaemonClient.SHUTDOWN_REQUEST:
+            # server can't be shut down from thread, which serves it
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+        elif request.get('type') == DaemonClient.JOB_REQUEST:
+            code: int = self.run_job(request.get('arguments', []), request.get('cwd', os.getcwd()), stream)
+            stream.write(f'{json.dumps({"code": code})}\n')
+
+    def _create_server(self) -> socketserver.BaseServer:
+        daemon: DaemonServer = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                try:
+                    with self.connection.makefile('rw', encoding=ENCODING, newline='\n') as stream:
+                        daemon.handle(stream)
+                except OSError:
+                    # client has disconnected (or was rejected) before its answer was sent
+                    pass
+
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                # socket left by daemon, which didn't stop properly
+                os.remove(self.address)
+            previous_umask: int = os.umask(DaemonServer.SOCKET_UMASK)
+            try:
+                server: socketserver.BaseServer = socketserver.ThreadingUnixStreamServer(self.address,
+                                                                                         RequestHandler)
+            finally:
+                os.umask(previous_umask)
+        else:
+            server = socketserver.ThreadingTCPServer(self.address, RequestHandler)
+        server.daemon_threads = True
+        return server
+
+    def serve(self) -> int:
+        """
+        Serve commands until daemon is stopped
+        :return: exit code of daemon
+        """
+        if DaemonClient.prepare_runtime_directory() is None:
+            print(DaemonServer.INSECURE_DIRECTORY_MESSAGE, file=sys.stderr)
+            return CommandLineController.FAILURE_CODE
+        if DaemonClient(self.address).is_running():
+            print(DaemonServer.ALREADY_RUNNING_MESSAGE, file=sys.stderr)
+            return CommandLineController.FAILURE_CODE
+        self.warm_up()
+        self._server = self._create_server()
+        try:
+            self.write_token()
+            with self._server:
+                self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.remove(self.address)
+            if DaemonClient.read_token() == self.token:
+                os.remove(DaemonClient.get_token_path())
+        return CommandLineController.SUCCESS_CODE
+
+    def write_token(self) -> None:
+        """
+        Token file is created anew, readable only by user
+        """
+        token_path: str = DaemonClient.get_token_path()
+        if os.path.lexists(token_path):
+            os.remove(token_path)
+        descriptor: int = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, DaemonClient.FILE_PERMISSIONS)
+        with open(descriptor, 'w', encoding=ENCODING) as token_file:
+            token_file.write(self.token)
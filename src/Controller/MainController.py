@@ -1,29 +1,29 @@
-import importlib
-import pkgutil
 import re
 import subprocess
-from types import ModuleType
-from typing import Any
 import os
 import sys
 
 from PySide6.QtCore import QFileInfo
 from PySide6.QtWidgets import QApplication
-from pylatex import Document, NoEscape
 
-import Model
+from Controller.QtBuildListener import QtBuildListener
 from Controller.Wrappers import CreatorWrapper, FilepathWrapper
+from Model.Building.BuildResult import BuildResult
+from Model.Building.BuildScheduler import BuildScheduler
 from Model.Creators.AddTexCreator import AddTexCreator
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
+from Model.Creators.CreatorsRegistry import CreatorsRegistry, CreatorEntry
 from Model.Creators.EmptyFileCreator import EmptyFileCreator
 from Model.Creators.TextEditorSelector import TextEditorSelector
 from Model.FilesDirectoriesManager import FilesDirectoriesManager
 from Model.SourceFiles.SourceFile import SourceFile
 from Model.SourceFiles.SourceFilesLinker import SourceFilesLinker
 from Model.SourceFiles.SourceFilesManager import SourceFilesManager
+from Model.Variables.VariablesAutosaver import VariablesAutosaver
 from Model.Variables.VariablesConsumer import VariablesConsumer
 from Model.Variables.VariablesFileOperator import VariablesFileOperator
+from Model.Variables.VariablesStore import VariablesStore
 from Model.Variables.variables_namespace import TEXT_EDITOR_VARIABLE
 from documentation_getter import get_documentation_text
 from settings_namespace import BASE_FILES, SOURCE_FILES, GENERATED_FILES, ENCODING
@@ -36,6 +36,8 @@ from src.UI.OpeningWindow import OpeningWindow
 class MainController(CreatorListener):
     SELECT_DIR_CAPTION: str = 'Select dir'
     LINKING_ERROR_MESSAGE: str = 'Linking error'
+    NO_SOURCE_FILES_SELECTED_MESSAGE: str = 'Select source files to build'
+    MAX_DISPLAYED_BUILD_ERRORS: int = 5
 
     def __init__(self):
         super().__init__()
@@ -44,15 +46,24 @@ class MainController(CreatorListener):
         self.opening_window: OpeningWindow = OpeningWindow()
         self.main_window: MainWindow = MainWindow()
         self.settings: dict[str, str] = {}
-        self.variables: dict[str, Any] = {}
+        # variables of no project, until project is opened
+        self.variables: VariablesStore = VariablesStore('')
 
         self.directories_manager: FilesDirectoriesManager | None = None
         self.source_files_manager: SourceFilesManager | None = None
 
-        self.creators: list[Creator] = []
+        self.creators_registry: CreatorsRegistry = CreatorsRegistry()
+        self.creators: list[CreatorEntry] = []
+        # creators are instantiated once per session and kept alive
+        self.creators_instances: dict[type[Creator], Creator] = {}
         self.base_files_list: list[str] = []
         self.source_files_list: list[str] = []
 
+        # pdf is built in background (with as many passes as references need),
+        # so window isn't frozen during compilation
+        self.build_listener: QtBuildListener = QtBuildListener()
+        self.build_runner: BuildScheduler = BuildScheduler(self.build_listener)
+
     def connect_components_with_actions(self) -> None:
         self.opening_window.create_button.clicked.connect(self.select_workspace_by_create)
         self.opening_window.open_button.clicked.connect(self.select_workspace_by_open)
@@ -79,6 +90,11 @@ class MainController(CreatorListener):
         self.main_window.link_marks.triggered.connect(self.generate_soft_links)
         self.main_window.generate_tex.triggered.connect(self.prepare_tex)
         self.main_window.generate_tex_and_pdf.triggered.connect(self.generate_tex_and_pdf)
+        self.main_window.generate_partial_pdf.triggered.connect(self.generate_partial_pdf)
+        self.main_window.cancel_build.triggered.connect(self.build_runner.cancel)
+
+        self.build_listener.progress_changed.connect(self.main_window.show_status)
+        self.build_listener.build_finished.connect(self.finish_pdf_generation)
 
         self.main_window.creators_panel.list_widget.doubleClicked.connect(self.use_creator)
         self.main_window.base_files_panel.list_widget.doubleClicked.connect(lambda: self.open_file_in_text_editor(self.main_window.selected_base_file))
@@ -109,6 +125,7 @@ class MainController(CreatorListener):
         was_open_successful: bool = creator.create()
         if was_open_successful:
             self.settings = creator.get_settings()
+            self.variables = VariablesFileOperator(selected_directory).read_variables()
             self.variables[TEXT_EDITOR_VARIABLE]=''
             self.opening_window.close()
         else:
@@ -122,25 +139,31 @@ class MainController(CreatorListener):
         if not result:
             self.throw_failure_of_operation()
 
+    def get_creator(self, creator_class: type[Creator]) -> Creator:
+        if creator_class not in self.creators_instances:
+            self.creators_instances[creator_class] = creator_class(self.settings, self, self.main_window)
+        return self.creators_instances[creator_class]
+
     def use_creator(self) -> None:
-        selected_creator: Creator = self.main_window.selected_creator
-        if selected_creator is None:
+        selected_entry: CreatorEntry | None = self.main_window.selected_creator
+        if selected_entry is None:
             self.throw_failure_of_operation()
             return
+        selected_creator: Creator = self.get_creator(selected_entry.load_creator_class())
         if isinstance(selected_creator, VariablesConsumer):
             selected_creator.set_variables(self.variables)
         selected_creator.perform_functionality()
-        self.fill_panels()
+        self.refresh_files_panels()
 
     def add_base_file(self):
-        empty_file_creator: EmptyFileCreator = EmptyFileCreator(self.settings, self, self.main_window)
+        empty_file_creator: Creator = self.get_creator(EmptyFileCreator)
         empty_file_creator.perform_functionality()
-        self.fill_panels()
+        self.refresh_files_panels(should_refresh_source_files=False)
 
     def add_source_file(self):
-        add_tex_creator: AddTexCreator = AddTexCreator(self.settings, self, self.main_window)
+        add_tex_creator: Creator = self.get_creator(AddTexCreator)
         add_tex_creator.perform_functionality()
-        self.fill_panels()
+        self.refresh_files_panels(should_refresh_base_files=False)
 
     def remove_selected_file(self, file_type: str) -> callable:
         def remove_selected_file_closure():
@@ -149,7 +172,8 @@ class MainController(CreatorListener):
                 self.throw_failure_of_operation()
                 return
             self.directories_manager.remove_file(rem_filepath)
-            self.fill_panels()
+            self.refresh_files_panels(should_refresh_base_files=file_type == BASE_FILES,
+                                      should_refresh_source_files=file_type == SOURCE_FILES)
 
         return remove_selected_file_closure
 
@@ -171,11 +195,15 @@ class MainController(CreatorListener):
                            else re.match(filter_text, item.text()) is None)
 
     def generate_pdf(self, source_file: SourceFile) -> None:
-        try:
-            os.system(f'pdflatex -output-directory="{self.settings[GENERATED_FILES]}" "{source_file.filepath}"')
-            self.fill_panels()
-        except Exception as e:
-            self.throw_failure_of_operation(e.__str__())
+        if self.build_runner.start(source_file.filepath, self.settings[GENERATED_FILES]):
+            self.main_window.set_build_running(True)
+
+    def finish_pdf_generation(self, result: BuildResult) -> None:
+        self.main_window.set_build_running(False)
+        self.main_window.show_status(result.get_summary())
+        if not result.was_success and not result.was_cancelled:
+            self.throw_failure_of_operation('\n'.join(result.errors[:MainController.MAX_DISPLAYED_BUILD_ERRORS]))
+        self.refresh_files_panels()
 
     def generate_soft_links(self) -> None:
         self.prepare_tex(True)
@@ -197,6 +225,18 @@ class MainController(CreatorListener):
             return
         self.generate_pdf(SourceFile(generated_tex_file))
 
+    def generate_partial_pdf(self) -> None:
+        selected_source_files: list[str] = self.main_window.selected_source_files
+        if not selected_source_files:
+            self.throw_failure_of_operation(MainController.NO_SOURCE_FILES_SELECTED_MESSAGE)
+            return
+        linker: SourceFilesLinker = SourceFilesLinker(self.settings)
+        _, mechanically_conducted_linking = linker.hard_link_partial(selected_source_files)
+        if not mechanically_conducted_linking:
+            self.throw_failure_of_operation(linker.last_error or MainController.LINKING_ERROR_MESSAGE)
+            return
+        self.generate_pdf(SourceFile(linker.get_output_path_of_partial_link()))
+
     def _get_help_text(self) -> str:
         try:
             return get_documentation_text()
@@ -211,7 +251,7 @@ class MainController(CreatorListener):
 
     def open_file_in_text_editor(self,filepath:str):
         if self.variables[TEXT_EDITOR_VARIABLE] == '':
-            selector: TextEditorSelector=TextEditorSelector(self.settings, self, self.main_window)
+            selector: TextEditorSelector=self.get_creator(TextEditorSelector)
             selector.set_variables(self.variables)
             selector.perform_functionality()
         try:
@@ -221,22 +261,8 @@ class MainController(CreatorListener):
             self.throw_failure_of_operation()
 
     def fill_creators_list(self) -> None:
-        CHANGED_PROJECT_INFO: str = 'Changed project'
-        self.creators = []
-        for loader, module_absolute_math, is_pkg in pkgutil.walk_packages(Model.Creators.__path__,
-                                                                          Model.Creators.__name__ + '.'):
-            if not is_pkg:
-                split_sign: str = '.'
-                module: ModuleType = importlib.import_module(module_absolute_math)
-                short_module_name: str = module_absolute_math.split(split_sign)[-1]
-                if (short_module_name != Creator.__name__.split(split_sign)[-1]
-                        and short_module_name != '__init__'
-                        and short_module_name != CreatorListener.__name__.split(split_sign)[-1]):
-                    if hasattr(module, short_module_name):
-                        creator: Creator = getattr(module, short_module_name)(self.settings, self, self.main_window)
-                        self.creators.append(creator)
-                    else:
-                        raise Exception(CHANGED_PROJECT_INFO)
+        # creators modules are not imported here, see CreatorsRegistry
+        self.creators = self.creators_registry.list_creators()
 
     def fill_source_files_list(self):
         self.source_files_list = list(map(lambda file: os.path.join(self.settings[SOURCE_FILES], file),
@@ -257,6 +283,25 @@ class MainController(CreatorListener):
                                        [FilepathWrapper(base_file) for base_file in self.base_files_list],
                                        [FilepathWrapper(source_file) for source_file in self.source_files_list])
 
+    def refresh_files_panels(self, should_refresh_base_files: bool = True,
+                             should_refresh_source_files: bool = True) -> None:
+        """
+        Refresh files panels after action - creators panel is filled only once per session
+        and files panel is rebuilt only if its list of files has changed
+        """
+        if should_refresh_base_files:
+            previous_base_files: list[str] = self.base_files_list
+            self.fill_base_files_list()
+            if previous_base_files != self.base_files_list:
+                self.main_window.update_base_files_panel(
+                    [FilepathWrapper(base_file) for base_file in self.base_files_list])
+        if should_refresh_source_files:
+            previous_source_files: list[str] = self.source_files_list
+            self.fill_source_files_list()
+            if previous_source_files != self.source_files_list:
+                self.main_window.update_source_files_panel(
+                    [FilepathWrapper(source_file) for source_file in self.source_files_list])
+
     def run(self) -> None:
         self.connect_components_with_actions()
         self.opening_window.exec()
@@ -266,11 +311,14 @@ class MainController(CreatorListener):
             self.directories_manager = FilesDirectoriesManager(self.settings)
             self.source_files_manager = SourceFilesManager(self.settings)
 
+            # changed variables are saved during session, not only at exit
+            autosaver: VariablesAutosaver = VariablesAutosaver(self.variables)
+            autosaver.start()
             self.fill_panels()
             self.main_window.show()
             self.application.exec()
-            variables_operator = VariablesFileOperator(self.selected_directory)
-            variables_operator.save_variables(self.variables)
+            self.build_runner.cancel()
+            autosaver.stop()
             exit(0)
 
 
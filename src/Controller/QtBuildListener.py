@@ -0,0 +1,23 @@
+from PySide6.QtCore import QObject, Signal
+
+from Model.Building.BuildListener import BuildListener
+from Model.Building.BuildResult import BuildResult
+
+
+class QtBuildListener(QObject, BuildListener):
+    """
+    Bridge between build runner and GUI - notifications come from thread of build,
+    signals deliver them to slots in GUI thread
+    """
+    progress_changed = Signal(str)
+    build_finished = Signal(object)
+
+    def __init__(self) -> None:
+        QObject.__init__(self)
+        BuildListener.__init__(self)
+
+    def notify_about_build_progress(self, message: str) -> None:
+        self.progress_changed.emit(message)
+
+    def notify_about_build_result(self, result: BuildResult) -> None:
+        self.build_finished.emit(result)
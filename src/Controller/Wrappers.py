@@ -2,7 +2,7 @@ import os
 
 from PySide6.QtWidgets import QListWidgetItem
 
-from Model.Creators.Creator import Creator
+from Model.Creators.CreatorsRegistry import CreatorEntry
 
 
 class FilepathWrapper(QListWidgetItem):
@@ -15,9 +15,9 @@ class FilepathWrapper(QListWidgetItem):
 
 
 class CreatorWrapper(QListWidgetItem):
-    def __init__(self, creator: Creator):
-        super().__init__(creator.get_title())
+    def __init__(self, creator: CreatorEntry):
+        super().__init__(creator.title)
         self.creator = creator
 
     def __repr__(self):
-        self.creator.get_title()
+        return self.creator.title
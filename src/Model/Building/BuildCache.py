@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import shutil
+
+from Model.Building.BuildResult import BuildResult
+from Model.FilesSynchronizer import FilesSynchronizer
+from Model.SourceFiles.FileStateCache import FileStateCache
+from Model.SourceFiles.SourceFile import SourceFile
+from Model.SourceFiles.SourceFilesLinker import SourceFilesLinker
+from settings_namespace import ENCODING
+
+
+class BuildCache:
+    """
+    Content addressed cache of builds - key of build is hash of document, version of compiler, compiler options
+    and content of all assets referenced by document (graphics, inputs), outputs of successful build (pdf
+    and auxiliary files) are stored under that key in output directory. Build with known key isn't compiled,
+    stored outputs are restored.
+    """
+    VERSION: int = 4
+    DIRECTORY_NAME: str = '.build_cache'
+    RESULT_FILE_NAME: str = 'result.json'
+    TEMPORARY_SUFFIX: str = '.storing'
+    STORED_EXTENSIONS: list[str] = ['pdf', 'aux', 'toc', 'out', 'lof', 'lot']
+    MAX_ENTRIES: int = 8
+    MISSING_ASSET: str = 'missing'
+    # hashes of unchanged assets aren't computed again
+    HASHES_CACHE_CAPACITY: int = 4096
+    hashes_cache: FileStateCache = FileStateCache(HASHES_CACHE_CAPACITY)
+
+    def __init__(self, output_directory: str, max_entries: int = MAX_ENTRIES) -> None:
+        self.output_directory: str = os.path.abspath(output_directory)
+        self.directory: str = os.path.join(self.output_directory, BuildCache.DIRECTORY_NAME)
+        self.max_entries: int = max(max_entries, 1)
+
+    @staticmethod
+    def hash_file(filepath: str) -> str | None:
+        """
+        :return: hash of content of file or None, if file doesn't exist
+        """
+        state: tuple[int, int, int] | None = FileStateCache.get_file_state(filepath)
+        file_hash: str | None = BuildCache.hashes_cache.get(filepath, state)
+        if file_hash is None:
+            try:
+                file_hash = FilesSynchronizer.hash_file(filepath)
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                return None
+            BuildCache.hashes_cache.put(filepath, state, file_hash)
+        return file_hash
+
+    def find_assets(self, document_path: str) -> list[str]:
+        """
+        Assets are resolved against output directory as LaTeX resolves them (also absolute ones and ones outside
+        of output directory, e.g. ../baseFiles/plot), inputs are searched recursively
+        :return: list[str] - paths of assets referenced by document, unresolved ones included as written
+        """
+        assets: dict[str, None] = {}
+        pending_documents: list[str] = [document_path]
+        visited_documents: set[str] = {os.path.abspath(document_path)}
+        while pending_documents:
+            was_success, document_text = SourceFile(pending_documents.pop()).read_content_of_file()
+            if not was_success:
+                continue
+            for reference, extensions in SourceFilesLinker.get_referenced_assets(document_text, True):
+                asset: str = next((f'{reference}{extension}' for extension in extensions
+                                   if os.path.isfile(os.path.join(self.output_directory, f'{reference}{extension}'))),
+                                  reference)
+                assets[asset] = None
+                asset_path: str = os.path.abspath(os.path.join(self.output_directory, asset))
+                if asset.endswith(f'.{SourceFile.EXTENSION}') and asset_path not in visited_documents:
+                    visited_documents.add(asset_path)
+                    pending_documents.append(asset_path)
+        return list(assets)
+
+    def compute_key(self, document_path: str, options: list[str] | None = None,
+                    compiler_version: str = '') -> str | None:
+        """
+        :param compiler_version: version of compiler, outputs of other version (e.g. before upgrade of LaTeX
+        distribution) aren't restored
+        :return: key of build or None, if document doesn't exist
+        """
+        document_hash: str | None = BuildCache.hash_file(document_path)
+        if document_hash is None:
+            return None
+        key_hash = hashlib.sha256()
+        key_hash.update(f'{BuildCache.VERSION}\0{compiler_version}\0'
+                        f'{os.path.basename(document_path)}\0{document_hash}\0'.encode(ENCODING))
+        key_hash.update('\0'.join(options if options is not None else []).encode(ENCODING))
+        for asset in sorted(self.find_assets(document_path)):
+            asset_hash: str | None = BuildCache.hash_file(os.path.join(self.output_directory, asset))
+            key_hash.update(f'\0{asset}\0{asset_hash or BuildCache.MISSING_ASSET}'.encode(ENCODING))
+        return key_hash.hexdigest()
+
+    def get_output_names(self, document_path: str) -> list[str]:
+        """
+        :return: list[str] - relative paths of outputs of build - pdf, auxiliary files of document
+        and auxiliary files of its units (\\include)
+        """
+        stem: str = os.path.splitext(os.path.basename(document_path))[0]
+        output_names: list[str] = [f'{stem}.{extension}' for extension in BuildCache.STORED_EXTENSIONS]
+        return output_names + [f'{os.path.splitext(asset)[0]}.aux' for asset in self.find_assets(document_path)
+                               if asset.endswith(f'.{SourceFile.EXTENSION}')
+                               and not SourceFilesLinker.is_outside_reference(asset)]
+
+    def restore(self, key: str, document_path: str) -> BuildResult | None:
+        """
+        Copy outputs of cached build into output directory
+        :return: result of cached build or None, if build isn't cached
+        """
+        entry_directory: str = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(entry_directory, BuildCache.RESULT_FILE_NAME), encoding=ENCODING) as result_file:
+                stored_result: dict = json.load(result_file)
+        except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+            return None
+        # outputs are only copied, compiler writes into its outputs in place
+        synchronizer: FilesSynchronizer = FilesSynchronizer()
+        for output_name in stored_result.get('outputs', []):
+            if not synchronizer.sync_file(os.path.join(entry_directory, output_name),
+                                          os.path.join(self.output_directory, output_name)):
+                return None
+        # entry is marked as recently used
+        os.utime(entry_directory)
+        return BuildResult(0, warnings=stored_result.get('warnings', []), pages=stored_result.get('pages', 0),
+                           output_path=os.path.join(self.output_directory, self.get_output_names(document_path)[0]),
+                           passes=0, was_cached=True)
+
+    def store(self, key: str, document_path: str, result: BuildResult) -> bool:
+        """
+        Copy outputs of successful build into cache
+        :return: bool - was build stored
+        """
+        if not result.was_success:
+            return False
+        entry_directory: str = os.path.join(self.directory, key)
+        temporary_directory: str = f'{entry_directory}{BuildCache.TEMPORARY_SUFFIX}'
+        stored_outputs: list[str] = []
+        try:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+            os.makedirs(temporary_directory)
+            for output_name in self.get_output_names(document_path):
+                output_path: str = os.path.join(self.output_directory, output_name)
+                if os.path.isfile(output_path):
+                    os.makedirs(os.path.dirname(os.path.join(temporary_directory, output_name)), exist_ok=True)
+                    shutil.copy2(output_path, os.path.join(temporary_directory, output_name))
+                    stored_outputs.append(output_name)
+            with open(os.path.join(temporary_directory, BuildCache.RESULT_FILE_NAME), 'w',
+                      encoding=ENCODING) as result_file:
+                json.dump({'pages': result.pages, 'warnings': result.warnings, 'outputs': stored_outputs}, result_file)
+            # entry appears at once, so half stored build is never restored
+            shutil.rmtree(entry_directory, ignore_errors=True)
+            os.rename(temporary_directory, entry_directory)
+        except OSError:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+            return False
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries over limit of entries
+        """
+        try:
+            entries: list[os.DirEntry] = [entry for entry in os.scandir(self.directory)
+                                          if entry.is_dir() and not entry.name.endswith(BuildCache.TEMPORARY_SUFFIX)]
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+        for entry in entries[self.max_entries:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
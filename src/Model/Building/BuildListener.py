@@ -0,0 +1,20 @@
+import abc
+
+from Model.Building.BuildResult import BuildResult
+
+
+class BuildListener:
+    """
+    Listener of build runner - it is notified from thread of build, not from thread which started build
+    """
+
+    def __init__(self):
+        pass
+
+    @abc.abstractmethod
+    def notify_about_build_progress(self, message: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def notify_about_build_result(self, result: BuildResult) -> None:
+        pass
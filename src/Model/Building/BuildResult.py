@@ -0,0 +1,39 @@
+class BuildResult:
+    """
+    Outcome of one compilation of LaTeX document
+    """
+
+    def __init__(self, return_code: int | None = None, was_cancelled: bool = False, errors: list[str] | None = None,
+                 warnings: list[str] | None = None, pages: int = 0, output_path: str | None = None,
+                 needs_rerun: bool = False, passes: int = 1, was_cached: bool = False,
+                 has_format_error: bool = False) -> None:
+        self.return_code: int | None = return_code
+        self.was_cancelled: bool = was_cancelled
+        self.errors: list[str] = errors if errors is not None else []
+        self.warnings: list[str] = warnings if warnings is not None else []
+        self.pages: int = pages
+        self.output_path: str | None = output_path
+        # LaTeX asked for another pass (changed labels, references...)
+        self.needs_rerun: bool = needs_rerun
+        # number of compilations, which build took
+        self.passes: int = passes
+        # outputs were restored from cache of builds, compiler wasn't run
+        self.was_cached: bool = was_cached
+        # compiler couldn't load format given by options (see PreambleFormat)
+        self.has_format_error: bool = has_format_error
+
+    @property
+    def was_success(self) -> bool:
+        return not self.was_cancelled and self.return_code == 0 and not self.errors
+
+    def get_summary(self) -> str:
+        if self.was_cancelled:
+            return 'Build cancelled'
+        if not self.was_success:
+            return f'Build failed: {self.errors[0]}' if self.errors else 'Build failed'
+        if self.was_cached:
+            return f'Build unchanged: {self.pages} pages, {len(self.warnings)} warnings, pdf restored from cache'
+        return f'Build finished: {self.pages} pages, {len(self.warnings)} warnings, {self.passes} passes'
+
+    def __repr__(self):
+        return self.get_summary()
@@ -0,0 +1,155 @@
+import os
+import signal
+import subprocess
+import threading
+
+from Model.Building.BuildListener import BuildListener
+from Model.Building.BuildResult import BuildResult
+from Model.Building.LatexLogParser import LatexLogParser
+
+
+class BuildRunner:
+    """
+    Runner of pdflatex independent of GUI - compiler is started as subprocess in separate thread,
+    its output is parsed line by line as it is printed and listener is notified about progress and result.
+    Build can be cancelled at any time.
+    """
+    COMPILER: str = 'pdflatex'
+    OUTPUT_ENCODING: str = 'utf-8'
+    # TeX wraps log lines at 79 characters by default, longer lines keep messages parseable
+    MAX_PRINT_LINE: str = '10000'
+    COMPILER_NOT_FOUND_ERROR: str = f'{COMPILER} not found - LaTeX distribution has to be installed'
+    VERSION_TIMEOUT: float = 10.0
+    # first line of version of compiler, it is asked once per process
+    _compiler_version: str | None = None
+
+    def __init__(self, listener: BuildListener | None = None, should_halt_on_error: bool = True) -> None:
+        self.listener: BuildListener | None = listener
+        self.should_halt_on_error: bool = should_halt_on_error
+        self._process: subprocess.Popen | None = None
+        self._thread: threading.Thread | None = None
+        self._is_cancelled: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def get_compiler_version() -> str:
+        """
+        :return: first line of version of compiler (it changes with upgrade of LaTeX distribution)
+        or empty string, if compiler can't be run
+        """
+        if BuildRunner._compiler_version is None:
+            try:
+                completed: subprocess.CompletedProcess = subprocess.run(
+                    [BuildRunner.COMPILER, '--version'], stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                    encoding=BuildRunner.OUTPUT_ENCODING, errors='replace', timeout=BuildRunner.VERSION_TIMEOUT)
+                lines: list[str] = completed.stdout.splitlines()
+                BuildRunner._compiler_version = lines[0] if completed.returncode == 0 and lines else ''
+            except (OSError, subprocess.TimeoutExpired):
+                BuildRunner._compiler_version = ''
+        return BuildRunner._compiler_version
+
+    def create_command(self, document_path: str, output_directory: str, options: list[str] | None = None) -> list[str]:
+        command: list[str] = [BuildRunner.COMPILER, '-interaction=nonstopmode', '-file-line-error']
+        if self.should_halt_on_error:
+            command.append('-halt-on-error')
+        command += options if options is not None else []
+        command += [f'-output-directory={os.path.abspath(output_directory)}', os.path.abspath(document_path)]
+        return command
+
+    def _notify_about_progress(self, message: str) -> None:
+        if self.listener is not None:
+            self.listener.notify_about_build_progress(message)
+
+    def run(self, document_path: str, output_directory: str, options: list[str] | None = None,
+            environment: dict[str, str] | None = None) -> BuildResult:
+        """
+        Compile document in current thread
+        :param options: additional options of compiler
+        :param environment: additional environment variables of compiler
+        """
+        # relative paths of assets are resolved against directory with generated document
+        return self.execute(self.create_command(document_path, output_directory, options), output_directory,
+                            environment)
+
+    def execute(self, command: list[str], working_directory: str,
+                environment: dict[str, str] | None = None) -> BuildResult:
+        """
+        Run compiler command in current thread, its output is parsed as it is printed
+        """
+        environment = {**os.environ, 'max_print_line': BuildRunner.MAX_PRINT_LINE, **(environment or {})}
+        parser: LatexLogParser = LatexLogParser()
+        with self._lock:
+            if self._is_cancelled:
+                return BuildResult(was_cancelled=True)
+            try:
+                self._process = subprocess.Popen(command, cwd=working_directory, env=environment,
+                                                 stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                                 stderr=subprocess.STDOUT, text=True,
+                                                 start_new_session=os.name == 'posix',
+                                                 encoding=BuildRunner.OUTPUT_ENCODING, errors='replace')
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                return BuildResult(errors=[BuildRunner.COMPILER_NOT_FOUND_ERROR])
+        process: subprocess.Popen = self._process
+
+        for line in process.stdout:
+            message: str | None = parser.feed(line)
+            if message is not None:
+                self._notify_about_progress(message)
+        return_code: int = process.wait()
+
+        with self._lock:
+            self._process = None
+        return BuildResult(return_code, self._is_cancelled, parser.errors, parser.warnings, parser.pages,
+                           parser.output_path, parser.needs_rerun, has_format_error=parser.has_format_error)
+
+    def build(self, document_path: str, output_directory: str, options: list[str] | None = None) -> BuildResult:
+        """
+        Whole build of document in current thread - one compilation, subclasses can run more of them
+        """
+        return self.run(document_path, output_directory, options)
+
+    def _run_and_notify(self, document_path: str, output_directory: str, options: list[str] | None) -> None:
+        result: BuildResult = self.build(document_path, output_directory, options)
+        if self.listener is not None:
+            self.listener.notify_about_build_result(result)
+
+    def start(self, document_path: str, output_directory: str, options: list[str] | None = None) -> bool:
+        """
+        Start build in background thread, result is passed to listener
+        :return: bool - was build started (only one build runs at once)
+        """
+        if self.is_running():
+            return False
+        self._is_cancelled = False
+        self._thread = threading.Thread(target=self._run_and_notify,
+                                        args=(document_path, output_directory, options), daemon=True)
+        self._thread.start()
+        return True
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._is_cancelled = True
+            if self._process is not None and self._process.poll() is None:
+                self._terminate(self._process)
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen) -> None:
+        # helpers started by compiler (font generation...) are terminated with it
+        if os.name != 'posix':
+            process.terminate()
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        :return: bool - has build finished
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_running()
@@ -0,0 +1,137 @@
+import hashlib
+import os
+
+from Model.Building.BuildCache import BuildCache
+from Model.Building.BuildListener import BuildListener
+from Model.Building.BuildResult import BuildResult
+from Model.Building.BuildRunner import BuildRunner
+from Model.Building.FragmentsCompiler import FragmentsCompiler
+from Model.Building.PreambleFormat import PreambleFormat
+from Model.SourceFiles.LatexTokenizer import LatexTokenizer
+from Model.SourceFiles.SourceFile import SourceFile
+
+
+class BuildScheduler(BuildRunner):
+    """
+    Multi-pass build - document is compiled again only while auxiliary files (.aux, .toc, .out...) change,
+    references, labels and longtables are therefore resolved with minimal number of passes.
+    The first pass of build without auxiliary files is surely intermediate, so it runs in draft mode
+    (pdf isn't written), every other pass is expected to be the last one and writes pdf.
+    Preamble of document is loaded from precompiled format, if document marks its end.
+    Build of document, which hasn't changed with its assets since cached build, is restored from cache.
+    Marked fragments of document are compiled separately in parallel and included as pdfs.
+    """
+    TRACKED_EXTENSIONS: list[str] = ['aux', 'toc', 'out', 'lof', 'lot']
+    DRAFT_OPTION: str = '-draftmode'
+    MAX_PASSES: int = 5
+
+    def __init__(self, listener: BuildListener | None = None, should_halt_on_error: bool = True,
+                 max_passes: int = MAX_PASSES, should_use_preamble_format: bool = True,
+                 should_use_build_cache: bool = True, should_externalize_fragments: bool = True) -> None:
+        super().__init__(listener, should_halt_on_error)
+        self.max_passes: int = max(max_passes, 1)
+        self.should_use_preamble_format: bool = should_use_preamble_format
+        self.should_use_build_cache: bool = should_use_build_cache
+        self.should_externalize_fragments: bool = should_externalize_fragments
+        self._fragments_compiler: FragmentsCompiler | None = None
+
+    @staticmethod
+    def get_tracked_paths(document_path: str, output_directory: str) -> list[str]:
+        """
+        :return: list[str] - auxiliary files of document (.aux is the first one) and .aux files of its units (\\include)
+        """
+        stem: str = os.path.splitext(os.path.basename(document_path))[0]
+        tracked_paths: list[str] = [os.path.join(output_directory, f'{stem}.{extension}')
+                                    for extension in BuildScheduler.TRACKED_EXTENSIONS]
+        was_success, document_text = SourceFile(document_path).read_content_of_file()
+        if was_success:
+            tracked_paths += [os.path.join(output_directory, f'{token.argument}.aux') for token in
+                              LatexTokenizer.find_commands(document_text, 'include', LatexTokenizer.PATH_PATTERN)]
+        return tracked_paths
+
+    @staticmethod
+    def hash_tracked_files(tracked_paths: list[str]) -> list[str | None]:
+        hashes: list[str | None] = []
+        for tracked_path in tracked_paths:
+            try:
+                with open(tracked_path, 'rb') as tracked_file:
+                    hashes.append(hashlib.sha256(tracked_file.read()).hexdigest())
+            except FileNotFoundError:
+                hashes.append(None)
+        return hashes
+
+    def build(self, document_path: str, output_directory: str, options: list[str] | None = None) -> BuildResult:
+        options = options if options is not None else []
+        if not self.should_use_build_cache:
+            return self.compile(document_path, output_directory, options)
+
+        build_cache: BuildCache = BuildCache(output_directory)
+        key: str | None = build_cache.compute_key(document_path, options, BuildRunner.get_compiler_version())
+        cached_result: BuildResult | None = build_cache.restore(key, document_path) if key is not None else None
+        if cached_result is not None:
+            return cached_result
+        result: BuildResult = self.compile(document_path, output_directory, options)
+        if key is not None:
+            build_cache.store(key, document_path, result)
+        return result
+
+    def compile(self, document_path: str, output_directory: str, options: list[str]) -> BuildResult:
+        """
+        Compile document as many times as auxiliary files need
+        """
+        if self.should_externalize_fragments:
+            with self._lock:
+                self._fragments_compiler = FragmentsCompiler(output_directory, self.listener)
+            if self._is_cancelled:
+                return BuildResult(was_cancelled=True)
+            document_path = self._fragments_compiler.externalize(document_path) or document_path
+            with self._lock:
+                self._fragments_compiler = None
+            if self._is_cancelled:
+                return BuildResult(was_cancelled=True)
+        environment: dict[str, str] | None = None
+        preamble_format: PreambleFormat = PreambleFormat(output_directory)
+        options_without_format: list[str] = options
+        if self.should_use_preamble_format:
+            format_arguments: tuple[list[str], dict[str, str]] | None = preamble_format.prepare(document_path, self)
+            if self._is_cancelled:
+                return BuildResult(was_cancelled=True)
+            if format_arguments is not None:
+                options = options + format_arguments[0]
+                environment = format_arguments[1]
+        tracked_paths: list[str] = BuildScheduler.get_tracked_paths(document_path, output_directory)
+        hashes: list[str | None] = BuildScheduler.hash_tracked_files(tracked_paths)
+        # without auxiliary files of previous build references can't be resolved in the first pass,
+        # so it surely isn't the last one, otherwise the first pass is likely the only one
+        is_draft: bool = not os.path.isfile(tracked_paths[0]) and self.max_passes > 1
+
+        result: BuildResult = BuildResult()
+        for pass_number in range(1, self.max_passes + 1):
+            self._notify_about_progress(f'Pass {pass_number}{" (draft)" if is_draft else ""}')
+            result = self.run(document_path, output_directory,
+                              options + [BuildScheduler.DRAFT_OPTION] if is_draft else options, environment)
+            if result.has_format_error and environment is not None:
+                # format can't be loaded (dumped by previous version of compiler...), pass runs without it
+                preamble_format.discard()
+                options, environment = options_without_format, None
+                result = self.run(document_path, output_directory,
+                                  options + [BuildScheduler.DRAFT_OPTION] if is_draft else options, environment)
+            result.passes = pass_number
+            if not result.was_success:
+                return result
+
+            new_hashes: list[str | None] = BuildScheduler.hash_tracked_files(tracked_paths)
+            are_stable: bool = new_hashes == hashes
+            hashes = new_hashes
+            if are_stable and not is_draft:
+                return result
+            # after draft pass pdf still has to be written, the next pass is expected to be the last one
+            is_draft = False
+        return result
+
+    def cancel(self) -> None:
+        with self._lock:
+            fragments_compiler: FragmentsCompiler | None = self._fragments_compiler
+        if fragments_compiler is not None:
+            fragments_compiler.cancel()
+        super().cancel()
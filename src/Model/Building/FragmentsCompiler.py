@@ -0,0 +1,313 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from Model.Building.BuildListener import BuildListener
+from Model.Building.BuildResult import BuildResult
+from Model.Building.BuildRunner import BuildRunner
+from Model.SourceFiles.LatexTokenizer import LatexTokenizer
+from Model.SourceFiles.SourceFile import SourceFile
+from settings_namespace import ENCODING
+
+
+class FragmentsCompiler:
+    """
+    Externalization of document fragments - parts of document between FRAGMENT_BEGIN and FRAGMENT_END comments
+    (tabulars of tables...) are compiled as standalone documents in parallel, each pdf is kept under hash
+    of its fragment and preamble, so only changed fragments are compiled again. Document, in which fragments
+    are replaced by their pdfs, is written into fragments directory and compiled instead of original one.
+    Fragment has to fit on one page and mustn't contain labels - captions and labels stay in document around it.
+    Fragment with longtable is compiled with class of document on pages of size of its text block (shortened
+    by space for caption), its pages are included as rows of longtable, which keeps caption rows and label of fragment,
+    so table is numbered, referenced and broken across pages by document.
+    Fragment, which can't be compiled because of its own LaTeX errors, stays in document as it is and isn't compiled
+    again until it changes (or compiler is upgraded). Fragment, which failed because of environment (missing compiler,
+    package or file), is compiled again by the next build.
+    Fragments directory is shared by all documents built into output directory (main.tex, partial.tex), so compiled
+    fragments are evicted only by their size - least recently used ones first, fragments of current document never.
+    """
+    VERSION: int = 1
+    FRAGMENT_BEGIN: str = '% fragment begin'
+    FRAGMENT_END: str = '% fragment end'
+    FRAGMENT_PATTERN: re.Pattern = re.compile(r'^[ \t]*% ?fragment begin[ \t]*\n(?P<body>.*?)^[ \t]*% ?fragment end[ \t]*$',
+                                              re.MULTILINE | re.DOTALL)
+    DIRECTORY_NAME: str = '.fragments'
+    STANDALONE_CLASS: str = r'\documentclass{standalone}'
+    DOCUMENT_BEGIN: str = r'\begin{document}'
+    INCLUDE_FORMAT: str = '\\includegraphics{{{path}}}'
+    REQUIRED_PACKAGE: str = 'graphicx'
+    FAILURE_EXTENSION: str = 'failed'
+    # errors caused by environment of fragment, not by fragment itself
+    ENVIRONMENT_ERROR_PATTERN: re.Pattern = re.compile(r"File `[^']*' not found|I can't find file")
+    MAX_WORKERS: int = os.cpu_count() or 1
+    MAX_CACHE_SIZE: int = 256 * 2 ** 20
+    LONGTABLE_ENVIRONMENT: str = 'longtable'
+    CAPTION_COMMAND: str = 'caption'
+    CAPTION_PATTERN: re.Pattern = re.compile(r'[^{}%\\]*')
+    ROW_END: str = '\\\\'
+    PAGES_EXTENSION: str = 'pages'
+    # longtable can need more passes to settle widths of its columns
+    MAX_PASSES: int = 3
+    CAPTION_SPACE: str = '4\\baselineskip'
+    # page of fragment is text block of document, its headers and margins are removed
+    PAGE_SETUP_FORMAT: str = ('\\makeatletter\n\\AtBeginDocument{{\\pagestyle{{empty}}'
+                              '\\textheight=\\dimexpr\\textheight-{caption_space}\\relax'
+                              '\\@colht=\\textheight\\@colroom=\\textheight\\vsize=\\textheight'
+                              '\\pdfpagewidth=\\textwidth\\pdfpageheight=\\textheight'
+                              '\\hoffset=-1in\\voffset=-1in\\oddsidemargin=0pt\\evensidemargin=0pt\\topmargin=0pt'
+                              '\\headheight=0pt\\headsep=0pt\\footskip=0pt}}\n\\makeatother\n')
+    PAGE_INCLUDE_FORMAT: str = '\\includegraphics[page={page}]{{{path}}}'
+    PAGES_TABLE_FORMAT: str = '\\begin{{longtable}}{{@{{}}c@{{}}}}\n{head}{pages}\\end{{longtable}}'
+
+    def __init__(self, output_directory: str, listener: BuildListener | None = None,
+                 max_workers: int = MAX_WORKERS, max_cache_size: int = MAX_CACHE_SIZE) -> None:
+        self.output_directory: str = os.path.abspath(output_directory)
+        self.directory: str = os.path.join(self.output_directory, FragmentsCompiler.DIRECTORY_NAME)
+        self.listener: BuildListener | None = listener
+        self.max_workers: int = max(max_workers, 1)
+        self.max_cache_size: int = max_cache_size
+        self._runners: list[BuildRunner] = []
+        self._is_cancelled: bool = False
+
+    @staticmethod
+    def wrap_fragment(latex_content: str) -> str:
+        """
+        :return: content marked to be compiled as fragment
+        """
+        return f'{FragmentsCompiler.FRAGMENT_BEGIN}\n{latex_content.strip()}\n{FragmentsCompiler.FRAGMENT_END}'
+
+    @staticmethod
+    def create_standalone_preamble(document_text: str) -> str | None:
+        """
+        :return: preamble of document with standalone class instead of its class or None,
+        if fragments of document can't be included as graphics
+        """
+        preamble_end: int = document_text.find(FragmentsCompiler.DOCUMENT_BEGIN)
+        if preamble_end == -1:
+            return None
+        preamble: str = document_text[:preamble_end]
+        if FragmentsCompiler.REQUIRED_PACKAGE not in LatexTokenizer.get_arguments(preamble, 'usepackage'):
+            return None
+        classes = LatexTokenizer.find_commands(preamble, 'documentclass', has_options=True)
+        if not classes:
+            return None
+        return LatexTokenizer.splice(preamble, classes[:1], lambda token: FragmentsCompiler.STANDALONE_CLASS)
+
+    @staticmethod
+    def create_page_preamble(document_text: str) -> str | None:
+        """
+        :return: preamble of document with setup of pages of size of its text block or None,
+        if fragments of document can't be included as graphics
+        """
+        preamble_end: int = document_text.find(FragmentsCompiler.DOCUMENT_BEGIN)
+        if preamble_end == -1:
+            return None
+        preamble: str = document_text[:preamble_end]
+        if FragmentsCompiler.REQUIRED_PACKAGE not in LatexTokenizer.get_arguments(preamble, 'usepackage'):
+            return None
+        return f'{preamble}{FragmentsCompiler.PAGE_SETUP_FORMAT.format(caption_space=FragmentsCompiler.CAPTION_SPACE)}'
+
+    @staticmethod
+    def is_page_fragment(body: str) -> bool:
+        return any(token.argument == FragmentsCompiler.LONGTABLE_ENVIRONMENT
+                   for token in LatexTokenizer.find_commands(body, 'begin'))
+
+    @staticmethod
+    def split_caption_rows(body: str) -> tuple[str, list[str]]:
+        """
+        :return: body without rows with captions (and labels) of longtable and these rows in order of occurrence
+        """
+        rows: list[str] = []
+        parts: list[str] = []
+        position: int = 0
+        for token in LatexTokenizer.find_commands(body, FragmentsCompiler.CAPTION_COMMAND,
+                                                  FragmentsCompiler.CAPTION_PATTERN, has_options=True):
+            row_end: int = body.find(FragmentsCompiler.ROW_END, token.end)
+            if token.start < position or row_end == -1:
+                continue
+            row_end += len(FragmentsCompiler.ROW_END)
+            parts.append(body[position:token.start])
+            rows.append(body[token.start:row_end])
+            position = row_end
+        parts.append(body[position:])
+        return ''.join(parts), rows
+
+    @staticmethod
+    def create_pages_table(path: str, pages: int, caption_rows: list[str]) -> str:
+        """
+        :return: longtable with caption rows of fragment (the first one on the first page, the second one
+        on every next page) and pages of fragment
+        """
+        head: str = ''
+        if caption_rows:
+            head = f'{caption_rows[0]}\n\\endfirsthead\n'
+            if len(caption_rows) > 1:
+                head += f'{caption_rows[1]}\n\\endhead\n'
+        included_pages: str = ''.join(f'{FragmentsCompiler.PAGE_INCLUDE_FORMAT.format(page=page, path=path)}'
+                                      f'{FragmentsCompiler.ROW_END}\n' for page in range(1, pages + 1))
+        return FragmentsCompiler.PAGES_TABLE_FORMAT.format(head=head, pages=included_pages)
+
+    def read_pages(self, fragment_name: str) -> int | None:
+        """
+        :return: number of pages of compiled page fragment or None, if it isn't known
+        """
+        try:
+            with open(self._get_path(fragment_name, FragmentsCompiler.PAGES_EXTENSION), encoding=ENCODING) as pages_file:
+                return int(pages_file.read())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def get_fragment_name(preamble: str, body: str, compiler_version: str = '') -> str:
+        return hashlib.sha256(f'{FragmentsCompiler.VERSION}\0{compiler_version}\0{preamble}\0{body}'
+                              .encode(ENCODING)).hexdigest()
+
+    @staticmethod
+    def is_failure_of_fragment(result: BuildResult) -> bool:
+        """
+        :return: bool - did compilation fail because of LaTeX errors of fragment
+        """
+        return (not result.was_cancelled and not result.has_format_error and result.errors != []
+                and BuildRunner.COMPILER_NOT_FOUND_ERROR not in result.errors
+                and not any(FragmentsCompiler.ENVIRONMENT_ERROR_PATTERN.search(error) for error in result.errors))
+
+    def _get_path(self, fragment_name: str, extension: str) -> str:
+        return os.path.join(self.directory, f'{fragment_name}.{extension}')
+
+    def _notify_about_progress(self, message: str) -> None:
+        if self.listener is not None:
+            self.listener.notify_about_build_progress(message)
+
+    def _compile_fragment(self, preamble: str, body: str, fragment_name: str) -> bool:
+        if self._is_cancelled:
+            return False
+        fragment_path: str = self._get_path(fragment_name, SourceFile.EXTENSION)
+        with open(fragment_path, 'w', encoding=ENCODING) as fragment_file:
+            fragment_file.write(f'{preamble}{FragmentsCompiler.DOCUMENT_BEGIN}\n{body}\n\\end{{document}}\n')
+        runner: BuildRunner = BuildRunner()
+        self._runners.append(runner)
+        result: BuildResult = BuildResult()
+        for _ in range(FragmentsCompiler.MAX_PASSES):
+            # relative paths of assets in fragment are resolved against directory with document, as in document
+            result = runner.execute(runner.create_command(fragment_path, self.directory), self.output_directory)
+            if not (result.was_success and result.needs_rerun):
+                break
+        if result.was_success and os.path.isfile(self._get_path(fragment_name, 'pdf')):
+            with open(self._get_path(fragment_name, FragmentsCompiler.PAGES_EXTENSION), 'w',
+                      encoding=ENCODING) as pages_file:
+                pages_file.write(str(result.pages))
+            return True
+        if FragmentsCompiler.is_failure_of_fragment(result):
+            open(self._get_path(fragment_name, FragmentsCompiler.FAILURE_EXTENSION), 'w').close()
+        return False
+
+    def evict(self, used_names: set[str]) -> None:
+        """
+        Remove files of least recently used fragments over size limit of cache, used fragments are marked
+        as recently used and they are kept
+        """
+        # name of fragment -> time of its last use and size of all its files
+        fragments: dict[str, list[int]] = {}
+        paths: dict[str, list[str]] = {}
+        try:
+            for entry in os.scandir(self.directory):
+                name: str = os.path.splitext(entry.name)[0]
+                if len(name) != hashlib.sha256().digest_size * 2 or not entry.is_file():
+                    continue
+                if name in used_names and entry.name == f'{name}.pdf':
+                    os.utime(entry.path)
+                entry_stat: os.stat_result = entry.stat()
+                usage: list[int] = fragments.setdefault(name, [0, 0])
+                usage[0] = max(usage[0], entry_stat.st_mtime_ns)
+                usage[1] += entry_stat.st_size
+                paths.setdefault(name, []).append(entry.path)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        total_size: int = sum(size for _, size in fragments.values())
+        for name in sorted(fragments, key=lambda fragment_name: fragments[fragment_name][0]):
+            if total_size <= self.max_cache_size:
+                break
+            if name in used_names:
+                continue
+            for path in paths[name]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total_size -= fragments[name][1]
+
+    def externalize(self, document_path: str) -> str | None:
+        """
+        Compile changed fragments of document and write document, which includes their pdfs
+        :return: path of externalized document or None, if document has no fragments (or build was cancelled)
+        """
+        was_success, document_text = SourceFile(document_path).read_content_of_file()
+        fragments: list[re.Match] = list(FragmentsCompiler.FRAGMENT_PATTERN.finditer(document_text)) if was_success else []
+        preamble: str | None = FragmentsCompiler.create_standalone_preamble(document_text) if fragments else None
+        page_preamble: str | None = FragmentsCompiler.create_page_preamble(document_text) if fragments else None
+        if preamble is None and page_preamble is None:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        compiler_version: str = BuildRunner.get_compiler_version()
+        # name of fragment -> preamble and body, which are compiled
+        sources: dict[str, tuple[str, str]] = {}
+        names: list[str | None] = []
+        # name of page fragment -> its caption rows, which stay in document
+        caption_rows: dict[str, list[str]] = {}
+        for fragment in fragments:
+            body: str = fragment.group('body')
+            fragment_preamble: str | None = preamble
+            rows: list[str] | None = None
+            if FragmentsCompiler.is_page_fragment(body):
+                fragment_preamble = page_preamble
+                body, rows = FragmentsCompiler.split_caption_rows(body)
+            if fragment_preamble is None:
+                names.append(None)
+                continue
+            name: str = FragmentsCompiler.get_fragment_name(fragment_preamble, body, compiler_version)
+            names.append(name)
+            sources[name] = (fragment_preamble, body)
+            if rows is not None:
+                caption_rows[name] = rows
+        failed: set[str] = {name for name in sources
+                            if os.path.isfile(self._get_path(name, FragmentsCompiler.FAILURE_EXTENSION))}
+        pending: list[str] = [name for name in sources if name not in failed and (
+            not os.path.isfile(self._get_path(name, 'pdf')) or self.read_pages(name) is None)]
+        if pending:
+            self._notify_about_progress(f'Compiling {len(pending)} of {len(fragments)} fragments')
+            with ThreadPoolExecutor(min(self.max_workers, len(pending))) as executor:
+                # every worker only waits for its compiler, so fragments are compiled by processes in parallel
+                compiled: dict[str, bool] = dict(zip(pending, executor.map(
+                    lambda name: self._compile_fragment(*sources[name], name), pending)))
+        else:
+            compiled = {}
+        if self._is_cancelled:
+            return None
+        self.evict(set(sources))
+
+        parts: list[str] = []
+        position: int = 0
+        for name, fragment in zip(names, fragments):
+            if name is None or name in failed or not compiled.get(name, True):
+                continue
+            path: str = f'{FragmentsCompiler.DIRECTORY_NAME}/{name}.pdf'
+            parts.append(document_text[position:fragment.start()])
+            if name in caption_rows:
+                parts.append(FragmentsCompiler.create_pages_table(path, self.read_pages(name) or 1, caption_rows[name]))
+            else:
+                parts.append(FragmentsCompiler.INCLUDE_FORMAT.format(path=path))
+            position = fragment.end()
+        parts.append(document_text[position:])
+
+        # externalized document has the same name, so outputs of compiler keep names of original document
+        externalized_path: str = os.path.join(self.directory, os.path.basename(document_path))
+        with open(externalized_path, 'w', encoding=ENCODING) as externalized_file:
+            externalized_file.write(''.join(parts))
+        return externalized_path
+
+    def cancel(self) -> None:
+        self._is_cancelled = True
+        for runner in list(self._runners):
+            runner.cancel()
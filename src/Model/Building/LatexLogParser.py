@@ -0,0 +1,61 @@
+import re
+
+
+class LatexLogParser:
+    """
+    Incremental parser of pdflatex output - lines are fed as they are printed by compiler,
+    so errors and progress are known before compilation ends
+    """
+    # -file-line-error format: ./main.tex:12: Undefined control sequence.
+    FILE_LINE_ERROR_PATTERN: re.Pattern = re.compile(r'^(?P<file>[^\s:][^:]*):(?P<line>\d+): (?P<message>.+)$')
+    ERROR_PATTERN: re.Pattern = re.compile(r'^! (?P<message>.+)$')
+    WARNING_PATTERN: re.Pattern = re.compile(r'(?:LaTeX|Package [\w-]+|Class [\w-]+|pdfTeX)(?: Font)? Warning: (?P<message>.+)$')
+    RERUN_PATTERN: re.Pattern = re.compile(r'Rerun to get|Rerun LaTeX|may have changed\. Rerun|Label\(s\) may have changed')
+    PAGE_PATTERN: re.Pattern = re.compile(r'\[(?P<page>\d+)(?=[\]{<\s]|$)')
+    OUTPUT_PATTERN: re.Pattern = re.compile(r'^Output written on (?P<file>.+) \((?P<pages>\d+) pages?')
+    # format given by -fmt was dumped by another version of compiler or it is missing
+    FORMAT_ERROR_PATTERN: re.Pattern = re.compile(r"Fatal format file error|I can't find the format file")
+
+    def __init__(self) -> None:
+        self.errors: list[str] = []
+        self.warnings: list[str] = []
+        self.pages: int = 0
+        self.output_path: str | None = None
+        self.needs_rerun: bool = False
+        self.has_format_error: bool = False
+
+    def feed(self, line: str) -> str | None:
+        """
+        :param line: one line of compiler output
+        :return: message about progress of compilation or None, if line isn't interesting
+        """
+        line = line.rstrip('\r\n')
+        if LatexLogParser.FORMAT_ERROR_PATTERN.search(line) is not None:
+            self.has_format_error = True
+            self.errors.append(line.strip('-! '))
+            return f'Error: {line.strip("-! ")}'
+        if (matched_text := LatexLogParser.FILE_LINE_ERROR_PATTERN.match(line)) is not None:
+            error: str = (f'{matched_text.group("file")}:{matched_text.group("line")}: '
+                          f'{matched_text.group("message")}')
+            self.errors.append(error)
+            return f'Error: {error}'
+        if (matched_text := LatexLogParser.ERROR_PATTERN.match(line)) is not None:
+            self.errors.append(matched_text.group('message'))
+            return f'Error: {matched_text.group("message")}'
+        if (matched_text := LatexLogParser.OUTPUT_PATTERN.match(line)) is not None:
+            self.output_path = matched_text.group('file').strip('"')
+            self.pages = int(matched_text.group('pages'))
+            return f'Output written: {self.pages} pages'
+        if LatexLogParser.RERUN_PATTERN.search(line) is not None:
+            self.needs_rerun = True
+        if (matched_text := LatexLogParser.WARNING_PATTERN.search(line)) is not None:
+            self.warnings.append(matched_text.group('message'))
+            return None
+
+        message: str | None = None
+        for matched_text in LatexLogParser.PAGE_PATTERN.finditer(line):
+            # shipped pages are printed as [1] [2{...}], other bracketed numbers are skipped
+            if int(matched_text.group('page')) == self.pages + 1:
+                self.pages += 1
+                message = f'Page {self.pages}'
+        return message
@@ -0,0 +1,119 @@
+import hashlib
+import os
+
+from Model.Building.BuildResult import BuildResult
+from Model.Building.BuildRunner import BuildRunner
+from Model.SourceFiles.SourceFile import SourceFile
+from settings_namespace import ENCODING
+
+
+class PreambleFormat:
+    """
+    Precompiled preamble - part of document before END_OF_DUMP marker (class and packages) is dumped
+    by mylatexformat into format file, which is loaded instead of packages by every later compilation.
+    Format is named by hash of preamble and version of compiler, so changed preamble or upgraded
+    LaTeX distribution gets new format automatically. Format, which compiler can't load anyway, is discarded
+    and dumped again by the next build. Preamble which can't be dumped is remembered
+    and document is compiled without format.
+    """
+    END_OF_DUMP: str = r'\csname endofdump\endcsname'
+    DIRECTORY_NAME: str = '.formats'
+    NAME_PREFIX: str = 'preamble-'
+    FORMAT_EXTENSION: str = 'fmt'
+    FAILURE_EXTENSION: str = 'failed'
+    BASE_FORMAT: str = '&pdflatex'
+    DUMP_PACKAGE: str = 'mylatexformat.ltx'
+    FORMATS_VARIABLE: str = 'TEXFORMATS'
+    HASH_LENGTH: int = 16
+
+    def __init__(self, output_directory: str) -> None:
+        self.directory: str = os.path.join(os.path.abspath(output_directory), PreambleFormat.DIRECTORY_NAME)
+        # format prepared for the last document
+        self.format_name: str | None = None
+
+    @staticmethod
+    def extract_preamble(document_text: str) -> str | None:
+        """
+        :return: text of document up to marker (marker included) or None, if document has no marker
+        """
+        position: int = document_text.find(PreambleFormat.END_OF_DUMP)
+        if position == -1:
+            return None
+        return document_text[:position + len(PreambleFormat.END_OF_DUMP)]
+
+    @staticmethod
+    def get_format_name(preamble: str, compiler_version: str = '') -> str:
+        preamble_hash: str = hashlib.sha256(f'{PreambleFormat.BASE_FORMAT}\0{compiler_version}\0{preamble}'
+                                            .encode(ENCODING)).hexdigest()
+        return f'{PreambleFormat.NAME_PREFIX}{preamble_hash[:PreambleFormat.HASH_LENGTH]}'
+
+    def _get_path(self, format_name: str, extension: str) -> str:
+        return os.path.join(self.directory, f'{format_name}.{extension}')
+
+    def create_dump_command(self, format_name: str) -> list[str]:
+        return [BuildRunner.COMPILER, '-ini', '-interaction=nonstopmode', '-halt-on-error',
+                f'-jobname={format_name}', PreambleFormat.BASE_FORMAT, PreambleFormat.DUMP_PACKAGE,
+                f'{format_name}.{SourceFile.EXTENSION}']
+
+    def get_options(self, format_name: str) -> list[str]:
+        return [f'-fmt={format_name}']
+
+    def get_environment(self) -> dict[str, str]:
+        # trailing separator keeps default search path of formats
+        return {PreambleFormat.FORMATS_VARIABLE: f'{self.directory}{os.pathsep}'}
+
+    def _remove_stale_formats(self, format_name: str) -> None:
+        for file_name in os.listdir(self.directory):
+            if file_name.startswith(PreambleFormat.NAME_PREFIX) and not file_name.startswith(f'{format_name}.'):
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except FileNotFoundError:
+                    pass
+
+    def _dump(self, preamble: str, format_name: str, runner: BuildRunner) -> bool:
+        os.makedirs(self.directory, exist_ok=True)
+        self._remove_stale_formats(format_name)
+        # preamble is dumped from its own copy, so path of document doesn't matter to TeX
+        with open(self._get_path(format_name, SourceFile.EXTENSION), 'w', encoding=ENCODING) as preamble_file:
+            preamble_file.write(f'{preamble}\n\\begin{{document}}\n\\end{{document}}\n')
+        result: BuildResult = runner.execute(self.create_dump_command(format_name), self.directory)
+        if result.was_cancelled:
+            return False
+        if not (result.return_code == 0 and os.path.isfile(self._get_path(format_name, PreambleFormat.FORMAT_EXTENSION))):
+            open(self._get_path(format_name, PreambleFormat.FAILURE_EXTENSION), 'w').close()
+            return False
+        return True
+
+    def prepare(self, document_path: str, runner: BuildRunner) -> tuple[list[str], dict[str, str]] | None:
+        """
+        Find format of preamble of document, format is dumped if it doesn't exist yet
+        :return: options and environment variables of compiler, which load format
+        or None, if document should be compiled without format
+        """
+        was_success, document_text = SourceFile(document_path).read_content_of_file()
+        preamble: str | None = PreambleFormat.extract_preamble(document_text) if was_success else None
+        if preamble is None:
+            return None
+        format_name: str = PreambleFormat.get_format_name(preamble, BuildRunner.get_compiler_version())
+        if os.path.isfile(self._get_path(format_name, PreambleFormat.FAILURE_EXTENSION)):
+            return None
+        if not os.path.isfile(self._get_path(format_name, PreambleFormat.FORMAT_EXTENSION)):
+            try:
+                if not self._dump(preamble, format_name, runner):
+                    return None
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                return None
+        self.format_name = format_name
+        return self.get_options(format_name), self.get_environment()
+
+    def discard(self) -> None:
+        """
+        Remove format of the last document, which compiler couldn't load (it is dumped again next time)
+        """
+        if self.format_name is None:
+            return
+        try:
+            os.remove(self._get_path(self.format_name, PreambleFormat.FORMAT_EXTENSION))
+        except FileNotFoundError:
+            pass
+        self.format_name = None
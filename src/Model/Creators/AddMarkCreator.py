@@ -1,39 +1,47 @@
 import re
 import sys
-
-from PySide6.QtWidgets import QWidget, QDialog, QFileDialog, QApplication
+from typing import TYPE_CHECKING
 
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.SourceFiles.SourceFile import SourceFile
 from settings_namespace import ENCODING, SOURCE_FILES
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
+
 
 class AddMarkCreator(Creator):
     TITLE: str = "Add mark creator"
     BASE_MARK_NAME: str = 'mark'
     ASSUMED_MARK_FORMAT = r'[a-zA-Z]+([1-9]\d*)'
+    PARAMETERS: list[str] = ['file_to_add_mark']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
         self.file_to_add_mark: str = ''
-        self.dialog_for_adding_input_mark: QFileDialog = QFileDialog(self.parent_widget)
 
     def get_title(self) -> str:
         return AddMarkCreator.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.dialog_for_adding_input_mark
+    def create_use_dialog(self) -> 'QDialog':
+        from PySide6.QtWidgets import QFileDialog
+        return QFileDialog(self.parent_widget)
 
     def set_data(self) -> None:
+        from PySide6.QtWidgets import QFileDialog
         options = QFileDialog.Options()
-        self.file_to_add_mark, _ = self.dialog_for_adding_input_mark.getOpenFileName(
-            self.dialog_for_adding_input_mark.parent(), 'Add input mark', self.settings[SOURCE_FILES],
+        self.file_to_add_mark, _ = self.get_use_dialog().getOpenFileName(
+            self.get_use_dialog().parent(), 'Add input mark', self.settings[SOURCE_FILES],
             "TeX Files (*.tex)", options=options)
 
-    def validate_data(self) -> bool:
+    def validate_parameters(self) -> bool:
         return self.file_to_add_mark != ''
 
+    def validate_data(self) -> bool:
+        return self.validate_parameters()
+
     def get_next_mark(self) -> str:
         source_file: SourceFile = SourceFile(self.file_to_add_mark)
         marks: list[str] = source_file.get_all_marks()
@@ -62,6 +70,7 @@ if __name__ == '__main__':
             print(result)
 
 
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
 
     intro_vars = AddMarkCreator(local_settings, Listener(), None)
@@ -2,36 +2,46 @@ import os.path
 import re
 import shutil
 import sys
-
-from PySide6.QtWidgets import QFileDialog, QWidget, QDialog, QApplication
+from typing import Any, TYPE_CHECKING
 
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.SourceFiles.SourceFilesManager import SourceFilesManager
 from settings_namespace import SOURCE_FILES, BASE_FILES
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
+
 
 class AddTexCreator(Creator):
     TITLE: str = 'Add .tex file'
     TEX_EXTENSION: str='tex'
     TEX_FILE_FORMAT = fr'.+\.{TEX_EXTENSION}'
+    PARAMETERS: list[str] = ['pathfile_to_add']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget) -> None:
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None) -> None:
         super().__init__(settings, creator_listener, parent_widget)
         self.pathfile_to_add: str = ''
         self.new_file_name: str = ''
         self.new_source_file_path: str = ''
         self.source_files_manager: SourceFilesManager = SourceFilesManager(settings)
-        self.file_dialog: QFileDialog = QFileDialog(parent_widget)
 
     def set_info_about_chosen_file(self, file_path: str) -> None:
         self.pathfile_to_add: str = file_path
         self.new_file_name: str = self.source_files_manager.next_file_name(os.path.basename(file_path).rstrip(f'.{AddTexCreator.TEX_EXTENSION}'))
         self.new_source_file_path: str = os.path.join(self.settings[SOURCE_FILES], self.new_file_name)
 
+    def set_parameters(self, parameters: dict[str, Any]) -> bool:
+        if set(parameters) != set(AddTexCreator.PARAMETERS):
+            return False
+        self.set_info_about_chosen_file(parameters['pathfile_to_add'])
+        return True
+
     def set_data(self) -> None:
+        from PySide6.QtWidgets import QFileDialog
         options = QFileDialog.Options()
-        file_path, _ = self.file_dialog.getOpenFileName(self.file_dialog.parent(), "Select .tex",
+        file_path, _ = self.get_use_dialog().getOpenFileName(self.get_use_dialog().parent(), "Select .tex",
                                                         self.settings[BASE_FILES], "TeX Files (*.tex)", options=options)
 
         self.set_info_about_chosen_file(file_path)
@@ -39,9 +49,12 @@ class AddTexCreator(Creator):
     def validate_chosen_file(self) -> bool:
         return self.new_file_name != '' and re.fullmatch(AddTexCreator.TEX_FILE_FORMAT, os.path.basename(self.pathfile_to_add)) is not None and self.new_source_file_path != self.pathfile_to_add
 
-    def validate_data(self) -> bool:
+    def validate_parameters(self) -> bool:
         return self.validate_chosen_file()
 
+    def validate_data(self) -> bool:
+        return self.validate_parameters()
+
     def add_tex_file(self) -> bool:
         if not self.validate_chosen_file():
             return False
@@ -57,8 +70,9 @@ class AddTexCreator(Creator):
     def get_title(self) -> str:
         return AddTexCreator.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.file_dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from PySide6.QtWidgets import QFileDialog
+        return QFileDialog(self.parent_widget)
 
 
 if __name__ == '__main__':
@@ -71,6 +85,7 @@ if __name__ == '__main__':
             print(result)
 
 
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     add_creator = AddTexCreator(local_settings, Listener(), None)
     add_creator.perform_functionality()
@@ -1,16 +1,35 @@
 import abc
-from typing import Any
-
-from PySide6.QtWidgets import QWidget, QDialog
+from typing import Any, TYPE_CHECKING
 
 from Model.Creators.CreatorListener import CreatorListener
+from Model.Creators.CreatorResultCache import CreatorResultCache
+from Model.Variables.VariablesStore import VariablesStore
+from Model.Variables.VariablesWriteRecorder import VariablesWriteRecorder
+
+# creators don't need Qt without dialog (command line, batch jobs), so it is imported only for dialogs
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
 
 
 class Creator:
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    # attributes of creator, which can be set without dialog by set_parameters
+    PARAMETERS: list[str] = []
+    # creator can run concurrently with other thread safe creators - it doesn't change variables in place
+    # and it uses no global state (pyplot figure...), new source files are numbered one at a time
+    IS_THREAD_SAFE: bool = False
+
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         self.settings: dict[str, str] = settings
-        self.creator_listener: CreatorListener = creator_listener
-        self.parent_widget: QWidget = parent_widget
+        self.creator_listener: CreatorListener | None = creator_listener
+        self.parent_widget: 'QWidget | None' = parent_widget
+        self._use_dialog: 'QDialog | None' = None
+        # outputs of last run of creator - (directory type, name of file) of files it has written
+        self.written_files: list[tuple[str, str]] = []
+        # creator has written files, which it can't record (e.g. by user script), so its result isn't cached
+        self.has_unrecorded_outputs: bool = False
+        # reason of failure of last run of creator (exception caught by it), empty if it isn't known
+        self.failure_message: str = ''
 
     @abc.abstractmethod
     def get_title(self) -> str:
@@ -20,13 +39,31 @@ class Creator:
         pass
 
     @abc.abstractmethod
-    def get_use_dialog(self) -> QDialog:
+    def create_use_dialog(self) -> 'QDialog':
         """
-        Method allows to get dedicated dialog for use of creator
+        Build dedicated dialog for use of creator. Creators live for the whole session,
+        so method is called only once - when dialog is requested for the first time
         :return: QDialog
         """
         pass
 
+    def get_use_dialog(self) -> 'QDialog':
+        """
+        Method allows to get dedicated dialog for use of creator
+        :return: QDialog
+        """
+        if self._use_dialog is None:
+            self._use_dialog = self.create_use_dialog()
+        return self._use_dialog
+
+    @staticmethod
+    def is_dialog_accepted(dialog_result: int | None) -> bool:
+        """
+        :param dialog_result: result of execution of dialog, None if dialog wasn't executed
+        """
+        from PySide6.QtWidgets import QDialog
+        return dialog_result == QDialog.Accepted
+
     @abc.abstractmethod
     def set_data(self) -> None:
         """
@@ -34,6 +71,25 @@ class Creator:
         """
         pass
 
+    def set_parameters(self, parameters: dict[str, Any]) -> bool:
+        """
+        Assign values to variables of creator without dialog
+        :param parameters: name of attribute (see PARAMETERS) -> value
+        :return: bool - are all parameters known to creator
+        """
+        if any(name not in self.PARAMETERS for name in parameters):
+            return False
+        for name, value in parameters.items():
+            setattr(self, name, value)
+        return True
+
+    def validate_parameters(self) -> bool:
+        """
+        Check values of variables of creator regardless of way, in which they were set
+        :return: bool
+        """
+        return True
+
     @abc.abstractmethod
     def validate_data(self) -> bool:
         """
@@ -52,6 +108,74 @@ class Creator:
         """
         pass
 
+    def get_parameters_values(self) -> dict[str, Any]:
+        """
+        :return: name of attribute (see PARAMETERS) -> its current value
+        """
+        return {name: getattr(self, name, None) for name in self.PARAMETERS}
+
+    def create_fingerprint(self, variables_names: list[str], filepaths: list[str]) -> str | None:
+        """
+        :param variables_names: variables read by creator
+        :param filepaths: files and scripts read by creator
+        :return: fingerprint of parameters of creator and of its inputs
+        """
+        return CreatorResultCache.create_fingerprint(type(self).__name__, self.get_parameters_values(),
+                                                     getattr(self, 'variables', {}), variables_names, filepaths)
+
+    def get_input_fingerprint(self) -> str | None:
+        """
+        Creators, result of which depends only on their parameters and inputs, declare fingerprint
+        (see create_fingerprint), so their result is cached (see CreatorResultCache)
+        :return: fingerprint of inputs of creator or None, if result of creator isn't cached
+        """
+        return None
+
+    def record_written_file(self, directory_type: str, file_name: str) -> None:
+        """
+        Creators with input fingerprint record files they write, so files are cached with result
+        :param directory_type: BASE_FILES or SOURCE_FILES
+        """
+        self.written_files.append((directory_type, file_name))
+
+    def record_failure(self, exception: Exception) -> None:
+        self.failure_message = f'{type(exception).__name__}: {exception}'
+
+    def perform_cached_operations(self) -> bool:
+        """
+        Restore result of creator with the same inputs or execute main functionality and cache its result
+        :return: bool - was operation successful
+        """
+        self.failure_message = ''
+        variables: dict[str, Any] | VariablesStore = getattr(self, 'variables', {})
+        if not isinstance(variables, VariablesStore):
+            return self._perform_cached_operations()
+        # variables aren't serialized by autosave, while creator can change them in place
+        with variables.operation():
+            return self._perform_cached_operations()
+
+    def _perform_cached_operations(self) -> bool:
+        fingerprint: str | None = self.get_input_fingerprint()
+        if fingerprint is None:
+            return self.perform_operations()
+        variables: dict[str, Any] = getattr(self, 'variables', {})
+        cache: CreatorResultCache = CreatorResultCache(self.settings)
+        if cache.restore(fingerprint, variables):
+            return True
+        self.written_files = []
+        self.has_unrecorded_outputs = False
+        # only variables set by creator are its outputs, not variables set meanwhile by others
+        recorder: VariablesWriteRecorder = VariablesWriteRecorder(variables)
+        self.variables = recorder
+        try:
+            if not self.perform_operations():
+                return False
+        finally:
+            self.variables = variables
+        if not self.has_unrecorded_outputs:
+            cache.store(fingerprint, variables, recorder.get_written_names(), self.written_files)
+        return True
+
     def perform_functionality(self) -> None:
         """
         General template for performing next steps needed to do actual task
@@ -60,5 +184,12 @@ class Creator:
         if not self.validate_data():
             self.creator_listener.notify_about_result_of_main_function(False)
             return
-        result: bool = self.perform_operations()
+        result: bool = self.perform_cached_operations()
         self.creator_listener.notify_about_result_of_main_function(result)
+
+    def perform_with_parameters(self, parameters: dict[str, Any]) -> bool:
+        """
+        The same template as perform_functionality, but data are given instead of asked by dialog
+        :return: bool - was operation successful
+        """
+        return self.set_parameters(parameters) and self.validate_parameters() and self.perform_cached_operations()
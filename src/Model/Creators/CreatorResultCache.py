@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from typing import Any
+
+from Model.Building.BuildCache import BuildCache
+from Model.FilesSynchronizer import FilesSynchronizer
+from settings_namespace import ENCODING, GENERATED_FILES, BASE_FILES, SOURCE_FILES
+
+
+class CreatorResultCache:
+    """
+    Cache of results of creators - key of result is input fingerprint of creator (its parameters and content
+    of variables, files and scripts it reads). Variables and files (in base and source files), which creator
+    has set or written, are stored under the key in generated files of project. Creator with known key
+    isn't run, its missing outputs are restored - if output file was changed since (e.g. source file edited
+    by user), creator is run again. Cache is bounded by size, least recently used results are evicted.
+    """
+    VERSION: int = 1
+    DIRECTORY_NAME: str = '.creator_cache'
+    RESULT_FILE_NAME: str = 'result.json'
+    VARIABLES_FILE_NAME: str = 'variables.pkl'
+    FILES_DIRECTORY_NAME: str = 'files'
+    TEMPORARY_SUFFIX: str = '.storing'
+    MISSING_INPUT: str = 'missing'
+    OUTPUT_DIRECTORIES: list[str] = [BASE_FILES, SOURCE_FILES]
+    MAX_SIZE: int = 256 * 1024 ** 2
+
+    def __init__(self, settings: dict[str, str], max_size: int = MAX_SIZE) -> None:
+        self.settings: dict[str, str] = settings
+        self.directory: str = os.path.join(settings[GENERATED_FILES], CreatorResultCache.DIRECTORY_NAME)
+        self.max_size: int = max_size
+
+    @staticmethod
+    def hash_value(value: Any) -> str | None:
+        """
+        :return: hash of pickled value or None, if value can't be pickled
+        """
+        try:
+            return hashlib.sha256(pickle.dumps(value)).hexdigest()
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+
+    @staticmethod
+    def create_fingerprint(creator_name: str, parameters: dict[str, Any], variables: dict[str, Any],
+                           variables_names: list[str], filepaths: list[str]) -> str | None:
+        """
+        :param variables_names: variables read by creator
+        :param filepaths: files and scripts read by creator
+        :return: input fingerprint of creator or None, if some input can't be hashed
+        """
+        fingerprint = hashlib.sha256(f'{CreatorResultCache.VERSION}\0{creator_name}\0'.encode(ENCODING))
+        try:
+            fingerprint.update(json.dumps(parameters, sort_keys=True).encode(ENCODING))
+        except (TypeError, ValueError):
+            return None
+        for name in variables_names:
+            variable_hash: str | None = (CreatorResultCache.hash_value(variables[name]) if name in variables
+                                         else CreatorResultCache.MISSING_INPUT)
+            if variable_hash is None:
+                return None
+            fingerprint.update(f'\0{name}\0{variable_hash}'.encode(ENCODING))
+        for filepath in filepaths:
+            file_hash: str | None = BuildCache.hash_file(filepath)
+            fingerprint.update(f'\0{os.path.abspath(filepath)}\0{file_hash or CreatorResultCache.MISSING_INPUT}'
+                               .encode(ENCODING))
+        return fingerprint.hexdigest()
+
+    def _get_path(self, directory_type: str, file_name: str) -> str:
+        return os.path.join(self.settings[directory_type], file_name)
+
+    def restore(self, fingerprint: str, variables: dict[str, Any]) -> bool:
+        """
+        Set cached variables and write cached files, which are missing
+        :return: bool - was result restored (it isn't, if it isn't cached or its file was changed)
+        """
+        entry_directory: str = os.path.join(self.directory, fingerprint)
+        try:
+            with open(os.path.join(entry_directory, CreatorResultCache.RESULT_FILE_NAME), encoding=ENCODING) as result_file:
+                files: list[list[str]] = json.load(result_file).get('files', [])
+            with open(os.path.join(entry_directory, CreatorResultCache.VARIABLES_FILE_NAME), 'rb') as variables_file:
+                cached_variables: dict[str, Any] = pickle.load(variables_file)
+        except (OSError, json.JSONDecodeError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False
+        # source file removed by user would come back under number of other file, so creator is run again
+        if any(directory_type == SOURCE_FILES and not os.path.isfile(self._get_path(directory_type, file_name))
+               for directory_type, file_name in files):
+            return False
+        cached_paths: list[tuple[str, str]] = [
+            (os.path.join(entry_directory, CreatorResultCache.FILES_DIRECTORY_NAME, directory_type, file_name),
+             self._get_path(directory_type, file_name)) for directory_type, file_name in files]
+        # changes of user aren't overwritten
+        if any(os.path.exists(path) and BuildCache.hash_file(path) != BuildCache.hash_file(cached_path)
+               for cached_path, path in cached_paths):
+            return False
+        synchronizer: FilesSynchronizer = FilesSynchronizer()
+        for cached_path, path in cached_paths:
+            if not os.path.exists(path) and not synchronizer.sync_file(cached_path, path):
+                return False
+        variables.update(cached_variables)
+        # entry is marked as recently used
+        os.utime(entry_directory)
+        return True
+
+    def store(self, fingerprint: str, variables: dict[str, Any], variables_names: list[str],
+              files: list[tuple[str, str]]) -> bool:
+        """
+        :param variables_names: variables set by creator
+        :param files: (directory type, name of file) of files written by creator
+        :return: bool - was result stored
+        """
+        entry_directory: str = os.path.join(self.directory, fingerprint)
+        temporary_directory: str = f'{entry_directory}{CreatorResultCache.TEMPORARY_SUFFIX}'
+        try:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+            for directory_type in {directory_type for directory_type, _ in files}:
+                os.makedirs(os.path.join(temporary_directory, CreatorResultCache.FILES_DIRECTORY_NAME, directory_type))
+            os.makedirs(temporary_directory, exist_ok=True)
+            for directory_type, file_name in files:
+                shutil.copy2(self._get_path(directory_type, file_name),
+                             os.path.join(temporary_directory, CreatorResultCache.FILES_DIRECTORY_NAME,
+                                          directory_type, file_name))
+            with open(os.path.join(temporary_directory, CreatorResultCache.VARIABLES_FILE_NAME), 'wb') as variables_file:
+                pickle.dump({name: variables[name] for name in variables_names}, variables_file)
+            with open(os.path.join(temporary_directory, CreatorResultCache.RESULT_FILE_NAME), 'w',
+                      encoding=ENCODING) as result_file:
+                json.dump({'variables': variables_names, 'files': files}, result_file)
+            # entry appears at once, so half stored result is never restored
+            shutil.rmtree(entry_directory, ignore_errors=True)
+            os.rename(temporary_directory, entry_directory)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+            return False
+        self.evict()
+        return True
+
+    @staticmethod
+    def get_size(directory: str) -> int:
+        size: int = 0
+        for root, _, file_names in os.walk(directory):
+            for file_name in file_names:
+                try:
+                    size += os.path.getsize(os.path.join(root, file_name))
+                except OSError:
+                    pass
+        return size
+
+    def evict(self) -> None:
+        """
+        Remove least recently used results over limit of size
+        """
+        try:
+            entries: list[os.DirEntry] = [entry for entry in os.scandir(self.directory) if entry.is_dir()
+                                          and not entry.name.endswith(CreatorResultCache.TEMPORARY_SUFFIX)]
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+        total_size: int = 0
+        for entry in entries:
+            total_size += CreatorResultCache.get_size(entry.path)
+            if total_size > self.max_size:
+                shutil.rmtree(entry.path, ignore_errors=True)
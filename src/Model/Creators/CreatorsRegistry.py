@@ -0,0 +1,113 @@
+import importlib
+import os
+import pkgutil
+import re
+from typing import TYPE_CHECKING
+
+from settings_namespace import ENCODING
+
+if TYPE_CHECKING:
+    from Model.Creators.Creator import Creator
+
+
+class CreatorEntry:
+    """
+    Declarative description of creator - it knows title and module of creator,
+    but module is imported only when creator class is requested for the first time
+    """
+    SPLIT_SIGN: str = '.'
+    CHANGED_PROJECT_INFO: str = 'Changed project'
+
+    def __init__(self, title: str, module_path: str) -> None:
+        self.title: str = title
+        self.module_path: str = module_path
+        self._creator_class: type['Creator'] | None = None
+
+    @property
+    def class_name(self) -> str:
+        # Creator convention - name of creator script -> name of creator class
+        return self.module_path.split(CreatorEntry.SPLIT_SIGN)[-1]
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._creator_class is not None
+
+    def load_creator_class(self) -> type['Creator']:
+        if self._creator_class is None:
+            module = importlib.import_module(self.module_path)
+            if not hasattr(module, self.class_name):
+                raise ImportError(CreatorEntry.CHANGED_PROJECT_INFO)
+            self._creator_class = getattr(module, self.class_name)
+        return self._creator_class
+
+    def __repr__(self):
+        return self.title
+
+
+class CreatorsRegistry:
+    """
+    Registry lists creators without importing their modules, heavy dependencies
+    of creators (sklearn, seaborn, gspread, sympy...) are loaded on first use of creator.
+    Title of creator is read from TITLE constant in source of its module, so it is declared only by creator
+    """
+    PACKAGE: str = 'Model.Creators'
+    SOURCE_EXTENSION: str = '.py'
+    # class constant, e.g. TITLE: str = 'Table Creator'
+    TITLE_PATTERN: re.Pattern = re.compile(r'''^[ \t]+TITLE: str = (['"])(.+?)\1''', re.MULTILINE)
+
+    # modules of package which are not creators
+    NON_CREATOR_MODULES: list[str] = ['__init__', 'Creator', 'CreatorListener', 'CreatorsRegistry',
+                                      'CreatorResultCache']
+
+    def __init__(self) -> None:
+        self._listed_entries: list[CreatorEntry] | None = None
+
+    def _get_package_path(self) -> list[str]:
+        return importlib.import_module(CreatorsRegistry.PACKAGE).__path__
+
+    @staticmethod
+    def read_title(module_filepath: str) -> str | None:
+        """
+        :return: title declared by TITLE constant of creator or None, if module doesn't declare it
+        """
+        try:
+            with open(module_filepath, 'r', encoding=ENCODING) as module_file:
+                match: re.Match | None = CreatorsRegistry.TITLE_PATTERN.search(module_file.read())
+        except (OSError, UnicodeDecodeError):
+            return None
+        return match.group(2) if match is not None else None
+
+    def _find_entries(self) -> list[CreatorEntry]:
+        """
+        Creators are found by name of module only (without importing), title of creator,
+        which doesn't declare it, is just name of module
+        """
+        entries: list[CreatorEntry] = []
+        for module_info in pkgutil.iter_modules(self._get_package_path()):
+            if module_info.ispkg or module_info.name in CreatorsRegistry.NON_CREATOR_MODULES:
+                continue
+            module_filepath: str = os.path.join(module_info.module_finder.path,
+                                                f'{module_info.name}{CreatorsRegistry.SOURCE_EXTENSION}')
+            title: str = CreatorsRegistry.read_title(module_filepath) or module_info.name
+            entries.append(CreatorEntry(title, f'{CreatorsRegistry.PACKAGE}.{module_info.name}'))
+        return entries
+
+    def list_creators(self) -> list[CreatorEntry]:
+        if self._listed_entries is None:
+            self._listed_entries = sorted(self._find_entries(), key=lambda entry: entry.class_name)
+        return self._listed_entries
+
+    def find_by_title(self, title: str) -> CreatorEntry | None:
+        for entry in self.list_creators():
+            if entry.title == title:
+                return entry
+        return None
+
+    def find(self, name: str) -> CreatorEntry | None:
+        """
+        :param name: title or class name of creator
+        """
+        entry: CreatorEntry | None = self.find_by_title(name)
+        if entry is not None:
+            return entry
+        return next((entry for entry in self.list_creators() if entry.class_name == name), None)
@@ -1,63 +1,29 @@
 import sys
 from datetime import datetime
+from typing import Any, TYPE_CHECKING
 
-from PySide6.QtCore import QDate
-from PySide6.QtWidgets import QWidget, QDialog, QGridLayout, QLabel, QLineEdit, QPushButton, QApplication, QDateEdit
 from pylatex import NoEscape, Command, Package
 
+from Model.Building.PreambleFormat import PreambleFormat
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.SourceFiles.SourceFile import SourceFile
 from Model.SourceFiles.SourceFilesManager import SourceFilesManager
 
-
-class TitleCreatorDialog(QDialog):
-    def __init__(self, parent_widget: QWidget):
-        super().__init__(parent_widget)
-        self.setWindowTitle('Document creator')
-        layout = QGridLayout()
-
-        self.title_label = QLabel('Title:')
-        self.title_input = QLineEdit(self)
-        layout.addWidget(self.title_label, 0, 0)
-        layout.addWidget(self.title_input, 0, 1)
-
-        self.author_label = QLabel('Author:')
-        self.author_input = QLineEdit(self)
-        layout.addWidget(self.author_label, 1, 0)
-        layout.addWidget(self.author_input, 1, 1)
-
-        self.group_label = QLabel('Group:')
-        self.group_input = QLineEdit(self)
-        layout.addWidget(self.group_label, 2, 0)
-        layout.addWidget(self.group_input, 2, 1)
-
-        self.date_label = QLabel('Date:')
-        self.date_input: QDateEdit = QDateEdit(self)
-        self.date_input.setDate(QDate.currentDate())
-        layout.addWidget(self.date_label, 3, 0)
-        layout.addWidget(self.date_input, 3, 1)
-
-        self.ok_button = QPushButton('OK', self)
-
-        layout.addWidget(self.ok_button, 4, 0, 1, 2)
-
-        self.setLayout(layout)
-        self.ok_button.clicked.connect(self.accept)
-
-    def get_user_input(self) -> tuple[str, str, str, datetime]:
-        return self.title_input.text().strip(), self.author_input.text().strip(), self.group_input.text().strip(), self.date_input.date().toPython()
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
 
 
 class DocumentCreator(Creator):
     TITLE: str = "Document creator"
     BODY_MARK: str = "Body"
+    PARAMETERS: list[str] = ['title', 'author', 'group', 'date']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
-        self.dialog_execution: int = QDialog.Rejected
-        self.dialog: TitleCreatorDialog = TitleCreatorDialog(self.parent_widget)
-        self.creator_listener: CreatorListener = creator_listener
+        self.dialog_execution: int | None = None
+        self.creator_listener: CreatorListener | None = creator_listener
         self.file_name: str = ''
         self.author: str = ''
         self.title: str = ''
@@ -75,16 +41,34 @@ class DocumentCreator(Creator):
         self.group = group
         self.date=date
 
+    def set_parameters(self, parameters: dict[str, Any]) -> bool:
+        """
+        :param parameters: date is given in ISO format, today is used without it
+        """
+        if any(name not in DocumentCreator.PARAMETERS for name in parameters):
+            return False
+        try:
+            date: datetime = (datetime.fromisoformat(parameters['date']) if 'date' in parameters
+                              else datetime.today())
+        except (TypeError, ValueError):
+            return False
+        self.set_info_for_document(parameters.get('title', ''), parameters.get('author', ''),
+                                   parameters.get('group', ''), date)
+        return True
+
     def set_data(self) -> None:
-        self.dialog_execution: int = self.dialog.exec()
-        title, author, group, date = self.dialog.get_user_input()
+        self.dialog_execution: int = self.get_use_dialog().exec()
+        title, author, group, date = self.get_use_dialog().get_user_input()
         self.set_info_for_document(title, author, group, date)
 
     def validate_user_info(self) -> bool:
         return len(self.author) > 0 and self.file_name != SourceFilesManager.BAD_FILE_NAME
 
+    def validate_parameters(self) -> bool:
+        return self.validate_user_info()
+
     def validate_data(self) -> bool:
-        return self.dialog_execution == QDialog.Accepted and self.validate_user_info()
+        return Creator.is_dialog_accepted(self.dialog_execution) and self.validate_parameters()
 
     def create_document(self) -> bool:
         body_include_mark: str = SourceFile.create_input_command(DocumentCreator.BODY_MARK)
@@ -92,9 +76,10 @@ class DocumentCreator(Creator):
                                f'{Package('graphicx').dumps()}\n'
                                f'{Package('float').dumps()}\n'
                                f'{Package('fontenc', options=['T1']).dumps()}\n'
-                               f'{Package('hyperref').dumps()}\n'
                                f'{Package('booktabs').dumps()}\n'
-                               f'{Package('longtable').dumps()}\n\n'
+                               f'{Package('longtable').dumps()}\n'
+                               f'{NoEscape(PreambleFormat.END_OF_DUMP)}\n'
+                               f'{Package('hyperref').dumps()}\n\n'
                                f'{Command('title', self.title).dumps()}\n'
                                f'{Command('author', NoEscape(f'{self.author}\\\\{self.group}')).dumps()}\n'
                                f'{Command('date', self.date.strftime("%d %B %Y")).dumps()}\n\n'
@@ -107,8 +92,9 @@ class DocumentCreator(Creator):
     def perform_operations(self) -> bool:
         return self.create_document()
 
-    def get_use_dialog(self) -> QDialog:
-        return self.dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from UI.TitleCreatorDialog import TitleCreatorDialog
+        return TitleCreatorDialog(self.parent_widget)
 
 
 if __name__ == '__main__':
@@ -121,6 +107,7 @@ if __name__ == '__main__':
             print(result)
 
 
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     doc_creator = DocumentCreator(local_settings, Listener(), None)
 
@@ -1,9 +1,7 @@
 import sys
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
 import sympy as sp
-from PySide6.QtWidgets import QWidget, QGridLayout, QPushButton, QCheckBox, QDialog, QApplication, QVBoxLayout, \
-    QLineEdit
 from sympy import latex
 
 from Model.Creators.Creator import Creator
@@ -11,48 +9,9 @@ from Model.Creators.CreatorListener import CreatorListener
 from Model.SourceFiles.SourceFilesManager import SourceFilesManager
 from Model.Variables.VariablesConsumer import VariablesConsumer
 from Model.Variables.variables_namespace import LATEX_SUBSTITUTIONS_VARIABLE
-from UI.PairInputsDialog import PairInputsDialog
-
-
-class ExpressionInputDialog(PairInputsDialog):
-    def __init__(self, parent_widget: QWidget) -> None:
-        super().__init__(parent_widget)
-        layout: QGridLayout = QGridLayout()
-        _, self.equation_varname = self.add_pair(0, 'Input variable name of equation: ', layout)
-        _, self.expression = self.add_pair(1, 'Input your equation: ', layout)
-        self.should_save_into_source_file: QCheckBox = QCheckBox('Save equation in source file')
-        self.add_one_element(2, self.should_save_into_source_file, layout)
-        self.should_display_in_dialog: QCheckBox = QCheckBox('Display on screen')
-        self.add_one_element(3, self.should_display_in_dialog, layout)
-        self.should_expand_with_existing_variables: QCheckBox = QCheckBox('Expand equation')
-        self.add_one_element(4, self.should_expand_with_existing_variables, layout)
-
-        self.ok_button: QPushButton = QPushButton('OK')
-        layout.addWidget(self.ok_button, 5, 0, 1, 2)
-
-        self.ok_button.clicked.connect(self.accept)
-        self.setLayout(layout)
-
-    def get_user_input(self) -> tuple[str, str, bool, bool, bool]:
-        return (self.equation_varname.text(),
-                self.expression.text(),
-                self.should_save_into_source_file.isChecked(),
-                self.should_display_in_dialog.isChecked(),
-                self.should_expand_with_existing_variables.isChecked())
-
-
-class EquationDisplay(QDialog):
-    def __init__(self, parent_widget: QWidget, equation: str) -> None:
-        super().__init__(parent_widget)
-        self.setWindowTitle('Equation')
-        self.setLayout(QVBoxLayout())
-        self.display: QLineEdit = QLineEdit()
-        self.display.setReadOnly(True)
-        self.display.setText(equation)
-        self.layout().addWidget(self.display)
-        self.ok_button: QPushButton = QPushButton('OK')
-        self.ok_button.clicked.connect(self.accept)
-        self.layout().addWidget(self.ok_button)
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
 
 
 class EquationsChain:
@@ -95,11 +54,14 @@ class ExpressionInputter(Creator, VariablesConsumer):
     """
 
     TITLE: str = 'Equation inputter'
+    # equation can be displayed only in dialog, so displaying isn't parameter
+    PARAMETERS: list[str] = ['expression_varname', 'raw_expression', 'should_save_source_file',
+                             'should_expand_expression']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
-        self.dialog: ExpressionInputDialog = ExpressionInputDialog(self.parent_widget)
-        self.getting_status: int = QDialog.Rejected
+        self.getting_status: int | None = None
         self.expression_varname: str = ''
         self.raw_expression: str = ''
         self.should_save_source_file: bool = False
@@ -109,25 +71,28 @@ class ExpressionInputter(Creator, VariablesConsumer):
     def get_title(self) -> str:
         return ExpressionInputter.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from UI.ExpressionInputDialog import ExpressionInputDialog
+        return ExpressionInputDialog(self.parent_widget)
 
     def set_data(self) -> None:
-        self.getting_status = self.dialog.exec()
-        user_input: tuple[str, str, bool, bool, bool] = self.dialog.get_user_input()
+        self.getting_status = self.get_use_dialog().exec()
+        user_input: tuple[str, str, bool, bool, bool] = self.get_use_dialog().get_user_input()
         self.expression_varname = user_input[0]
         self.raw_expression: str = user_input[1]
         self.should_save_source_file = user_input[2]
         self.should_display_dialog = user_input[3]
         self.should_expand_expression = user_input[4]
 
-    def validate_data(self) -> bool:
+    def validate_parameters(self) -> bool:
         result: bool = True
-        result = result and self.getting_status == QDialog.Accepted
         result = result and self.expression_varname != '' and self.expression_varname not in self.variables
         result = result and self.raw_expression != ''
         return result
 
+    def validate_data(self) -> bool:
+        return Creator.is_dialog_accepted(self.getting_status) and self.validate_parameters()
+
     def expand_expression(self, equations: EquationsChain) -> None:
         last_expression: sp.Expr = equations.get_last_expression()
         if last_expression.is_Number:
@@ -154,6 +119,7 @@ class ExpressionInputter(Creator, VariablesConsumer):
         return source_files_manager.save_next_source_file(self.expression_varname, str(equations))
 
     def display_equation(self, equation: EquationsChain) -> None:
+        from UI.EquationDisplay import EquationDisplay
         EquationDisplay(self.parent_widget, str(equation)).exec()
 
     def perform_operations(self) -> bool:
@@ -189,6 +155,7 @@ class ExpressionInputter(Creator, VariablesConsumer):
 
 
 if __name__ == '__main__':
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     local_settings = {dir_type: f'..\\..\\..\\example\\{dir_type}' for dir_type in
                       ['baseFiles', 'sourceFiles', 'generatedFiles']}
@@ -2,55 +2,75 @@ import importlib.util
 import os.path
 import sys
 from types import ModuleType
-
-import sympy as sym
-
-from PySide6.QtWidgets import QDialog, QFileDialog, QApplication, QWidget
+from typing import TYPE_CHECKING, Any
 
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.Variables.VariablesConsumer import VariablesConsumer
+from Model.Variables.VariablesStore import VariablesStore
+from Model.Variables.VariablesWriteRecorder import VariablesWriteRecorder
 from Model.utils import path_to_module
 from settings_namespace import BASE_FILES
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
+
 
 class OperateVariablesCreator(Creator, VariablesConsumer):
     TITLE: str = 'Variables operator'
     RUN_FUNCTION: str = 'run'
+    PARAMETERS: list[str] = ['script_path']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
         self.script_path: str = ''
-        self.script_dialog = QFileDialog(self.parent_widget)
 
     def get_title(self) -> str:
         return OperateVariablesCreator.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.script_dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from PySide6.QtWidgets import QFileDialog
+        return QFileDialog(self.parent_widget)
 
     def set_data(self) -> None:
+        from PySide6.QtWidgets import QFileDialog
         options = QFileDialog.Options()
-        self.script_path, _ = self.script_dialog.getOpenFileName(self.script_dialog.parent(), "Select .py script",
+        self.script_path, _ = self.get_use_dialog().getOpenFileName(self.get_use_dialog().parent(), "Select .py script",
                                                                  self.settings[BASE_FILES], "Python Files (*.py)",
                                                                  options=options)
 
-    def validate_data(self) -> bool:
+    def validate_parameters(self) -> bool:
         return self.script_path != ''
 
+    def validate_data(self) -> bool:
+        return self.validate_parameters()
+
     def perform_operations(self) -> bool:
         try:
             script: ModuleType=path_to_module(self.script_path)
             if hasattr(script, OperateVariablesCreator.RUN_FUNCTION):
+                store: Any = (self.variables.variables if isinstance(self.variables, VariablesWriteRecorder)
+                              else self.variables)
+                fingerprints: dict[str, str | None] = (store.get_fingerprints() if isinstance(store, VariablesStore)
+                                                       else {})
                 script.run(self.variables)
+                if isinstance(store, VariablesStore):
+                    # script could change values in place, only values it has changed are saved again
+                    for name in store.mark_changed_since(fingerprints):
+                        if isinstance(self.variables, VariablesWriteRecorder):
+                            self.variables.record(name)
                 return True
             else:
                 return False
-        except Exception:
+        except Exception as exception:
+            self.record_failure(exception)
             return False
 
 
 if __name__ == '__main__':
+    import sympy as sym
+
     local_settings = {dir_type: f'..\\..\\..\\example\\{dir_type}' for dir_type in
                       ['baseFiles', 'sourceFiles', 'generatedFiles']}
 
@@ -62,6 +82,7 @@ if __name__ == '__main__':
             print(result)
 
 
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     intro_vars = OperateVariablesCreator(local_settings, Listener(), None)
     intro_vars.set_variables(variables)
@@ -1,48 +1,22 @@
 import os.path
 import sys
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import sympy as sym
-from PySide6.QtWidgets import QWidget, QApplication, QDialog, QGridLayout, QPushButton, QCheckBox
 from pylatex import NoEscape
 
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.SourceFiles.SourceFilesManager import SourceFilesManager
 from Model.Variables.VariablesConsumer import VariablesConsumer
-from UI.PairInputsDialog import PairInputsDialog
-from settings_namespace import BASE_FILES
+from settings_namespace import BASE_FILES, SOURCE_FILES
 
-
-class PlotInput(PairInputsDialog):
-    def __init__(self, parent_widget: QWidget) -> None:
-        super().__init__(parent_widget)
-        layout: QGridLayout = QGridLayout()
-        self.add_pair(0, 'Input output name:', layout)
-        self.add_pair(1, 'Input variable of x data:', layout)
-        self.add_pair(2, 'Input variable x axis label:', layout)
-        self.add_pair(3, 'Input variable of y data:', layout)
-        self.add_pair(4, 'Input y axis label:', layout)
-        self.add_pair(5, 'Input x errors variable name:', layout)
-        self.add_pair(6, 'Input y errors variable name:', layout)
-        self.add_pair(7, 'Input variable of regression result:', layout)
-
-        self.include_in_source_check_box: QCheckBox = QCheckBox('Include in source')
-        layout.addWidget(self.include_in_source_check_box, 8, 0, 1, 2)
-
-        self.ok_button: QPushButton = QPushButton('OK')
-        layout.addWidget(self.ok_button, 9, 0, 1, 2)
-
-        self.setLayout(layout)
-
-        self.ok_button.clicked.connect(self.accept)
-
-    def get_input(self) -> tuple[list[str], bool]:
-        return [self.layout().itemAtPosition(i, 1).widget().text() for i in
-                range(8)], self.include_in_source_check_box.isChecked()
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
 
 
 class PlotCreator(Creator, VariablesConsumer):
@@ -53,8 +27,12 @@ class PlotCreator(Creator, VariablesConsumer):
     CAPSIZE: int = 5
     REGRESSION_COLOR: str = 'tab:red'
     TITLE: str = 'plotter'
+    PARAMETERS: list[str] = ['output_name', 'x_axis_varname', 'x_axis_label', 'y_axis_varname', 'y_axis_label',
+                             'x_errors_varname', 'y_errors_varname', 'regression_result_varname',
+                             'should_include_in_source']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
 
         self.regression_result_varname: str = ''
@@ -67,18 +45,18 @@ class PlotCreator(Creator, VariablesConsumer):
         self.output_name: str = ''
         self.should_include_in_source: bool = False
 
-        self.dialog: PlotInput = PlotInput(self.parent_widget)
-        self.getting_result: int = QDialog.Rejected
+        self.getting_result: int | None = None
 
     def get_title(self) -> str:
         return PlotCreator.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from UI.PlotInput import PlotInput
+        return PlotInput(self.parent_widget)
 
     def set_data(self) -> None:
-        self.getting_result = self.dialog.exec()
-        data_list, self.should_include_in_source = self.dialog.get_input()
+        self.getting_result = self.get_use_dialog().exec()
+        data_list, self.should_include_in_source = self.get_use_dialog().get_input()
 
         self.output_name = data_list[0]
         self.x_axis_varname = data_list[1]
@@ -89,7 +67,7 @@ class PlotCreator(Creator, VariablesConsumer):
         self.y_errors_varname = data_list[6]
         self.regression_result_varname = data_list[7]
 
-    def validate_data(self) -> bool:
+    def validate_parameters(self) -> bool:
         result: bool = True
         result = result and self.output_name != ''
         result = result and self.x_axis_varname in self.variables
@@ -99,6 +77,13 @@ class PlotCreator(Creator, VariablesConsumer):
         result = result and self.regression_result_varname in self.variables
         return result
 
+    def validate_data(self) -> bool:
+        return Creator.is_dialog_accepted(self.getting_result) and self.validate_parameters()
+
+    def get_input_fingerprint(self) -> str | None:
+        return self.create_fingerprint([self.x_axis_varname, self.y_axis_varname, self.x_errors_varname,
+                                        self.y_errors_varname, self.regression_result_varname], [])
+
     def regression_model(self, parameters: list[float], arguments: np.ndarray) -> np.ndarray:
         a, b = parameters
         return a * arguments + b
@@ -128,6 +113,7 @@ class PlotCreator(Creator, VariablesConsumer):
 
         save_path: str = self.png_save_name()
         plt.savefig(save_path, bbox_inches='tight')
+        self.record_written_file(BASE_FILES, os.path.basename(save_path))
         return save_path
 
     def include_plot_in_source(self, base_filepath: str) -> bool:
@@ -145,7 +131,10 @@ class PlotCreator(Creator, VariablesConsumer):
                                f'{NoEscape(label)}\n'
                                f'{NoEscape(r'end{figure}')}')
         manager: SourceFilesManager = SourceFilesManager(self.settings)
-        return manager.save_next_source_file(table_name, source_content)
+        if not manager.save_next_source_file(table_name, source_content):
+            return False
+        self.record_written_file(SOURCE_FILES, manager.last_saved_file_name)
+        return True
 
     @property
     def padding(self) -> int:
@@ -167,11 +156,13 @@ class PlotCreator(Creator, VariablesConsumer):
                 if not self.include_plot_in_source(save_name):
                     return False
             return True
-        except Exception:
+        except Exception as exception:
+            self.record_failure(exception)
             return False
 
 
 if __name__ == '__main__':
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
 
     local_settings = {dir_type: f'..\\..\\..\\example\\{dir_type}' for dir_type in
@@ -1,9 +1,9 @@
 import sys
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 import sympy as sym
-from PySide6.QtWidgets import QWidget, QDialog, QGridLayout, QLabel, QLineEdit, QPushButton, QCheckBox, QApplication
 from sklearn.linear_model import LinearRegression
 
 from Model.Creators.Creator import Creator
@@ -11,49 +11,10 @@ from Model.Creators.CreatorListener import CreatorListener
 from Model.Creators.TableCreator import TableCreator
 from Model.SourceFiles.SourceFilesManager import SourceFilesManager
 from Model.Variables.VariablesConsumer import VariablesConsumer
-from UI.PairInputsDialog import PairInputsDialog
+from settings_namespace import SOURCE_FILES
 
-
-class RegressionDialog(PairInputsDialog):
-    def __init__(self, parent_widget: QWidget):
-        super().__init__(parent_widget)
-        self.setWindowTitle('Conduct regression')
-        layout = QGridLayout()
-
-        self.add_pair(0, 'Input name of variable with data:', layout)
-        self.add_pair(1, 'Input name of variable with prediction results:', layout)
-        self.add_pair(2, 'Input name of saved results:', layout)
-
-        self.save_as_source_file_check: QCheckBox = QCheckBox('Save in source file')
-        layout.addWidget(self.save_as_source_file_check, 3, 0, 1, 2)
-
-        self.changing_visible_rows_start_index = 4
-
-        self.add_pair(4, 'Input coefficient header:', layout)
-        self.add_pair(5, 'Input coefficient error header:', layout)
-        self.add_pair(6, 'Input intercept header:', layout)
-        self.add_pair(7, 'Input intercept error header:', layout)
-
-        self.changing_visible_rows_end_index = 7
-
-        self.ok_button: QPushButton = QPushButton('OK')
-        layout.addWidget(self.ok_button, 8, 0, 1, 2)
-
-        self.setLayout(layout)
-
-        self.change_visibility(False)
-
-        self.save_as_source_file_check.clicked.connect(
-            lambda: self.change_visibility(self.save_as_source_file_check.isChecked()))
-        self.ok_button.clicked.connect(self.accept)
-
-    def change_visibility(self, new_visible_stance: bool):
-        for i in range(self.changing_visible_rows_start_index, self.changing_visible_rows_end_index + 1):
-            self.layout().itemAtPosition(i, 0).widget().setVisible(new_visible_stance)
-            self.layout().itemAtPosition(i, 1).widget().setVisible(new_visible_stance)
-
-    def get_user_input(self) -> list[str]:
-        return [self.layout().itemAtPosition(i, 1).widget().text() for i in range(9) if i!=3 and i!=8]
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
 
 
 class RegressionResults:
@@ -71,25 +32,31 @@ class RegressionResults:
 
 class RegressionConductor(Creator, VariablesConsumer):
     TITLE: str = 'Linear regression creator'
-
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    # input series are only read (regression fits their copies), result is new variable
+    IS_THREAD_SAFE: bool = True
+    # headers of coefficient, its error, intercept and its error - all empty, if results aren't saved in table
+    TABLE_HEADERS_COUNT: int = 4
+    PARAMETERS: list[str] = ['x_axis_name', 'y_axis_name', 'new_var_name', 'table_headers']
+
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
-        self.dialog = RegressionDialog(parent_widget)
-        self.getting_result: int = QDialog.Rejected
+        self.getting_result: int | None = None
         self.x_axis_name: str = ''
         self.y_axis_name: str = ''
         self.new_var_name: str = ''
-        self.table_headers: list[str] = []
+        self.table_headers: list[str] = [''] * RegressionConductor.TABLE_HEADERS_COUNT
 
     def get_title(self) -> str:
         return RegressionConductor.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from UI.RegressionDialog import RegressionDialog
+        return RegressionDialog(self.parent_widget)
 
     def set_data(self) -> None:
-        self.getting_result = self.dialog.exec()
-        user_input: list[str] = self.dialog.get_user_input()
+        self.getting_result = self.get_use_dialog().exec()
+        user_input: list[str] = self.get_use_dialog().get_user_input()
         self.x_axis_name = user_input[0]
         self.y_axis_name = user_input[1]
         self.new_var_name = user_input[2]
@@ -99,8 +66,15 @@ class RegressionConductor(Creator, VariablesConsumer):
         return self.x_axis_name in self.variables.keys() and self.y_axis_name in self.variables.keys() and self.new_var_name != '' and (
                     set(self.table_headers) == {''} or '' not in self.table_headers)
 
+    def validate_parameters(self) -> bool:
+        return (len(self.table_headers) == RegressionConductor.TABLE_HEADERS_COUNT
+                and self.check_if_variables_names_are_valid())
+
     def validate_data(self) -> bool:
-        return self.getting_result == QDialog.Accepted and self.check_if_variables_names_are_valid()
+        return Creator.is_dialog_accepted(self.getting_result) and self.validate_parameters()
+
+    def get_input_fingerprint(self) -> str | None:
+        return self.create_fingerprint([self.x_axis_name, self.y_axis_name], [])
 
     def square_error(self, y: pd.Series, y_predicted: pd.Series) -> np.float64:
         return np.sum((y - y_predicted) ** 2)
@@ -139,13 +113,16 @@ class RegressionConductor(Creator, VariablesConsumer):
             files_manager: SourceFilesManager = SourceFilesManager(self.settings)
             if not files_manager.save_next_source_file(self.new_var_name, latex_content):
                 raise Exception(TableCreator.SAVE_PROBLEMS)
+            self.record_written_file(SOURCE_FILES, files_manager.last_saved_file_name)
 
             return True
-        except Exception:
+        except Exception as exception:
+            self.record_failure(exception)
             return False
 
 
 if __name__ == '__main__':
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     reg = RegressionConductor({}, None, None)
     res = reg.conduct_linear_regression(pd.Series([1, 2, 3, 4, 5, 6]), pd.Series([5, 9, 15, 18, 27, 30]))
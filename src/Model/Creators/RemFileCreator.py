@@ -1,21 +1,24 @@
 import os.path
 import sys
-
-from PySide6.QtWidgets import QWidget, QFileDialog, QDialog, QApplication
+from typing import TYPE_CHECKING
 
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.FilesDirectoriesManager import FilesDirectoriesManager
 from settings_namespace import SOURCE_FILES
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
+
 
 class RemFileCreator(Creator):
     TITLE: str = 'File remover'
+    PARAMETERS: list[str] = ['pathfile_to_rem']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
         self.pathfile_to_rem: str = ''
-        self.rem_dialog: QFileDialog = QFileDialog(parent_widget)
         self.default_directory: str = settings[SOURCE_FILES]
         self.files_directories_manager=FilesDirectoriesManager(self.settings)
 
@@ -26,8 +29,9 @@ class RemFileCreator(Creator):
         self.pathfile_to_rem: str = file_path
 
     def set_data(self) -> None:
+        from PySide6.QtWidgets import QFileDialog
         options = QFileDialog.Options()
-        file_path, _ = self.rem_dialog.getOpenFileName(self.rem_dialog.parent(), "Remove file", self.default_directory,
+        file_path, _ = self.get_use_dialog().getOpenFileName(self.get_use_dialog().parent(), "Remove file", self.default_directory,
                                                        "Any File (*.*)", options=options)
 
         self.set_info_about_chosen_file(file_path)
@@ -35,17 +39,21 @@ class RemFileCreator(Creator):
     def validate_chosen_file(self) -> bool:
         return self.pathfile_to_rem != '' and not os.path.isdir(self.pathfile_to_rem)
 
-    def validate_data(self) -> bool:
+    def validate_parameters(self) -> bool:
         return self.validate_chosen_file()
 
+    def validate_data(self) -> bool:
+        return self.validate_parameters()
+
     def set_default_directory(self, directory: str) -> None:
         self.default_directory = directory
 
     def perform_operations(self) -> bool:
         return self.files_directories_manager.remove_file(self.pathfile_to_rem)
 
-    def get_use_dialog(self) -> QDialog:
-        return self.rem_dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from PySide6.QtWidgets import QFileDialog
+        return QFileDialog(self.parent_widget)
 
 
 if __name__ == '__main__':
@@ -58,6 +66,7 @@ if __name__ == '__main__':
             print(result)
 
 
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     add_creator = RemFileCreator(local_settings, Listener(), None)
     add_creator.perform_functionality()
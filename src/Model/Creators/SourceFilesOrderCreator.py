@@ -0,0 +1,38 @@
+from typing import TYPE_CHECKING
+
+from Model.Creators.Creator import Creator
+from Model.Creators.CreatorListener import CreatorListener
+from Model.SourceFiles.SourceFilesManager import SourceFilesManager
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
+
+
+class SourceFilesOrderCreator(Creator):
+    """
+    Switch between ordering of source files by numbers in their names and ordering by manifest.
+    With manifest, reordering of source files doesn't rename any file.
+    """
+    TITLE: str = 'Source files order manifest'
+
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
+        super().__init__(settings, creator_listener, parent_widget)
+        self.source_files_manager: SourceFilesManager = SourceFilesManager(settings)
+
+    def get_title(self) -> str:
+        return SourceFilesOrderCreator.TITLE
+
+    def create_use_dialog(self) -> 'QDialog':
+        raise NotImplementedError
+
+    def set_data(self) -> None:
+        pass
+
+    def validate_data(self) -> bool:
+        return True
+
+    def perform_operations(self) -> bool:
+        if self.source_files_manager.is_ordered_by_manifest():
+            return self.source_files_manager.disable_order_manifest()
+        return self.source_files_manager.enable_order_manifest()
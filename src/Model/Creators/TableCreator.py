@@ -4,15 +4,15 @@ import gspread
 import re
 import sys
 from types import ModuleType
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 import sympy as sym
 
-from PySide6.QtWidgets import QWidget, QDialog, QLabel, QFileDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, \
-    QApplication, QCheckBox, QGroupBox, QListWidget, QListWidgetItem
 from gspread import Client, Spreadsheet, Worksheet, Cell
 
+from Model.Building.FragmentsCompiler import FragmentsCompiler
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.SourceFiles.SourceFilesManager import SourceFilesManager
@@ -20,199 +20,14 @@ from Model.Variables.VariablesConsumer import VariablesConsumer
 from Model.utils import path_to_module
 from settings_namespace import BASE_FILES, ENCODING, SOURCE_FILES
 
-
-class AddingGroupBox(QGroupBox):
-    def __init__(self, title):
-        super().__init__(title)
-        self.layout: QVBoxLayout = QVBoxLayout()
-
-        self.added_elements_list: QListWidget = QListWidget()
-        self.added_elements_list.setMaximumHeight(TableCreatorDialog.MAXIMUM_HEIGHTS_OF_LISTS)
-        self.added_elements_list.setVisible(False)
-        self.layout.addWidget(self.added_elements_list)
-
-        self.new_elements_control_panel: QVBoxLayout = QVBoxLayout()
-
-        self.add_elements_grouper: QHBoxLayout = QHBoxLayout()
-        self.add_element_button: QPushButton = QPushButton('Add')
-        self.name_of_element_input: QLineEdit = QLineEdit()
-
-        self.add_elements_grouper.addWidget(self.add_element_button)
-        self.add_elements_grouper.addWidget(self.name_of_element_input)
-        self.new_elements_control_panel.addLayout(self.add_elements_grouper)
-
-        self.remove_element_button: QPushButton = QPushButton('Remove')
-        self.new_elements_control_panel.addWidget(self.remove_element_button)
-
-        self.layout.addStretch()
-        self.layout.addLayout(self.new_elements_control_panel)
-
-        self.setLayout(self.layout)
-
-    def add_element(self) -> None:
-        if self.name_of_element_input.text() != '':
-            self.added_elements_list.addItem(self.name_of_element_input.text())
-            self.name_of_element_input.setText('')
-            self.added_elements_list.setVisible(True)
-
-    def remove_element(self) -> None:
-        selected_columns: list[QListWidgetItem] = self.added_elements_list.selectedItems()
-        if selected_columns:
-            self.added_elements_list.takeItem(self.added_elements_list.currentRow())
-            if self.added_elements_list.count() == 0:
-                self.added_elements_list.setVisible(False)
-                self.update()
-
-    def make_connections(self) -> None:
-        self.add_element_button.clicked.connect(self.add_element)
-        self.remove_element_button.clicked.connect(self.remove_element)
-
-    def get_all_items(self) -> list[str]:
-        return [self.added_elements_list.item(i).text() for i in range(self.added_elements_list.count())]
-
-
-class SelectFileSection(QVBoxLayout):
-    def __init__(self, label_title: str, file_select_dialog: QFileDialog, dialog_caption: str, dialog_base_dir: str,
-                 dialog_filters: str) -> None:
-        super().__init__()
-        self.file_select_dialog: QFileDialog = file_select_dialog
-        self.dialog_caption: str = dialog_caption
-        self.dialog_base_dir: str = dialog_base_dir
-        self.dialog_filters: str = dialog_filters
-
-        self.select_layout: QHBoxLayout = QHBoxLayout()
-        self.select_label: QLabel = QLabel(label_title)
-        self.select_table_button: QPushButton = QPushButton("Select")
-
-        self.select_layout.addWidget(self.select_label)
-        self.select_layout.addWidget(self.select_table_button)
-        self.addLayout(self.select_layout)
-
-        self.select_displayer: QLineEdit = QLineEdit()
-        self.select_displayer.setReadOnly(True)
-        self.addWidget(self.select_displayer)
-
-    def select_file(self) -> None:
-        options: QFileDialog.Option = QFileDialog.Options()
-        file, _ = self.file_select_dialog.getOpenFileName(self.file_select_dialog.parent(), self.dialog_caption,
-                                                          self.dialog_base_dir,
-                                                          self.dialog_filters, options=options)
-        self.file_path: str = file
-        self.select_displayer.setText(self.file_path)
-
-    def make_connections(self):
-        self.select_table_button.clicked.connect(self.select_file)
-
-
-class TableCreatorDialog(QDialog):
-    MAXIMUM_HEIGHTS_OF_LISTS = 350
-
-    def __init__(self, parent_widget: QWidget, settings: dict[str, str]) -> None:
-        super().__init__(parent_widget)
-        self.settings = settings
-        self.setWindowTitle("Table creator")
-        self.main_layout = QVBoxLayout()
-        self.setLayout(self.main_layout)
-        self.file_select_dialog: QFileDialog = QFileDialog(self)
-        self.select_table_section: SelectFileSection = SelectFileSection('Base table', self.file_select_dialog,
-                                                                         'Select base table', self.settings[BASE_FILES],
-                                                                         "Raw Table (*.txt);;Saved Table (*.csv)")
-        self.main_layout.addLayout(self.select_table_section)
-        self.create_index_option: QCheckBox = QCheckBox("Create index")
-        self.create_index_option.setChecked(True)
-        self.main_layout.addWidget(self.create_index_option)
-        self._build_name_of_name_table_section()
-        self.add_columns_group = AddingGroupBox('New columns')
-        self.main_layout.addWidget(self.add_columns_group)
-        self.add_rows_group = AddingGroupBox('New rows')
-        self.main_layout.addWidget(self.add_rows_group)
-        self.calculating_script_section: SelectFileSection = SelectFileSection('Calculating script',
-                                                                               self.file_select_dialog,
-                                                                               'Select calculating script',
-                                                                               self.settings[BASE_FILES],
-                                                                               "Python script (*.py)")
-        self.main_layout.addLayout(self.calculating_script_section)
-        self.formatting_script_section: SelectFileSection = SelectFileSection('Formatting script',
-                                                                              self.file_select_dialog,
-                                                                              'Select formatting script',
-                                                                              self.settings[BASE_FILES],
-                                                                              "Python script (*.py)")
-        self.main_layout.addLayout(self.formatting_script_section)
-
-        self.checkboxes: QHBoxLayout = QHBoxLayout()
-
-        self.gspread_save: QCheckBox = QCheckBox('Save to gspread')
-        self.csv_save: QCheckBox = QCheckBox('Save to csv')
-        self.as_source_save: QCheckBox = QCheckBox('Convert table into source file')
-        self.checkboxes.addWidget(self.gspread_save)
-        self.checkboxes.addWidget(self.csv_save)
-        self.checkboxes.addWidget(self.as_source_save)
-
-        self.main_layout.addLayout(self.checkboxes)
-
-        self._build_gspread_input()
-
-        self.ok_button: QPushButton = QPushButton('OK')
-
-        self.main_layout.addWidget(self.ok_button)
-
-        self._make_connections()
-        self.resize(500, -1)
-
-    def _build_name_of_name_table_section(self):
-        self.local_layout: QHBoxLayout = QHBoxLayout()
-
-        self.name_table_label: QLabel = QLabel("Table name")
-        self.name_table_input: QLineEdit = QLineEdit()
-
-        self.local_layout.addWidget(self.name_table_label)
-        self.local_layout.addWidget(self.name_table_input)
-
-        self.main_layout.addLayout(self.local_layout)
-
-    def _build_gspread_input(self):
-        self.local_layout = QHBoxLayout()
-        self.spreadsheet_key_label = QLabel('Spreadsheet key')
-        self.spreadsheet_key_input = QLineEdit()
-        self.spreadsheet_key_input.setEnabled(False)
-        self.local_layout.addWidget(self.spreadsheet_key_label)
-        self.local_layout.addWidget(self.spreadsheet_key_input)
-        self.main_layout.addLayout(self.local_layout)
-
-    def gspread_clicked(self):
-        if not self.gspread_save.isChecked():
-            self.spreadsheet_key_input.setText('')
-            self.spreadsheet_key_input.setEnabled(False)
-        else:
-            self.spreadsheet_key_input.setEnabled(True)
-
-    def _make_connections(self) -> None:
-        self.select_table_section.make_connections()
-        self.add_columns_group.make_connections()
-        self.add_rows_group.make_connections()
-        self.calculating_script_section.make_connections()
-        self.formatting_script_section.make_connections()
-        self.ok_button.clicked.connect(self.accept)
-        self.gspread_save.clicked.connect(self.gspread_clicked)
-
-    def get_user_input(self) -> dict[str, str | bool | list[str]]:
-        data_pack: dict[str, str | bool | list[str]] = {'base_table': self.select_table_section.select_displayer.text(),
-                                                        'index_to_create': self.create_index_option.isChecked(),
-                                                        'table_name': self.name_table_input.text(),
-                                                        'columns': self.add_columns_group.get_all_items(),
-                                                        'rows': self.add_rows_group.get_all_items(),
-                                                        'calc_script': self.calculating_script_section.select_displayer.text(),
-                                                        'formatting_script': self.formatting_script_section.select_displayer.text(),
-                                                        'gspread': self.gspread_save.isChecked(),
-                                                        'csv': self.csv_save.isChecked(),
-                                                        'source': self.as_source_save.isChecked(),
-                                                        'key': self.spreadsheet_key_input.text()}
-
-        return data_pack
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
 
 
 class TableCreator(Creator, VariablesConsumer):
     TITLE: str = 'Table Creator'
+    # table is read from file and scripts get only its own frames, its files are named by name of table
+    IS_THREAD_SAFE: bool = True
     TABLE_VALID_FORMAT: str = SourceFilesManager.NAME_FORMAT
     BASE_FILE_COLUMNS_SPLIT_DELIMITER_FORMAT: str = r'\s*,\s*'
     FLOAT_FORMAT: str = r'[-+]?(?:\d*\.?\d+)'
@@ -229,11 +44,14 @@ class TableCreator(Creator, VariablesConsumer):
     INDEX_NAME: str = 'No.'
 
     GSPREAD_SCOPES: list[str] = ['https://www.googleapis.com/auth/spreadsheets']
+    PARAMETERS: list[str] = ['base_table_path', 'should_create_index', 'table_name', 'columns', 'rows',
+                             'calculating_script_path', 'formatting_script_path', 'should_save_to_gspread',
+                             'should_save_csv', 'should_make_source_file', 'spreadsheet_key']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
-        self.table_create_dialog: TableCreatorDialog = TableCreatorDialog(parent_widget, self.settings)
-        self.dialog_result: int = QDialog.Rejected
+        self.dialog_result: int | None = None
 
         self.base_table_path: str = ''
         self.should_create_index: bool = False
@@ -250,12 +68,13 @@ class TableCreator(Creator, VariablesConsumer):
     def get_title(self) -> str:
         return TableCreator.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.table_create_dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from UI.TableCreatorDialog import TableCreatorDialog
+        return TableCreatorDialog(self.parent_widget, self.settings)
 
     def set_data(self) -> None:
-        self.dialog_result = self.table_create_dialog.exec()
-        data_pack: dict[str, str | bool | list[str]] = self.table_create_dialog.get_user_input()
+        self.dialog_result = self.get_use_dialog().exec()
+        data_pack: dict[str, str | bool | list[str]] = self.get_use_dialog().get_user_input()
 
         self.base_table_path = data_pack['base_table']
         self.should_create_index = data_pack['index_to_create']
@@ -272,8 +91,18 @@ class TableCreator(Creator, VariablesConsumer):
     def validate_input(self) -> bool:
         return re.fullmatch(TableCreator.TABLE_VALID_FORMAT, self.table_name) is not None
 
+    def validate_parameters(self) -> bool:
+        return self.validate_input()
+
     def validate_data(self) -> bool:
-        return self.dialog_result == QDialog.Accepted and self.validate_input()
+        return Creator.is_dialog_accepted(self.dialog_result) and self.validate_parameters()
+
+    def get_input_fingerprint(self) -> str | None:
+        if self.should_save_to_gspread:
+            # spreadsheet can be changed by others, so it is always written
+            return None
+        return self.create_fingerprint([], [path for path in [self.base_table_path, self.calculating_script_path,
+                                                               self.formatting_script_path] if path != ''])
 
     def get_columns_from_file(self) -> list[str]:
         with open(self.base_table_path, 'r', encoding=ENCODING) as file:
@@ -370,6 +199,8 @@ class TableCreator(Creator, VariablesConsumer):
         script: ModuleType = path_to_module(self.formatting_script_path)
         if hasattr(script, TableCreator.FORMATTING_SCRIPT_SOURCE_SAVER):
             formatted_table: pd.DataFrame = self.variables[self.get_formatted_table_name()]
+            # files written by script aren't known
+            self.has_unrecorded_outputs = True
             script.save_to_source(formatted_table, self.settings[SOURCE_FILES])
         else:
             self.save_table_to_source_as_default(self.variables[self.get_formatted_table_name()])
@@ -378,9 +209,12 @@ class TableCreator(Creator, VariablesConsumer):
         copy_od_data_frame=data_frame.copy(True).fillna('')
 
         latex_content: str = copy_od_data_frame.to_latex(index=True, caption=self.table_name, label=f'tab:{self.table_name}',escape=False, position='H',longtable=True)
+        # longtable is compiled separately, so unchanged table isn't typeset again by every build
+        latex_content = FragmentsCompiler.wrap_fragment(latex_content)
         files_manager: SourceFilesManager=SourceFilesManager(self.settings)
         if not files_manager.save_next_source_file(self.table_name,latex_content):
             raise Exception(TableCreator.SAVE_PROBLEMS)
+        self.record_written_file(SOURCE_FILES, files_manager.last_saved_file_name)
 
     def construct_table_and_save(self) -> bool:
         data_frame: pd.DataFrame = pd.DataFrame()
@@ -408,10 +242,12 @@ class TableCreator(Creator, VariablesConsumer):
                     data_frame: pd.DataFrame = self.variables[self.table_name]
                     copy_od_data_frame: pd.DataFrame=data_frame.copy(True).fillna('')
                     copy_od_data_frame.to_csv(os.path.join(self.settings[BASE_FILES], f'{self.table_name}.csv'), index=self.should_create_index, sep=TableCreator.CSV_SEPARATOR, encoding=ENCODING)
+                    self.record_written_file(BASE_FILES, f'{self.table_name}.csv')
                     if self.formatting_script_path != '':
                         formatted_frame: pd.DataFrame = self.variables[self.get_formatted_table_name()]
                         formatted_frame.to_csv(os.path.join(self.settings[BASE_FILES], self.get_formatted_table_name()), index=self.should_create_index,
                                                sep=TableCreator.CSV_SEPARATOR)
+                        self.record_written_file(BASE_FILES, self.get_formatted_table_name())
                 if self.should_make_source_file:
                     if self.formatting_script_path != '':
                         self.save_table_with_formatting_script()
@@ -420,6 +256,7 @@ class TableCreator(Creator, VariablesConsumer):
                 return True
             except Exception as e:
                 print(e)
+                self.record_failure(e)
                 return False
 
     def perform_operations(self) -> bool:
@@ -438,6 +275,7 @@ if __name__ == '__main__':
             print(result)
 
 
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     table_creator = TableCreator(local_settings, Listener(), None)
     table_creator.set_variables(variables)
@@ -1,53 +1,40 @@
-from PySide6.QtWidgets import QDialog, QWidget, QGridLayout, QLabel, QLineEdit, QPushButton
+from typing import TYPE_CHECKING
 
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.Variables.VariablesConsumer import VariablesConsumer
 from Model.Variables.variables_namespace import TEXT_EDITOR_VARIABLE
 
-
-class TextEditorCommandDialog(QDialog):
-    def __init__(self, parent_widget: QWidget):
-        super().__init__(parent_widget)
-        self.setWindowTitle(TextEditorSelector.TITLE)
-        layout = QGridLayout()
-
-        self.title_label = QLabel('Code editor command:')
-        self.text_editor_command_input = QLineEdit(self)
-        layout.addWidget(self.title_label, 0, 0)
-        layout.addWidget(self.text_editor_command_input, 0, 1)
-
-        self.ok_button = QPushButton('OK', self)
-        layout.addWidget(self.ok_button, 4, 0, 1, 2)
-
-        self.setLayout(layout)
-        self.ok_button.clicked.connect(self.accept)
-
-    def get_user_input(self) -> str:
-        return self.text_editor_command_input.text().strip()
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
 
 
 class TextEditorSelector(Creator, VariablesConsumer):
     TITLE: str = 'Text editor selector'
+    PARAMETERS: list[str] = ['text_editor_command']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
-        self.getting_result:int = QDialog.Rejected
+        self.getting_result: int | None = None
         self.text_editor_command:str = ''
-        self.dialog:TextEditorCommandDialog=TextEditorCommandDialog(parent_widget)
 
     def get_title(self) -> str:
         return TextEditorSelector.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.dialog
+    def create_use_dialog(self) -> 'QDialog':
+        from UI.TextEditorCommandDialog import TextEditorCommandDialog
+        return TextEditorCommandDialog(self.parent_widget)
 
     def set_data(self) -> None:
-        self.getting_result=self.dialog.exec()
-        self.text_editor_command=self.dialog.get_user_input()
+        self.getting_result=self.get_use_dialog().exec()
+        self.text_editor_command=self.get_use_dialog().get_user_input()
+
+    def validate_parameters(self) -> bool:
+        return isinstance(self.text_editor_command, str)
 
     def validate_data(self) -> bool:
-        return self.getting_result==QDialog.Accepted
+        return Creator.is_dialog_accepted(self.getting_result) and self.validate_parameters()
 
     def perform_operations(self) -> bool:
         self.variables[TEXT_EDITOR_VARIABLE]=self.text_editor_command
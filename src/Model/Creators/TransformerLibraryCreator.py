@@ -1,23 +1,26 @@
 import os.path
 import shutil
-
-from PySide6.QtWidgets import QWidget, QDialog
+from typing import TYPE_CHECKING
 
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from settings_namespace import BASE_FILES
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
+
 
 class TransformerLibraryCreator(Creator):
     TITLE: str = 'Creator of transform library'
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget):
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None):
         super().__init__(settings, creator_listener, parent_widget)
 
     def get_title(self) -> str:
         return TransformerLibraryCreator.TITLE
 
-    def get_use_dialog(self) -> QDialog:
+    def create_use_dialog(self) -> 'QDialog':
         raise NotImplementedError
 
     def set_data(self) -> None:
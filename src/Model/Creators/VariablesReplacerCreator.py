@@ -1,74 +1,75 @@
-import re
 import sys
+from typing import TYPE_CHECKING
 
-import sympy as sym
-
+from Model.SourceFiles.LatexTokenizer import LatexTokenizer, CommandToken
 from Model.SourceFiles.SourceFile import SourceFile
-from Model.Variables.variables_namespace import VAR_COMMAND_FORMAT
-
-from PySide6.QtWidgets import QWidget, QFileDialog, QDialog, QApplication
+from Model.SourceFiles.SourceFilesTransaction import SourceFilesTransaction
+from Model.Variables.variables_namespace import VAR_COMMAND_NAME
 
 from Model.Creators.Creator import Creator
 from Model.Creators.CreatorListener import CreatorListener
 from Model.Variables.VariablesConsumer import VariablesConsumer
 from settings_namespace import SOURCE_FILES, ENCODING
 
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget, QDialog
+
 
 class VariablesReplacerCreator(Creator, VariablesConsumer):
     TITLE: str = 'Variables replacer'
+    PARAMETERS: list[str] = ['files_to_replace']
 
-    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener, parent_widget: QWidget) -> None:
+    def __init__(self, settings: dict[str, str], creator_listener: CreatorListener | None,
+                 parent_widget: 'QWidget | None' = None) -> None:
         super().__init__(settings, creator_listener, parent_widget)
-        self.dialog_for_files_to_replace: QFileDialog = QFileDialog(self.parent_widget)
         self.files_to_replace: list[str] = []
 
     def get_title(self) -> str:
         return VariablesReplacerCreator.TITLE
 
-    def get_use_dialog(self) -> QDialog:
-        return self.dialog_for_files_to_replace
+    def create_use_dialog(self) -> 'QDialog':
+        from PySide6.QtWidgets import QFileDialog
+        return QFileDialog(self.parent_widget)
 
     def set_data(self) -> None:
+        from PySide6.QtWidgets import QFileDialog
         options = QFileDialog.Options()
-        self.files_to_replace, _ = self.dialog_for_files_to_replace.getOpenFileNames(
-            self.dialog_for_files_to_replace.parent(), 'Replace variables', self.settings[SOURCE_FILES],
+        self.files_to_replace, _ = self.get_use_dialog().getOpenFileNames(
+            self.get_use_dialog().parent(), 'Replace variables', self.settings[SOURCE_FILES],
             "TeX Files (*.tex)", options=options)
 
+    def validate_parameters(self) -> bool:
+        return isinstance(self.files_to_replace, list) and len(self.files_to_replace) > 0
+
     def validate_data(self) -> bool:
-        return len(self.files_to_replace) > 0
-
-    def _replacement(self, matched_text: re.Match) -> str:
-        if matched_text.group(1) is not None:
-            return str(self.variables[matched_text.group(1)])
-        else:
-            return f'{matched_text.group(2)}{str(self.variables[matched_text.group(3)])}'
-
-    def _replace_variables_in_text(self, text: str) -> str:
-        return re.sub(pattern=VAR_COMMAND_FORMAT, repl=self._replacement, string=text)
-
-    def _validate_variables_names(self, text: str) -> bool:
-        for matched_text in re.finditer(VAR_COMMAND_FORMAT, text):
-            if matched_text.group(1) is not None:
-                if matched_text.group(1) not in self.variables:
-                    return False
-            elif matched_text.group(3) not in self.variables:
-                return False
-        return True
+        return self.validate_parameters()
+
+    def _find_variables_commands(self, text: str) -> list[CommandToken]:
+        return LatexTokenizer.find_commands(text, VAR_COMMAND_NAME)
+
+    def _replace_variables_in_text(self, text: str, commands: list[CommandToken]) -> str:
+        return LatexTokenizer.splice(text, commands, lambda command: str(self.variables[command.argument]))
+
+    def _validate_variables_names(self, commands: list[CommandToken]) -> bool:
+        return all(command.argument in self.variables for command in commands)
 
     def perform_operations(self) -> bool:
-        # we replace all variables or none
+        # we replace all variables or none - files are changed only if all of them are valid
+        transaction: SourceFilesTransaction = SourceFilesTransaction()
         for filepath in self.files_to_replace:
             source_instance: SourceFile=SourceFile(filepath)
             success_info, text_to_replace = source_instance.read_content_of_file()
-            if not (success_info and self._validate_variables_names(text_to_replace)):
+            commands: list[CommandToken] = self._find_variables_commands(text_to_replace)
+            if not (success_info and self._validate_variables_names(commands)):
+                transaction.rollback()
                 return False
-            replaced_text: str = self._replace_variables_in_text(text_to_replace)
-            if not source_instance.save_content_to_file(replaced_text):
-                return False
-        return True
+            transaction.write(filepath, self._replace_variables_in_text(text_to_replace, commands))
+        return transaction.commit()
 
 
 if __name__ == '__main__':
+    import sympy as sym
+
     local_settings = {dir_type: f'..\\..\\..\\example\\{dir_type}' for dir_type in
                       ['baseFiles', 'sourceFiles', 'generatedFiles']}
 
@@ -80,6 +81,7 @@ if __name__ == '__main__':
             print(result)
 
 
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     intro_vars = VariablesReplacerCreator(local_settings, Listener(), None)
     intro_vars.set_variables(variables)
@@ -1,12 +1,14 @@
 import os
 import shutil
 
+from Model.FilesSynchronizer import FilesSynchronizer
 from settings_namespace import ENCODING
 
 
 class FilesDirectoriesManager:
     def __init__(self, settings: dict[str, str]):
         self.settings = settings
+        self.synchronizer: FilesSynchronizer = FilesSynchronizer()
 
     def create_non_existent_directories(self) -> bool:
         # we return result of creation of all of these directories
@@ -51,16 +53,33 @@ class FilesDirectoriesManager:
             return False
 
     def copy_all_files_to_directory(self, source_file_type: str, dest_file_type: str) -> bool:
-        try:
-            all_source_files: list[str] = self.read_files_from_directory(source_file_type)
-            for source_file in all_source_files:
-                source_path: str=os.path.join(self.settings[source_file_type],source_file)
-                dest_path = os.path.join(self.settings[dest_file_type], source_file)
-                shutil.copyfile(source_path, dest_path)
-            return True
-        except FileNotFoundError as e:
-            print(e)
-            return False
+        # only changed files are copied
+        all_source_files: list[str] = self.read_files_from_directory(source_file_type)
+        return self.sync_files_to_directory([os.path.join(self.settings[source_file_type], source_file)
+                                             for source_file in all_source_files], dest_file_type)
+
+    def sync_files_to_directory(self, file_paths: list[str], dest_file_type: str,
+                                relative_paths: list[str] | None = None,
+                                synchronizer: FilesSynchronizer | None = None) -> bool:
+        """
+        Delta copy of files into directory, unchanged files aren't copied again
+        :param relative_paths: paths of copies relative to directory (base names of files by default)
+        :param synchronizer: synchronizer with another methods of copying
+        :return: bool - are all files synchronized
+        """
+        synchronizer = synchronizer if synchronizer is not None else self.synchronizer
+        if relative_paths is None:
+            relative_paths = [os.path.basename(file_path) for file_path in file_paths]
+        result: bool = True
+        for file_path, relative_path in zip(file_paths, relative_paths):
+            dest_path: str = os.path.join(self.settings[dest_file_type], relative_path)
+            try:
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            except (FileExistsError, NotADirectoryError):
+                result = False
+                continue
+            result = synchronizer.sync_file(file_path, dest_path) and result
+        return result
 
     def remove_file(self, file_path: str) -> bool:
         if not os.path.exists(file_path) or os.path.isdir(file_path):
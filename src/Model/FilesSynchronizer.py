@@ -0,0 +1,98 @@
+import hashlib
+import os
+import shutil
+import sys
+
+
+class FilesSynchronizer:
+    """
+    Delta copy of files - file is copied only if destination differs from source (size, modification time
+    and optionally hash of content). Content is shared by hard link or reflink (copy on write clone),
+    if it is allowed and file system supports it, otherwise file is copied. Destination is replaced at once.
+    """
+    HARDLINK: str = 'hardlink'
+    REFLINK: str = 'reflink'
+    COPY: str = 'copy'
+    # hard linked file is the same file as source, so it is used only for files nobody writes into
+    DEFAULT_METHODS: list[str] = [REFLINK, COPY]
+    # ioctl of linux which clones file on copy on write file systems (btrfs, xfs...)
+    FICLONE: int = 0x40049409
+    TEMPORARY_SUFFIX: str = '.sync'
+    HASH_CHUNK_SIZE: int = 2 ** 20
+
+    def __init__(self, methods: list[str] | None = None, should_compare_hash: bool = False) -> None:
+        """
+        :param methods: ways of transferring content in order of preference, copy is always the last resort
+        :param should_compare_hash: files with the same size, but different modification time are compared
+        by hash of content, equal files aren't copied again
+        """
+        self.methods: list[str] = methods if methods is not None else list(FilesSynchronizer.DEFAULT_METHODS)
+        self.should_compare_hash: bool = should_compare_hash
+
+    @staticmethod
+    def hash_file(filepath: str) -> str:
+        file_hash = hashlib.sha256()
+        with open(filepath, 'rb') as file:
+            while chunk := file.read(FilesSynchronizer.HASH_CHUNK_SIZE):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def is_up_to_date(self, source_path: str, destination_path: str) -> bool:
+        try:
+            source_stat: os.stat_result = os.stat(source_path)
+            destination_stat: os.stat_result = os.stat(destination_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        if os.path.samestat(source_stat, destination_stat):
+            return True
+        if source_stat.st_size != destination_stat.st_size:
+            return False
+        if source_stat.st_mtime_ns == destination_stat.st_mtime_ns:
+            return True
+        if (self.should_compare_hash
+                and FilesSynchronizer.hash_file(source_path) == FilesSynchronizer.hash_file(destination_path)):
+            # modification time is aligned, so file isn't hashed on next synchronization
+            os.utime(destination_path, ns=(destination_stat.st_atime_ns, source_stat.st_mtime_ns))
+            return True
+        return False
+
+    @staticmethod
+    def _reflink(source_path: str, destination_path: str) -> None:
+        if not sys.platform.startswith('linux'):
+            raise OSError('Reflink is not supported')
+        import fcntl
+        with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+            fcntl.ioctl(destination.fileno(), FilesSynchronizer.FICLONE, source.fileno())
+        shutil.copystat(source_path, destination_path)
+
+    def _transfer(self, method: str, source_path: str, destination_path: str) -> None:
+        if method == FilesSynchronizer.HARDLINK:
+            os.link(source_path, destination_path)
+        elif method == FilesSynchronizer.REFLINK:
+            FilesSynchronizer._reflink(source_path, destination_path)
+        else:
+            # modification time is copied too, so next synchronization recognizes unchanged file
+            shutil.copy2(source_path, destination_path)
+
+    def sync_file(self, source_path: str, destination_path: str) -> bool:
+        """
+        :return: bool - is destination file the same as source file
+        """
+        if self.is_up_to_date(source_path, destination_path):
+            return True
+        temporary_path: str = f'{destination_path}{FilesSynchronizer.TEMPORARY_SUFFIX}'
+        for method in dict.fromkeys(self.methods + [FilesSynchronizer.COPY]):
+            try:
+                if os.path.lexists(temporary_path):
+                    os.remove(temporary_path)
+                self._transfer(method, source_path, temporary_path)
+                os.replace(temporary_path, destination_path)
+                return True
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                break
+            except OSError:
+                # method isn't supported (another file system, another platform...), next one is tried
+                continue
+        if os.path.lexists(temporary_path):
+            os.remove(temporary_path)
+        return False
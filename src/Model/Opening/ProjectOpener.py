@@ -1,8 +1,8 @@
 import os
-from typing import Any
 
 from Model.Opening.SettingsOperator import SettingsOperator
 from Model.Variables.VariablesFileOperator import VariablesFileOperator
+from Model.Variables.VariablesStore import VariablesStore
 
 
 class ProjectOpener:
@@ -22,6 +22,6 @@ class ProjectOpener:
     def get_settings(self) -> dict[str, str]:
         return self.read_settings
 
-    def get_variables(self)->dict[str, Any]:
+    def get_variables(self)->VariablesStore:
         var_Operator: VariablesFileOperator=VariablesFileOperator(self.open_directory)
         return var_Operator.read_variables()
@@ -0,0 +1,91 @@
+import json
+import os
+
+from Model.Pipeline.RecipeStep import RecipeStep
+from settings_namespace import ENCODING
+
+
+class Recipe:
+    """
+    Recipe of report - steps (see RecipeStep) stored in JSON file as {"steps": [...]}.
+    Step depends on steps, which write its inputs, and on steps listed in its "after",
+    so recipe is dependency graph, which has to be acyclic.
+    """
+    STEPS_KEY: str = 'steps'
+
+    def __init__(self, steps: list[RecipeStep], recipe_path: str = '') -> None:
+        self.steps: list[RecipeStep] = steps
+        self.recipe_path: str = recipe_path
+        # name of step -> names of steps it depends on
+        self.dependencies: dict[str, set[str]] = {}
+
+    @staticmethod
+    def load(recipe_path: str) -> 'Recipe | None':
+        """
+        :return: recipe or None, if file can't be read or its dependency graph isn't valid
+        """
+        try:
+            with open(recipe_path, encoding=ENCODING) as recipe_file:
+                description: dict = json.load(recipe_file)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(description, dict) or not isinstance(description.get(Recipe.STEPS_KEY), list):
+            return None
+        steps: list[RecipeStep | None] = [RecipeStep.from_dict(step) for step in description[Recipe.STEPS_KEY]]
+        if None in steps:
+            return None
+        recipe: Recipe = Recipe(steps, os.path.abspath(recipe_path))
+        return recipe if recipe.resolve_dependencies() else None
+
+    def get_step(self, name: str) -> RecipeStep | None:
+        return next((step for step in self.steps if step.name == name), None)
+
+    def resolve_dependencies(self) -> bool:
+        """
+        Derive dependencies of steps from their inputs and outputs
+        :return: bool - are dependencies valid (unique names and producers of outputs, no cycle)
+        """
+        names: list[str] = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            return False
+        producers: dict[tuple[str, str], str] = {}
+        for step in self.steps:
+            outputs: list[tuple[str, str]] = ([('variable', name) for name in step.output_variables]
+                                              + [('file', os.path.normpath(path)) for path in step.output_files])
+            for output in outputs:
+                if output in producers:
+                    return False
+                producers[output] = step.name
+
+        self.dependencies = {}
+        for step in self.steps:
+            if step.is_final:
+                self.dependencies[step.name] = {other.name for other in self.steps if not other.is_final}
+                continue
+            inputs: list[tuple[str, str]] = ([('variable', name) for name in step.input_variables]
+                                             + [('file', os.path.normpath(path)) for path in step.input_files])
+            dependencies: set[str] = {producers[source] for source in inputs if source in producers}
+            if any(name not in names for name in step.after):
+                return False
+            self.dependencies[step.name] = (dependencies | set(step.after)) - {step.name}
+        return self.get_order() is not None
+
+    def get_order(self) -> list[RecipeStep] | None:
+        """
+        :return: steps in order, in which each step follows its dependencies or None, if dependencies have cycle
+        """
+        remaining: dict[str, set[str]] = {name: set(dependencies) for name, dependencies in self.dependencies.items()}
+        order: list[RecipeStep] = []
+        while remaining:
+            ready: list[str] = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                return None
+            for name in ready:
+                order.append(self.get_step(name))
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        return order
+
+    def get_dependents(self, name: str) -> list[str]:
+        return [step_name for step_name, dependencies in self.dependencies.items() if name in dependencies]
@@ -0,0 +1,252 @@
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, Iterator
+
+from Model.Building.BuildCache import BuildCache
+from Model.Building.BuildResult import BuildResult
+from Model.Building.BuildScheduler import BuildScheduler
+from Model.Creators.Creator import Creator
+from Model.Creators.CreatorResultCache import CreatorResultCache
+from Model.Creators.CreatorsRegistry import CreatorsRegistry, CreatorEntry
+from Model.Creators.OperateVariablesCreator import OperateVariablesCreator
+from Model.Pipeline.Recipe import Recipe
+from Model.Pipeline.RecipeListener import RecipeListener
+from Model.Pipeline.RecipeStep import RecipeStep
+from Model.SourceFiles.SourceFilesLinker import SourceFilesLinker
+from Model.Variables.VariablesConsumer import VariablesConsumer
+from settings_namespace import ENCODING, GENERATED_FILES
+
+
+class RecipeExecutor:
+    """
+    Executor of recipe - steps run in pool of workers as soon as steps they depend on are finished,
+    so independent steps run concurrently. Thread safe creators and scripts, which opted in, share workers,
+    other steps (linking, build, other creators and scripts) run exclusively - while no other step runs.
+    Fingerprint of step (its definition and content of its input variables and files) is stored after
+    successful run in state file next to recipe, step with the same fingerprint and existing outputs is skipped.
+    Dependents of failed step aren't run.
+    """
+    VERSION: int = 1
+    RAN_STATUS: str = 'ran'
+    SKIPPED_STATUS: str = 'skipped'
+    FAILED_STATUS: str = 'failed'
+    BLOCKED_STATUS: str = 'blocked'
+    STATE_EXTENSION: str = '.state.json'
+    MISSING_INPUT: str = 'missing'
+    UNKNOWN_CREATOR_MESSAGE: str = 'creator is unknown'
+    MAX_WORKERS: int = os.cpu_count() or 1
+
+    def __init__(self, recipe: Recipe, settings: dict[str, str], variables: dict[str, Any], project_directory: str,
+                 listener: RecipeListener | None = None, max_workers: int = MAX_WORKERS,
+                 should_force: bool = False) -> None:
+        self.recipe: Recipe = recipe
+        self.settings: dict[str, str] = settings
+        self.variables: dict[str, Any] = variables
+        self.project_directory: str = os.path.abspath(project_directory)
+        self.listener: RecipeListener | None = listener
+        self.max_workers: int = max(max_workers, 1)
+        # all steps are run, even if their inputs haven't changed
+        self.should_force: bool = should_force
+        self.creators_registry: CreatorsRegistry = CreatorsRegistry()
+        # name of step -> status of its execution
+        self.statuses: dict[str, str] = {}
+        # shared steps run together, exclusive step runs alone, waiting exclusive step isn't overtaken
+        self._steps_condition: threading.Condition = threading.Condition()
+        self._running_shared_steps: int = 0
+        self._waiting_exclusive_steps: int = 0
+        self._is_exclusive_step_running: bool = False
+
+    def get_state_path(self) -> str:
+        return f'{os.path.splitext(self.recipe.recipe_path)[0]}{RecipeExecutor.STATE_EXTENSION}'
+
+    def read_state(self) -> dict[str, str]:
+        """
+        :return: name of step -> fingerprint of its last successful run
+        """
+        try:
+            with open(self.get_state_path(), encoding=ENCODING) as state_file:
+                state: dict = json.load(state_file)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return state.get('steps', {}) if state.get('version') == RecipeExecutor.VERSION else {}
+
+    def write_state(self, fingerprints: dict[str, str]) -> bool:
+        try:
+            with open(self.get_state_path(), 'w', encoding=ENCODING) as state_file:
+                json.dump({'version': RecipeExecutor.VERSION, 'steps': fingerprints}, state_file, indent=4)
+            return True
+        except OSError:
+            return False
+
+    def hash_variable(self, name: str) -> str | None:
+        """
+        :return: hash of pickled value of variable or None, if variable can't be pickled
+        """
+        if name not in self.variables:
+            return RecipeExecutor.MISSING_INPUT
+        return CreatorResultCache.hash_value(self.variables[name])
+
+    def compute_fingerprint(self, step: RecipeStep) -> str | None:
+        """
+        :return: fingerprint of step or None, if step has to be run (inputs can't be hashed, linking and build)
+        """
+        if step.kind in [RecipeStep.LINK_KIND, RecipeStep.BUILD_KIND]:
+            # build has its own cache (see BuildCache)
+            return None
+        fingerprint = hashlib.sha256(f'{RecipeExecutor.VERSION}\0{step.get_definition()}'.encode(ENCODING))
+        for name in step.input_variables:
+            variable_hash: str | None = self.hash_variable(name)
+            if variable_hash is None:
+                return None
+            fingerprint.update(f'\0{name}\0{variable_hash}'.encode(ENCODING))
+        for filepath in step.get_input_files(self.project_directory):
+            file_hash: str | None = BuildCache.hash_file(filepath)
+            fingerprint.update(f'\0{filepath}\0{file_hash or RecipeExecutor.MISSING_INPUT}'.encode(ENCODING))
+        return fingerprint.hexdigest()
+
+    def are_outputs_present(self, step: RecipeStep) -> bool:
+        return (all(name in self.variables for name in step.output_variables)
+                and all(os.path.isfile(filepath) for filepath in step.get_output_files(self.project_directory)))
+
+    def find_creator_class(self, step: RecipeStep) -> type[Creator] | None:
+        if step.kind == RecipeStep.SCRIPT_KIND:
+            return OperateVariablesCreator
+        if step.kind != RecipeStep.CREATOR_KIND or not isinstance(step.target, str):
+            return None
+        entry: CreatorEntry | None = self.creators_registry.find(step.target)
+        return entry.load_creator_class() if entry is not None else None
+
+    def _run_creator(self, creator_class: type[Creator], parameters: dict[str, Any]) -> tuple[bool, str]:
+        creator: Creator = creator_class(self.settings, None)
+        if isinstance(creator, VariablesConsumer):
+            creator.set_variables(self.variables)
+        was_success: bool = creator.perform_with_parameters(parameters)
+        return was_success, '' if was_success else creator.failure_message
+
+    def _link_and_build(self, step: RecipeStep) -> bool:
+        linker: SourceFilesLinker = SourceFilesLinker(self.settings)
+        if step.kind == RecipeStep.LINK_KIND:
+            return (linker.soft_link() if step.target == RecipeStep.SOFT_LINK else linker.hard_link())[1]
+        if isinstance(step.target, list):
+            if not linker.hard_link_partial([os.path.join(self.project_directory, filepath)
+                                             for filepath in step.target])[1]:
+                return False
+            document_path: str = linker.get_output_path_of_partial_link()
+        else:
+            if not linker.hard_link()[1]:
+                return False
+            document_path = linker.get_output_path_of_hard_link()
+        result: BuildResult = BuildScheduler(self.listener).build(document_path, self.settings[GENERATED_FILES])
+        if self.listener is not None:
+            self.listener.notify_about_build_result(result)
+        return result.was_success
+
+    @contextlib.contextmanager
+    def _run_exclusively(self) -> Iterator[None]:
+        with self._steps_condition:
+            self._waiting_exclusive_steps += 1
+            self._steps_condition.wait_for(lambda: not self._is_exclusive_step_running
+                                           and self._running_shared_steps == 0)
+            self._waiting_exclusive_steps -= 1
+            self._is_exclusive_step_running = True
+        try:
+            yield
+        finally:
+            with self._steps_condition:
+                self._is_exclusive_step_running = False
+                self._steps_condition.notify_all()
+
+    @contextlib.contextmanager
+    def _run_shared(self) -> Iterator[None]:
+        with self._steps_condition:
+            self._steps_condition.wait_for(lambda: not self._is_exclusive_step_running
+                                           and self._waiting_exclusive_steps == 0)
+            self._running_shared_steps += 1
+        try:
+            yield
+        finally:
+            with self._steps_condition:
+                self._running_shared_steps -= 1
+                self._steps_condition.notify_all()
+
+    def run_step(self, step: RecipeStep) -> tuple[bool, str]:
+        """
+        Run step regardless of its fingerprint
+        :return: bool - was step successful and reason of its failure (empty, if it isn't known)
+        """
+        if step.kind in [RecipeStep.LINK_KIND, RecipeStep.BUILD_KIND]:
+            with self._run_exclusively():
+                # failure of build is explained by its result sent to listener
+                return self._link_and_build(step), ''
+        creator_class: type[Creator] | None = self.find_creator_class(step)
+        if creator_class is None:
+            return False, RecipeExecutor.UNKNOWN_CREATOR_MESSAGE
+        parameters: dict[str, Any] = (step.parameters if step.kind == RecipeStep.CREATOR_KIND else
+                                      {'script_path': step.get_input_files(self.project_directory)[-1]})
+        with (self._run_shared() if creator_class.IS_THREAD_SAFE or step.can_run_concurrently
+              else self._run_exclusively()):
+            return self._run_creator(creator_class, parameters)
+
+    def _execute_step(self, step: RecipeStep, state: dict[str, str]) -> tuple[str, str]:
+        """
+        :return: status of step and message explaining failure (empty, if there is nothing to explain)
+        """
+        fingerprint: str | None = self.compute_fingerprint(step)
+        if (not self.should_force and fingerprint is not None and state.get(step.name) == fingerprint
+                and self.are_outputs_present(step)):
+            return RecipeExecutor.SKIPPED_STATUS, ''
+        try:
+            was_success, message = self.run_step(step)
+        except Exception as exception:
+            was_success = False
+            message = f'{type(exception).__name__}: {exception}'
+        state.pop(step.name, None)
+        if not was_success:
+            return RecipeExecutor.FAILED_STATUS, message
+        if fingerprint is not None:
+            state[step.name] = fingerprint
+        return RecipeExecutor.RAN_STATUS, ''
+
+    def _set_status(self, step_name: str, status: str, message: str = '') -> None:
+        self.statuses[step_name] = status
+        if self.listener is not None:
+            self.listener.notify_about_step_result(step_name, status, message)
+
+    def _block_dependents(self, step_name: str, remaining: dict[str, set[str]]) -> None:
+        for dependent in self.recipe.get_dependents(step_name):
+            if dependent in remaining:
+                del remaining[dependent]
+                self._set_status(dependent, RecipeExecutor.BLOCKED_STATUS)
+                self._block_dependents(dependent, remaining)
+
+    def execute(self) -> bool:
+        """
+        Run steps of recipe, which have changed inputs
+        :return: bool - were all steps successful (run or skipped)
+        """
+        self.statuses = {}
+        state: dict[str, str] = self.read_state()
+        remaining: dict[str, set[str]] = {name: set(dependencies)
+                                          for name, dependencies in self.recipe.dependencies.items()}
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            while remaining or running:
+                for name in [name for name, dependencies in remaining.items() if not dependencies]:
+                    del remaining[name]
+                    running[executor.submit(self._execute_step, self.recipe.get_step(name), state)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name: str = running.pop(future)
+                    status, message = future.result()
+                    self._set_status(name, status, message)
+                    if status == RecipeExecutor.FAILED_STATUS:
+                        self._block_dependents(name, remaining)
+                    for dependencies in remaining.values():
+                        dependencies.discard(name)
+        self.write_state(state)
+        return all(status in [RecipeExecutor.RAN_STATUS, RecipeExecutor.SKIPPED_STATUS]
+                   for status in self.statuses.values())
@@ -0,0 +1,16 @@
+import abc
+
+from Model.Building.BuildListener import BuildListener
+
+
+class RecipeListener(BuildListener):
+    """
+    Listener of recipe executor - it is notified from worker threads, not from thread which started recipe
+    """
+
+    @abc.abstractmethod
+    def notify_about_step_result(self, step_name: str, status: str, message: str = '') -> None:
+        """
+        :param message: reason of failure of step (text of exception raised by it), empty if it isn't known
+        """
+        pass
@@ -0,0 +1,97 @@
+import json
+import os
+from typing import Any
+
+
+class RecipeStep:
+    """
+    One step of recipe - use of creator, variables script, linking or build of pdf.
+    Step declares variables and files it reads (inputs) and writes (outputs), recipe derives
+    order of steps from them. Paths of files and scripts are relative to directory of project.
+    """
+    CREATOR_KIND: str = 'creator'
+    SCRIPT_KIND: str = 'script'
+    LINK_KIND: str = 'link'
+    BUILD_KIND: str = 'build'
+    KINDS: list[str] = [CREATOR_KIND, SCRIPT_KIND, LINK_KIND, BUILD_KIND]
+    SOFT_LINK: str = 'soft'
+
+    def __init__(self, name: str, kind: str, target: Any = None, parameters: dict[str, Any] | None = None,
+                 input_variables: list[str] | None = None, input_files: list[str] | None = None,
+                 output_variables: list[str] | None = None, output_files: list[str] | None = None,
+                 after: list[str] | None = None, is_concurrent: bool = False) -> None:
+        self.name: str = name
+        self.kind: str = kind
+        # creator title or class, path of script, link type or source files of partial build
+        self.target: Any = target
+        self.parameters: dict[str, Any] = parameters if parameters is not None else {}
+        self.input_variables: list[str] = input_variables if input_variables is not None else []
+        self.input_files: list[str] = input_files if input_files is not None else []
+        self.output_variables: list[str] = output_variables if output_variables is not None else []
+        self.output_files: list[str] = output_files if output_files is not None else []
+        # names of steps, which have to be finished before step, beside steps derived from inputs
+        self.after: list[str] = after if after is not None else []
+        # script, which opted in, runs concurrently with other steps (see can_run_concurrently)
+        self.is_concurrent: bool = is_concurrent
+
+    @staticmethod
+    def from_dict(description: dict[str, Any]) -> 'RecipeStep | None':
+        """
+        :param description: e.g. {"name": "fit", "creator": "RegressionConductor", "parameters": {...},
+        "inputs": {"variables": [...], "files": [...]}, "outputs": {...}, "after": [...], "concurrent": false}
+        :return: step or None, if description isn't valid
+        """
+        if not isinstance(description, dict) or not isinstance(description.get('name'), str):
+            return None
+        kinds: list[str] = [kind for kind in RecipeStep.KINDS if kind in description]
+        if len(kinds) != 1:
+            return None
+        inputs: dict[str, list[str]] = description.get('inputs', {})
+        outputs: dict[str, list[str]] = description.get('outputs', {})
+        parameters: dict[str, Any] = description.get('parameters', {})
+        is_concurrent: bool = description.get('concurrent', False)
+        if not (isinstance(inputs, dict) and isinstance(outputs, dict) and isinstance(parameters, dict)
+                and isinstance(is_concurrent, bool)):
+            return None
+        step: RecipeStep = RecipeStep(description['name'], kinds[0], description[kinds[0]], parameters,
+                                      inputs.get('variables'), inputs.get('files'),
+                                      outputs.get('variables'), outputs.get('files'), description.get('after'),
+                                      is_concurrent)
+        lists: list[list[str]] = [step.input_variables, step.input_files, step.output_variables, step.output_files,
+                                  step.after]
+        if not all(isinstance(names, list) and all(isinstance(name, str) for name in names) for names in lists):
+            return None
+        return step
+
+    @property
+    def is_final(self) -> bool:
+        """
+        Linking and build without declared inputs read the whole project, so they wait for all other steps
+        """
+        return (self.kind in [RecipeStep.LINK_KIND, RecipeStep.BUILD_KIND]
+                and not self.input_variables and not self.input_files and not self.after)
+
+    @property
+    def can_run_concurrently(self) -> bool:
+        """
+        Scripts can do anything with project, so script runs concurrently only if step opted in
+        and it doesn't write files
+        """
+        return self.kind == RecipeStep.SCRIPT_KIND and self.is_concurrent and not self.output_files
+
+    def get_input_files(self, project_directory: str) -> list[str]:
+        """
+        :return: paths of files read by step, script of step included
+        """
+        input_files: list[str] = self.input_files + ([self.target] if self.kind == RecipeStep.SCRIPT_KIND else [])
+        return [os.path.join(project_directory, filepath) for filepath in input_files]
+
+    def get_output_files(self, project_directory: str) -> list[str]:
+        return [os.path.join(project_directory, filepath) for filepath in self.output_files]
+
+    def get_definition(self) -> str:
+        return json.dumps([self.kind, self.target, self.parameters, self.input_variables, self.input_files,
+                           self.output_variables, self.output_files], sort_keys=True, default=str)
+
+    def __repr__(self):
+        return self.name
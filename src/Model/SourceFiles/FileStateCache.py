@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class FileStateCache:
+    """
+    Process-wide LRU cache of values derived from files (parsed marks, content...). Value of file is valid
+    as long as modification time, size and inode of file are the same, so changed or replaced file
+    is never served from cache.
+    Cache is bounded by capacity - sum of costs of cached values (number of entries, bytes...).
+    """
+    # file modified so recently could be modified again within the same timestamp tick, it isn't cached
+    RACY_INTERVAL_NS: int = 2 * 10 ** 9
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity: int = capacity
+        self.total_cost: int = 0
+        # normalized filepath -> (state of file, value, cost of value)
+        self._entries: OrderedDict[str, tuple[tuple[int, int, int], Any, int]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(filepath: str) -> str:
+        return os.path.normcase(os.path.abspath(filepath))
+
+    @staticmethod
+    def get_file_state(filepath: str) -> tuple[int, int, int] | None:
+        """
+        :return: modification time, size and inode of file or None, if file doesn't exist
+        """
+        try:
+            stat_result: os.stat_result = os.stat(filepath)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+    @staticmethod
+    def is_racy(state: tuple[int, int, int]) -> bool:
+        return time.time_ns() - state[0] < FileStateCache.RACY_INTERVAL_NS
+
+    def get(self, filepath: str, state: tuple[int, int, int] | None) -> Any | None:
+        """
+        :param state: current state of file (see get_file_state)
+        :return: cached value of file or None, if file has changed since value was cached (or wasn't cached)
+        """
+        if state is None:
+            return None
+        key: str = FileStateCache._get_key(filepath)
+        with self._lock:
+            entry: tuple[tuple[int, int, int], Any, int] | None = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != state:
+                self._remove_entry(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, filepath: str, state: tuple[int, int, int] | None, value: Any, cost: int = 1,
+            is_recent_trusted: bool = False) -> bool:
+        """
+        :param state: state of file taken before value was derived from file (see get_file_state)
+        :param is_recent_trusted: trust state of file modified just now (file written by application itself)
+        :return: bool - was value cached (it isn't, if state of file isn't trusted or value exceeds capacity)
+        """
+        if state is None or (not is_recent_trusted and FileStateCache.is_racy(state)) or cost > self.capacity:
+            self.invalidate(filepath)
+            return False
+        key: str = FileStateCache._get_key(filepath)
+        with self._lock:
+            self._remove_entry(key)
+            self._entries[key] = (state, value, cost)
+            self.total_cost += cost
+            self._evict_over_capacity()
+        return True
+
+    def set_capacity(self, capacity: int) -> None:
+        with self._lock:
+            self.capacity = capacity
+            self._evict_over_capacity()
+
+    def invalidate(self, filepath: str) -> None:
+        with self._lock:
+            self._remove_entry(FileStateCache._get_key(filepath))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_cost = 0
+
+    def _remove_entry(self, key: str) -> None:
+        entry: tuple[tuple[int, int, int], Any, int] | None = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_cost -= entry[2]
+
+    def _evict_over_capacity(self) -> None:
+        # least recently used entries are first
+        while self.total_cost > self.capacity:
+            self._remove_entry(next(iter(self._entries)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
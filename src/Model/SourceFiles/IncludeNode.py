@@ -0,0 +1,121 @@
+from typing import Iterator
+
+from Model.SourceFiles.FileStateCache import FileStateCache
+from Model.SourceFiles.SourceFile import SourceFile
+from settings_namespace import ENCODING
+
+
+class IncludeNode:
+    """
+    Node of include tree built by linker - it holds only offsets of input commands of source file
+    and subtrees of files linked to its marks. Content is streamed from file, when tree is walked,
+    so memory used by linking doesn't grow with size of linked document.
+    """
+    CHUNK_SIZE: int = 2 ** 16
+
+    def __init__(self, source_file: SourceFile, spans: list[tuple[str, int, int]] | None = None) -> None:
+        """
+        :param spans: mark, start and end of every input command in source file (offsets in characters),
+        if None file is read once to find them
+        """
+        self.source_file: SourceFile = source_file
+        self.spans: list[tuple[str, int, int]] = (spans if spans is not None
+                                                  else IncludeNode.find_spans(source_file.read_content_of_file()[1]))
+        self.marks: list[str] = list(dict.fromkeys(mark for mark, _, _ in self.spans))
+        # mark -> node linked in place of this mark
+        self.children: dict[str, IncludeNode] = {}
+        # identity of whole subtree, it is set by LinkCache
+        self.key: str = ''
+
+    @staticmethod
+    def find_spans(content: str) -> list[tuple[str, int, int]]:
+        return [(token.argument, token.start, token.end) for token in SourceFile.find_input_commands(content)]
+
+    def get_all_marks(self) -> list[str]:
+        return list(self.marks)
+
+    def attach(self, mark: str, child: 'IncludeNode') -> bool:
+        self.children[mark] = child
+        return True
+
+    @staticmethod
+    def _read_until(file, position: int, end: int | None, read_chunks: list[str] | None) -> Iterator[str]:
+        """
+        Yield text of file from position (current position of file) to end (or to end of file) chunk by chunk
+        :param read_chunks: list collecting every read chunk or None, if read text isn't kept
+        """
+        while end is None or position < end:
+            size: int = IncludeNode.CHUNK_SIZE if end is None else min(IncludeNode.CHUNK_SIZE, end - position)
+            chunk: str = file.read(size)
+            if not chunk:
+                return
+            position += len(chunk)
+            if read_chunks is not None:
+                read_chunks.append(chunk)
+            yield chunk
+
+    @staticmethod
+    def _slice_until(text: str, position: int, end: int | None) -> Iterator[str]:
+        """
+        Yield text from position to end (or to end of text) chunk by chunk, as _read_until does for file
+        """
+        end = len(text) if end is None else min(end, len(text))
+        for start in range(position, end, IncludeNode.CHUNK_SIZE):
+            yield text[start:min(start + IncludeNode.CHUNK_SIZE, end)]
+
+    def iter_parts(self) -> Iterator['str | IncludeNode']:
+        """
+        Yield fragments of this file between marks (chunk by chunk) and linked nodes in place of marks.
+        Marks without linked file are left untouched.
+        """
+        state: tuple[int, int, int] | None = FileStateCache.get_file_state(self.source_file.filepath)
+        content: str | None = SourceFile.content_cache.get(self.source_file.filepath, state)
+        if content is not None:
+            position: int = 0
+            for mark, start, end in self.spans:
+                if mark not in self.children:
+                    continue
+                yield from IncludeNode._slice_until(content, position, start)
+                yield self.children[mark]
+                position = end
+            yield from IncludeNode._slice_until(content, position, None)
+            return
+        yield from self._iter_parts_of_file(state)
+
+    def _iter_parts_of_file(self, state: tuple[int, int, int] | None) -> Iterator['str | IncludeNode']:
+        """
+        Stream parts from file and put its content to content cache, as SourceFile.read_content_of_file does,
+        text is kept only if the cache can take it
+        """
+        read_chunks: list[str] | None = ([] if state is not None and state[1] <= SourceFile.content_cache.capacity
+                                         else None)
+        # file is opened as by SourceFile.read_content_of_file, so offsets of spans are valid
+        with open(self.source_file.filepath, 'r', encoding=ENCODING) as file:
+            position: int = 0
+            for mark, start, end in self.spans:
+                if mark not in self.children:
+                    continue
+                yield from IncludeNode._read_until(file, position, start, read_chunks)
+                # input command is skipped
+                command: str = file.read(end - start)
+                if read_chunks is not None:
+                    read_chunks.append(command)
+                yield self.children[mark]
+                position = end
+            yield from IncludeNode._read_until(file, position, None, read_chunks)
+        if read_chunks is not None:
+            SourceFile.content_cache.put(self.source_file.filepath, state, ''.join(read_chunks), state[1])
+
+    def iter_chunks(self) -> Iterator[str]:
+        """
+        Walk subtree and yield linked content piece by piece,
+        whole linked document is never built as one string
+        """
+        for part in self.iter_parts():
+            if isinstance(part, IncludeNode):
+                yield from part.iter_chunks()
+            else:
+                yield part
+
+    def __repr__(self):
+        return f'{self.source_file}{list(self.children.values())}'
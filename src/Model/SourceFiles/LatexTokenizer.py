@@ -0,0 +1,108 @@
+import re
+from typing import Callable
+
+
+class CommandToken:
+    """
+    Command with one argument found in LaTeX text, e.g. \\input{mark}, \\includegraphics[width=5cm]{plot}.
+    start and end are offsets of whole command in text, so it can be spliced without searching again.
+    """
+
+    def __init__(self, name: str, argument: str, start: int, end: int, options: str | None = None) -> None:
+        self.name: str = name
+        self.argument: str = argument
+        self.start: int = start
+        self.end: int = end
+        self.options: str | None = options
+
+    def __repr__(self):
+        return f'\\{self.name}{{{self.argument}}}@{self.start}:{self.end}'
+
+
+class LatexTokenizer:
+    """
+    Single pass tokenizer of LaTeX text. It finds commands with argument (\\input{mark}, \\var{name}...),
+    but skips them inside % comments, verbatim-like environments and \\verb, escaped backslash (\\\\)
+    isn't treated as beginning of command.
+    """
+    VERBATIM_ENVIRONMENTS: list[str] = ['verbatim', 'verbatim*', 'Verbatim', 'lstlisting', 'minted', 'comment']
+    ENVIRONMENT_END_FORMAT: str = '\\end{{{environment}}}'
+
+    COMMENT_GROUP: str = 'comment'
+    ENVIRONMENT_GROUP: str = 'environment'
+    VERB_DELIMITER_GROUP: str = 'delimiter'
+    NAME_GROUP: str = 'name'
+    OPTIONS_GROUP: str = 'options'
+    ARGUMENT_GROUP: str = 'argument'
+    WORD_PATTERN: re.Pattern = re.compile(r'\w+')
+    PATH_PATTERN: re.Pattern = re.compile(r'[^\s#$&~^]+')
+
+    TOKEN_PATTERN: re.Pattern = re.compile(
+        r'(?P<comment>%)'
+        r'|\\begin\{(?P<environment>' + '|'.join(re.escape(environment) for environment in VERBATIM_ENVIRONMENTS) + r')\}'
+        r'|\\verb\*?(?P<delimiter>[^a-zA-Z\s*])'
+        r'|\\(?P<name>[a-zA-Z]+|.)(?:\[(?P<options>[^\]%]*)\])?(?:\{(?P<argument>[^{}%\\]*)\})?',
+        re.DOTALL)
+
+    @staticmethod
+    def find_commands(text: str, command_name: str, argument_pattern: re.Pattern = WORD_PATTERN,
+                      has_options: bool = False) -> list[CommandToken]:
+        """
+        :param argument_pattern: pattern, which whole argument of command has to match
+        :param has_options: are optional arguments ([...]) allowed before argument
+        :return: list[CommandToken] - commands of given name in order of occurrence
+        """
+        tokens: list[CommandToken] = []
+        position: int = 0
+        while (matched_text := LatexTokenizer.TOKEN_PATTERN.search(text, position)) is not None:
+            position = LatexTokenizer._skip_ignored(text, matched_text)
+            argument: str | None = matched_text.group(LatexTokenizer.ARGUMENT_GROUP)
+            options: str | None = matched_text.group(LatexTokenizer.OPTIONS_GROUP)
+            if (matched_text.group(LatexTokenizer.NAME_GROUP) == command_name
+                    and argument is not None and argument_pattern.fullmatch(argument) is not None
+                    and (has_options or options is None)):
+                tokens.append(CommandToken(command_name, argument, matched_text.start(), matched_text.end(), options))
+        return tokens
+
+    @staticmethod
+    def _skip_ignored(text: str, matched_text: re.Match) -> int:
+        """
+        :return: position, where tokenizing continues after matched token
+        """
+        if matched_text.group(LatexTokenizer.COMMENT_GROUP) is not None:
+            line_end: int = text.find('\n', matched_text.end())
+            return len(text) if line_end == -1 else line_end + 1
+        if matched_text.group(LatexTokenizer.ENVIRONMENT_GROUP) is not None:
+            environment_end: str = LatexTokenizer.ENVIRONMENT_END_FORMAT.format(
+                environment=matched_text.group(LatexTokenizer.ENVIRONMENT_GROUP))
+            end_position: int = text.find(environment_end, matched_text.end())
+            return len(text) if end_position == -1 else end_position + len(environment_end)
+        if matched_text.group(LatexTokenizer.VERB_DELIMITER_GROUP) is not None:
+            end_position: int = text.find(matched_text.group(LatexTokenizer.VERB_DELIMITER_GROUP), matched_text.end())
+            return len(text) if end_position == -1 else end_position + 1
+        return matched_text.end()
+
+    @staticmethod
+    def get_arguments(text: str, command_name: str) -> list[str]:
+        """
+        :return: list[str] - unique arguments of commands in order of first occurrence
+        """
+        return list(dict.fromkeys(token.argument for token in LatexTokenizer.find_commands(text, command_name)))
+
+    @staticmethod
+    def splice(text: str, tokens: list[CommandToken], replacer: Callable[[CommandToken], str | None]) -> str:
+        """
+        Replace tokens by their offsets, text between tokens is copied without searching it again
+        :param tokens: tokens of text ordered by offsets
+        :param replacer: returns text in place of token or None, if token stays untouched
+        """
+        parts: list[str] = []
+        position: int = 0
+        for token in tokens:
+            replacement: str | None = replacer(token)
+            if replacement is not None:
+                parts.append(text[position:token.start])
+                parts.append(replacement)
+                position = token.end
+        parts.append(text[position:])
+        return ''.join(parts)
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, TextIO
+
+from Model.SourceFiles.IncludeNode import IncludeNode
+from Model.SourceFiles.SourceFile import SourceFile
+from settings_namespace import ENCODING
+
+
+class LinkCache:
+    """
+    Persisted cache of hard linking, kept in generated files directory. It stores content hash and offsets
+    of marks of every source file (valid as long as modification time and size of file are the same) and spliced
+    output of every linked subtree, keyed by hash of its files. Unchanged files are not read and unchanged
+    subtrees are copied from cache, so rebuild costs mostly edited files.
+    """
+    # version of marks parsing and splicing, cache made by another version isn't used
+    VERSION: int = 2
+    DIRECTORY_NAME: str = '.link_cache'
+    INDEX_NAME: str = 'link_cache.json'
+    SUBTREE_EXTENSION: str = SourceFile.EXTENSION
+    TEMPORARY_SUFFIX: str = '.tmp'
+    CHUNK_SIZE: int = 2 ** 16
+    # file modified so recently could be modified again within the same timestamp tick, it isn't trusted
+    RACY_INTERVAL_NS: int = 2 * 10 ** 9
+
+    VERSION_FIELD: str = 'version'
+    FILES_FIELD: str = 'files'
+    MAIN_FIELD: str = 'main'
+    STATE_FIELD: str = 'state'
+    HASH_FIELD: str = 'hash'
+    SPANS_FIELD: str = 'spans'
+    KEY_FIELD: str = 'key'
+
+    def __init__(self, generated_files_directory: str) -> None:
+        self.directory: str = os.path.join(generated_files_directory, LinkCache.DIRECTORY_NAME)
+        self.index_path: str = os.path.join(self.directory, LinkCache.INDEX_NAME)
+        # filepath -> record with state, hash and spans of marks of file
+        self.files: dict[str, dict[str, Any]] = {}
+        # key and state of last written hard link
+        self.main: dict[str, Any] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.index_path, 'r', encoding=ENCODING) as index_file:
+                index: dict[str, Any] = json.load(index_file)
+                if index[LinkCache.VERSION_FIELD] != LinkCache.VERSION:
+                    raise KeyError(LinkCache.VERSION_FIELD)
+                self.files = index[LinkCache.FILES_FIELD]
+                self.main = index[LinkCache.MAIN_FIELD]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            self.files = {}
+            self.main = {}
+
+    def save(self) -> bool:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary_path: str = f'{self.index_path}{LinkCache.TEMPORARY_SUFFIX}'
+            with open(temporary_path, 'w', encoding=ENCODING) as index_file:
+                json.dump({LinkCache.VERSION_FIELD: LinkCache.VERSION,
+                           LinkCache.FILES_FIELD: self.files,
+                           LinkCache.MAIN_FIELD: self.main}, index_file)
+            os.replace(temporary_path, self.index_path)
+            return True
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode(ENCODING)).hexdigest()
+
+    @staticmethod
+    def get_file_state(filepath: str, is_recent_trusted: bool = False) -> list[int] | None:
+        """
+        :param is_recent_trusted: trust state of file modified just now (it is true for files written by linker)
+        :return: modification time and size of file or None, if file doesn't exist or state isn't trusted
+        """
+        try:
+            stat_result: os.stat_result = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        if not is_recent_trusted and time.time_ns() - stat_result.st_mtime_ns < LinkCache.RACY_INTERVAL_NS:
+            return None
+        return [stat_result.st_mtime_ns, stat_result.st_size]
+
+    def create_node(self, source_file: SourceFile) -> IncludeNode | None:
+        """
+        Create node of source file, file is read only if it has changed since it was cached
+        :return: IncludeNode or None if file couldn't be read
+        """
+        state: list[int] | None = LinkCache.get_file_state(source_file.filepath)
+        record: dict[str, Any] | None = self.files.get(source_file.filepath)
+        if state is not None and record is not None and record[LinkCache.STATE_FIELD] == state:
+            node: IncludeNode = IncludeNode(source_file, [tuple(span) for span in record[LinkCache.SPANS_FIELD]])
+            node.key = record[LinkCache.HASH_FIELD]
+            return node
+
+        was_success, content = source_file.read_content_of_file()
+        if not was_success:
+            return None
+        # content isn't kept by node, it is streamed from file when tree is written
+        node: IncludeNode = IncludeNode(source_file, IncludeNode.find_spans(content))
+        node.key = LinkCache.hash_text(content)
+        self.files[source_file.filepath] = {LinkCache.STATE_FIELD: state,
+                                            LinkCache.HASH_FIELD: node.key,
+                                            LinkCache.SPANS_FIELD: node.spans}
+        return node
+
+    def compute_keys(self, node: IncludeNode) -> str:
+        """
+        Turn content hashes of nodes into keys of their whole subtrees (children first)
+        :return: key of subtree of given node
+        """
+        if node.children:
+            linked_keys: str = ''.join(f'\0{mark}\0{self.compute_keys(node.children[mark])}'
+                                       for mark in node.marks if mark in node.children)
+            node.key = LinkCache.hash_text(f'{LinkCache.VERSION}\0{node.key}{linked_keys}')
+        return node.key
+
+    def get_subtree_path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.{LinkCache.SUBTREE_EXTENSION}')
+
+    def has_subtree(self, key: str) -> bool:
+        return os.path.isfile(self.get_subtree_path(key))
+
+    def copy_subtree(self, key: str, outputs: list[TextIO]) -> None:
+        with open(self.get_subtree_path(key), 'r', encoding=ENCODING) as subtree_file:
+            while chunk := subtree_file.read(LinkCache.CHUNK_SIZE):
+                for output in outputs:
+                    output.write(chunk)
+
+    def open_subtree(self, key: str) -> TextIO | None:
+        """
+        :return: temporary file for spliced subtree, it becomes cached after commit_subtree
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            return open(f'{self.get_subtree_path(key)}{LinkCache.TEMPORARY_SUFFIX}', 'w', encoding=ENCODING)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def commit_subtree(self, key: str) -> None:
+        subtree_path: str = self.get_subtree_path(key)
+        os.replace(f'{subtree_path}{LinkCache.TEMPORARY_SUFFIX}', subtree_path)
+
+    def is_main_up_to_date(self, key: str, main_path: str) -> bool:
+        state: list[int] | None = LinkCache.get_file_state(main_path, True)
+        return (state is not None and self.main.get(LinkCache.KEY_FIELD) == key
+                and self.main.get(LinkCache.STATE_FIELD) == state)
+
+    def set_main(self, key: str, main_path: str) -> None:
+        self.main = {LinkCache.KEY_FIELD: key, LinkCache.STATE_FIELD: LinkCache.get_file_state(main_path, True)}
+
+    def evict(self, used_keys: set[str], used_files: set[str]) -> None:
+        """
+        Remove subtrees and records of files, which aren't part of current build
+        """
+        self.files = {filepath: record for filepath, record in self.files.items() if filepath in used_files}
+        try:
+            cached_names: list[str] = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        used_names: set[str] = {os.path.basename(self.get_subtree_path(key)) for key in used_keys}
+        for cached_name in cached_names:
+            if cached_name.endswith(f'.{LinkCache.SUBTREE_EXTENSION}') and cached_name not in used_names:
+                try:
+                    os.remove(os.path.join(self.directory, cached_name))
+                except FileNotFoundError:
+                    pass
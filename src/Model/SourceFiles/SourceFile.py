@@ -1,18 +1,21 @@
 import os.path
 import re
 import shutil
-from typing import AnyStr
 
+from Model.SourceFiles.FileStateCache import FileStateCache
+from Model.SourceFiles.LatexTokenizer import LatexTokenizer, CommandToken
 from settings_namespace import ENCODING
 
 
 class SourceFile:
     EXTENSION: str = 'tex'
-    MARK_CAPTURE_PATTERN: str = r'\(\\w\+\)'
-    FILE_INPUT_FORMAT: str = r'^\\input{(\w+)}|([^\\])\\input{(\w+)}'
-    GROUP_OF_NAME_BEGINNING = 1
-    GROUP_OF_PREVIOUS_CHARACTER = 2
-    GROUP_OF_NAME_MIDDLE = 3
+    INPUT_COMMAND_NAME: str = 'input'
+    MARKS_CACHE_CAPACITY: int = 4096
+    CONTENT_CACHE_BUDGET: int = 64 * 2 ** 20
+    # marks of unchanged files are shared by every SourceFile instance, capacity is number of files
+    marks_cache: FileStateCache = FileStateCache(MARKS_CACHE_CAPACITY)
+    # content of unchanged files, capacity is number of bytes of cached files
+    content_cache: FileStateCache = FileStateCache(CONTENT_CACHE_BUDGET)
 
     def __init__(self, full_path: str):
         self.full_path: str = full_path
@@ -26,34 +29,59 @@ class SourceFile:
         :return: mark of whole command structure
         """
 
-        groups_match: re.Match[str] | None = re.match(SourceFile.FILE_INPUT_FORMAT, input_command)
-        mark_beginning: AnyStr = groups_match.group(SourceFile.GROUP_OF_NAME_BEGINNING)
-        mark_middle: AnyStr = groups_match.group(SourceFile.GROUP_OF_NAME_MIDDLE)
-
-        if mark_beginning:
-            return mark_beginning
-        else:
-            return mark_middle
+        return SourceFile.find_input_commands(input_command)[0].argument
 
     @staticmethod
     def create_input_command(mark: str) -> str:
         return fr'\input{{{mark}}}'
 
+    @staticmethod
+    def set_content_cache_budget(budget: int) -> None:
+        """
+        :param budget: maximal number of bytes of files kept in content cache, 0 disables cache
+        """
+        SourceFile.content_cache.set_capacity(budget)
+
+    @staticmethod
+    def update_caches(filepath: str, content: str | None = None) -> None:
+        """
+        Forget cached data of file changed by application
+        :param content: new content of file, if it is known (file was just written by application)
+        """
+        SourceFile.content_cache.invalidate(filepath)
+        SourceFile.marks_cache.invalidate(filepath)
+        if content is None:
+            return
+        # file was just written by application, so its content is known without reading it again
+        state: tuple[int, int, int] | None = FileStateCache.get_file_state(filepath)
+        SourceFile.content_cache.put(filepath, state, content, state[1] if state else 0, is_recent_trusted=True)
+
     def read_content_of_file(self) -> tuple[bool, str]:
+        """
+        Content of file unchanged since last read or save is taken from content cache
+        """
+        state: tuple[int, int, int] | None = FileStateCache.get_file_state(self.full_path)
+        text_of_file: str | None = SourceFile.content_cache.get(self.full_path, state)
+        if text_of_file is not None:
+            return True, text_of_file
         try:
             with open(self.full_path, 'r', encoding=ENCODING) as file:
-                text_of_file: str = file.read()
-                return True, text_of_file
+                text_of_file = file.read()
         except FileNotFoundError:
             return False, ''
+        if state is not None:
+            SourceFile.content_cache.put(self.full_path, state, text_of_file, state[1])
+        return True, text_of_file
 
     def save_content_to_file(self, content: str) -> bool:
+        SourceFile.update_caches(self.full_path)
         try:
             with open(self.full_path, 'w', encoding=ENCODING) as file:
                 file.write(content)
-                return True
         except FileNotFoundError:
             return False
+        SourceFile.update_caches(self.full_path, content)
+        return True
 
     def create_copy_to_another_directory(self, directory: str) -> tuple[bool, str]:
         try:
@@ -64,6 +92,7 @@ class SourceFile:
             return False, ''
 
     def remove(self)->bool:
+        SourceFile.update_caches(self.filepath)
         try:
             os.remove(self.filepath)
             return True
@@ -73,6 +102,8 @@ class SourceFile:
     def rename(self, new_name:str)->bool:
         try:
             new_filepath:str=os.path.join(os.path.dirname(self.filepath), new_name)
+            SourceFile.update_caches(self.filepath)
+            SourceFile.update_caches(new_filepath)
             if os.path.exists(new_filepath):
                 os.remove(new_filepath)
             os.rename(self.filepath,new_filepath)
@@ -85,53 +116,69 @@ class SourceFile:
         Get all marks in source file, which object represents
         :return: list[str] - ordered marks (as they were occurring in the file)
         """
+        state: tuple[int, int, int] | None = FileStateCache.get_file_state(self.filepath)
+        marks: list[str] | None = SourceFile.marks_cache.get(self.filepath, state)
+        if marks is not None:
+            return list(marks)
         was_success, text_of_file = self.read_content_of_file()
         if not was_success:
             return []
+        marks = SourceFile.get_marks_from_text(text_of_file)
+        SourceFile.marks_cache.put(self.filepath, state, tuple(marks))
+        return marks
 
-        marks: list = []
-        for matched_text in re.finditer(SourceFile.FILE_INPUT_FORMAT, text_of_file):
-            if matched_text.group(SourceFile.GROUP_OF_NAME_BEGINNING) is not None:
-                marks.append(matched_text.group(SourceFile.GROUP_OF_NAME_BEGINNING))
-            else:
-                marks.append(matched_text.group(SourceFile.GROUP_OF_NAME_MIDDLE))
-
-        return list(dict.fromkeys(marks))
+    @staticmethod
+    def get_marks_from_text(text_of_file: str) -> list[str]:
+        """
+        :return: list[str] - ordered marks (as they were occurring in the text)
+        """
+        return LatexTokenizer.get_arguments(text_of_file, SourceFile.INPUT_COMMAND_NAME)
 
-    def _replacement(self, input_filename: str, matched_text: re.Match) -> str:
-        if matched_text.group(SourceFile.GROUP_OF_NAME_BEGINNING) is not None:
-            return SourceFile.create_input_command(input_filename)
-        else:
-            return f'{matched_text.group(SourceFile.GROUP_OF_PREVIOUS_CHARACTER)}{SourceFile.create_input_command(input_filename)}'
+    @staticmethod
+    def find_input_commands(text: str) -> list[CommandToken]:
+        """
+        :return: list[CommandToken] - input commands with their offsets, commands in comments
+        and verbatim blocks are skipped
+        """
+        return LatexTokenizer.find_commands(text, SourceFile.INPUT_COMMAND_NAME)
 
-    def _hard_replacement(self, content: str, matched_text: re.Match):
-        if matched_text.group(SourceFile.GROUP_OF_NAME_BEGINNING) is not None:
-            return content
-        else:
-            return f'{matched_text.group(SourceFile.GROUP_OF_PREVIOUS_CHARACTER)}{content}'
+    @staticmethod
+    def replace_marks_in_text(text: str, contents: dict[str, str]) -> str:
+        """
+        Replace input commands of all given marks with their contents in one pass over text
+        :param contents: mark -> content which replaces input command of this mark
+        """
+        if not contents:
+            return text
+        return LatexTokenizer.splice(text, SourceFile.find_input_commands(text),
+                                     lambda token: contents.get(token.argument))
 
     def _refactor_filename(self, file_path: str) -> str:
         input_filename = os.path.basename(file_path)
         input_filename = re.sub(fr'\.{SourceFile.EXTENSION}$', '', input_filename)
         return input_filename
 
-    def _replacement_conductor(self, replacer: callable, mark: str, content: str) -> bool:
+    def replace_input(self, mark: str, file_path: str) -> bool:
+        return self.replace_inputs({mark: file_path})
+
+    def replace_inputs(self, files_of_marks: dict[str, str]) -> bool:
+        """
+        Replace input commands of all given marks with input commands of files in one pass,
+        file is read once and saved once
+        :param files_of_marks: mark -> path of file, which should be input in place of mark
+        """
         was_success, text_of_file = self.read_content_of_file()
         if not was_success:
             return False
-        format_to_replace: str = re.sub(SourceFile.MARK_CAPTURE_PATTERN, f'({mark})', SourceFile.FILE_INPUT_FORMAT)
-        text_of_file = re.sub(pattern=format_to_replace,
-                              repl=lambda matched_text: replacer(content, matched_text),
-                              string=text_of_file)
-        self.save_content_to_file(text_of_file)
-        return True
-
-    def replace_input(self, mark: str, file_path: str) -> bool:
-        input_filename = self._refactor_filename(file_path)
-        return self._replacement_conductor(self._replacement, mark, input_filename)
+        input_commands: dict[str, str] = {mark: SourceFile.create_input_command(self._refactor_filename(file_path))
+                                          for mark, file_path in files_of_marks.items()}
+        return self.save_content_to_file(SourceFile.replace_marks_in_text(text_of_file, input_commands))
 
     def hard_replace(self, mark: str, content: str) -> bool:
-        return self._replacement_conductor(self._hard_replacement, mark, content)
+        was_success, text_of_file = self.read_content_of_file()
+        if not was_success:
+            return False
+        return self.save_content_to_file(SourceFile.replace_marks_in_text(text_of_file, {mark: content}))
 
     @property
     def filepath(self) -> str:
@@ -0,0 +1,104 @@
+import os
+import re
+import time
+
+from Model.SourceFiles.SourceFilesOrder import SourceFilesOrder
+
+
+class SourceFilesIndex:
+    """
+    In-memory index of source files directory. It keeps parsed (number, name) pairs of source files
+    ordered by number or by ordering manifest, if it exists. Directory is scanned again only if
+    its modification time (or time of manifest) has changed or index was invalidated
+    (after mutation made by application itself).
+    Index is shared by every manager operating on the same directory.
+    """
+    # directory modified so recently could be modified again within the same timestamp tick,
+    # such scan isn't trusted and directory will be scanned again on next access
+    RACY_INTERVAL_NS: int = 2 * 10 ** 9
+    NUMBER_GROUP: int = 1
+    NAME_GROUP: int = 2
+
+    _indexes: dict[str, 'SourceFilesIndex'] = {}
+
+    def __init__(self, directory: str, file_pattern: re.Pattern) -> None:
+        self.directory: str = directory
+        self.file_pattern: re.Pattern = file_pattern
+        self.order: SourceFilesOrder = SourceFilesOrder(directory)
+        # entries and file_names are aligned and ordered by number of source file or by manifest
+        self.entries: list[tuple[int, str]] = []
+        self.file_names: list[str] = []
+        self.max_number: int | None = None
+        self.is_ordered_by_manifest: bool = False
+        self._state: tuple[int, int | None] | None = None
+
+    @staticmethod
+    def for_directory(directory: str, file_pattern: re.Pattern) -> 'SourceFilesIndex':
+        key: str = os.path.normcase(os.path.abspath(directory))
+        index: SourceFilesIndex | None = SourceFilesIndex._indexes.get(key)
+        if index is None or index.file_pattern != file_pattern:
+            index = SourceFilesIndex(directory, file_pattern)
+            SourceFilesIndex._indexes[key] = index
+        return index
+
+    def _get_state(self) -> tuple[int, int | None] | None:
+        try:
+            return os.stat(self.directory).st_mtime_ns, self.order.get_mtime()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def _scan(self, state: tuple[int, int | None] | None) -> None:
+        parsed_files: list[tuple[int, str, str]] = []
+        try:
+            with os.scandir(self.directory) as directory_entries:
+                for directory_entry in directory_entries:
+                    match_result: re.Match | None = self.file_pattern.fullmatch(directory_entry.name)
+                    if match_result is not None and directory_entry.is_file():
+                        parsed_files.append((int(match_result.group(SourceFilesIndex.NUMBER_GROUP)),
+                                             match_result.group(SourceFilesIndex.NAME_GROUP),
+                                             directory_entry.name))
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        parsed_files.sort(key=lambda parsed_file: parsed_file[0])
+        self.max_number = parsed_files[-1][0] if parsed_files else None
+
+        order: list[str] | None = self.order.read()
+        self.is_ordered_by_manifest = order is not None
+        if order is not None:
+            parsed_by_name: dict[str, tuple[int, str, str]] = {parsed_file[2]: parsed_file for parsed_file in parsed_files}
+            parsed_files = [parsed_by_name[file_name] for file_name in
+                            SourceFilesOrder.apply(order, [parsed_file[2] for parsed_file in parsed_files])]
+
+        self.entries = [(number, name) for number, name, _ in parsed_files]
+        self.file_names = [file_name for _, _, file_name in parsed_files]
+
+        is_racy: bool = state is not None and any(time.time_ns() - mtime < SourceFilesIndex.RACY_INTERVAL_NS
+                                                  for mtime in state if mtime is not None)
+        self._state = None if is_racy else state
+
+    def refresh(self) -> bool:
+        """
+        Scan directory again if it has changed since last scan
+        :return: bool - was directory scanned
+        """
+        state: tuple[int, int | None] | None = self._get_state()
+        if state is not None and state == self._state:
+            return False
+        self._scan(state)
+        return True
+
+    def invalidate(self) -> None:
+        self._state = None
+
+    def get_first_file(self) -> str | None:
+        return self.file_names[0] if self.file_names else None
+
+    def get_last_file(self) -> str | None:
+        return self.file_names[-1] if self.file_names else None
+
+    def get_max_number(self) -> int | None:
+        return self.max_number
+
+    def __len__(self) -> int:
+        return len(self.file_names)
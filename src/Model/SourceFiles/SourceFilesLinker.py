@@ -1,15 +1,39 @@
+import io
 import os
+from typing import TextIO
 
+from Model.FilesDirectoriesManager import FilesDirectoriesManager
+from Model.FilesSynchronizer import FilesSynchronizer
+from Model.SourceFiles.IncludeNode import IncludeNode
+from Model.SourceFiles.LatexTokenizer import LatexTokenizer
+from Model.SourceFiles.LinkCache import LinkCache
 from Model.SourceFiles.SourceFile import SourceFile
 from Model.SourceFiles.SourceFilesManager import SourceFilesManager
-from settings_namespace import GENERATED_FILES
+from Model.SourceFiles.SourceFilesTransaction import SourceFilesTransaction
+from settings_namespace import GENERATED_FILES, BASE_FILES
 
 
 class SourceFilesLinker:
     HARD_LINK_NAME:str='main.tex'
+    # document of partial build, its units are written into units directory next to it
+    PARTIAL_LINK_NAME: str = 'partial.tex'
+    UNITS_DIRECTORY: str = 'units'
+    INCLUDE_COMMAND_NAME: str = 'include'
+    DOCUMENT_BEGIN: str = r'\begin{document}'
+    NOTHING_TO_BUILD_MESSAGE: str = 'None of selected source files is part of body of document, nothing can be built'
+    # command referencing asset -> extensions tried, when asset is referenced without extension
+    ASSETS_EXTENSIONS: dict[str, list[str]] = {'includegraphics': ['', '.pdf', '.png', '.jpg', '.jpeg', '.eps'],
+                                               'input': ['', f'.{SourceFile.EXTENSION}'],
+                                               INCLUDE_COMMAND_NAME: [f'.{SourceFile.EXTENSION}']}
+    # assets are only read by LaTeX, so they can share content with base files
+    ASSETS_SYNC_METHODS: list[str] = [FilesSynchronizer.HARDLINK, FilesSynchronizer.REFLINK]
+
     def __init__(self, settings: dict[str, str]):
         self.settings = settings
         self.source_files_manager = SourceFilesManager(settings)
+        self.directories_manager = FilesDirectoriesManager(settings)
+        # reason of the last failure, which isn't error of linking itself
+        self.last_error: str = ''
 
     def _link(self, linkage_method: callable, source_files_instances: list[SourceFile]) -> tuple[bool, bool]:
         """
@@ -48,46 +72,270 @@ class SourceFilesLinker:
         return True, True
 
     def soft_link(self) -> tuple[bool, bool]:
+        """
+        Replacements are collected for every parent first, so each source file is rewritten once
+        """
+        # parent source file -> mark -> path of file linked in place of mark
+        replacements: dict[SourceFile, dict[str, str]] = {}
+
         def linkage(source_file: SourceFile, mark: str, file_instance: SourceFile) -> bool:
-            return source_file.replace_input(mark, file_instance.filepath)
+            replacements.setdefault(source_file, {})[mark] = file_instance.filepath
+            return True
+
+        result: tuple[bool, bool] = self._link(linkage, self.source_files_manager.create_source_files_instances())
+        for source_file, files_of_marks in replacements.items():
+            if not source_file.replace_inputs(files_of_marks):
+                return False, False
+        return result
 
-        return self._link(linkage, self.source_files_manager.create_source_files_instances())
+    def _build_include_tree(self, link_cache: LinkCache) -> tuple[IncludeNode | None, tuple[bool, bool]]:
+        """
+        Include tree is built in memory from offsets of marks, source files are read at most once to find them
+        and unchanged source files (known to link cache) aren't read at all before streaming
+        :return: root of include tree (None if there are no source files) and result of linking
+        """
+        def linkage(source_node: IncludeNode, mark: str, node_instance: IncludeNode) -> bool:
+            return source_node.attach(mark, node_instance)
+
+        nodes: list[IncludeNode] = []
+        for source_file in self.source_files_manager.create_source_files_instances():
+            node: IncludeNode | None = link_cache.create_node(source_file)
+            if node is None:
+                return None, (False, False)
+            nodes.append(node)
+
+        if nodes == []:
+            return None, (True, True)
+
+        result: tuple[bool, bool] = self._link(linkage, list(nodes))
+        link_cache.compute_keys(nodes[0])
+        return nodes[0], result
+
+    def _stream_include_tree(self, node: IncludeNode, outputs: list[TextIO], link_cache: LinkCache) -> None:
+        """
+        Write subtree into outputs chunk by chunk. Linked subtrees with own marks are copied from link cache,
+        if they were spliced before, otherwise they are written also into new cache file.
+        """
+        for part in node.iter_parts():
+            if not isinstance(part, IncludeNode):
+                for output in outputs:
+                    output.write(part)
+            elif not part.children:
+                self._stream_include_tree(part, outputs, link_cache)
+            elif link_cache.has_subtree(part.key):
+                link_cache.copy_subtree(part.key, outputs)
+            else:
+                subtree_file: TextIO | None = link_cache.open_subtree(part.key)
+                if subtree_file is None:
+                    self._stream_include_tree(part, outputs, link_cache)
+                    continue
+                with subtree_file:
+                    self._stream_include_tree(part, outputs + [subtree_file], link_cache)
+                link_cache.commit_subtree(part.key)
+
+    @staticmethod
+    def _collect_subtree_keys(node: IncludeNode, keys: set[str]) -> set[str]:
+        for child in node.children.values():
+            if child.children:
+                keys.add(child.key)
+                SourceFilesLinker._collect_subtree_keys(child, keys)
+        return keys
+
+    def _get_link_cache(self) -> LinkCache:
+        return LinkCache(self.settings[GENERATED_FILES])
+
+    def write_hard_link(self, output: TextIO) -> tuple[bool, bool]:
+        """
+        Stream hard linked document into given text stream (file, pipe...) chunk by chunk,
+        as include tree is walked
+        """
+        link_cache: LinkCache = self._get_link_cache()
+        root, result = self._build_include_tree(link_cache)
+        if root is not None and result[1]:
+            self._stream_include_tree(root, [output], link_cache)
+            link_cache.save()
+        return result
 
     def hard_link(self) -> tuple[bool, bool]:
-        def linkage(source_file: SourceFile, mark: str, file_instance: SourceFile) -> bool:
-            was_successful, content = file_instance.read_content_of_file()
-            if not was_successful:
-                return False
-            return source_file.hard_replace(mark, content)
-
-        basic_source_files: list[SourceFile]=self.source_files_manager.create_source_files_instances()
-        changed_source_files: list[SourceFile]=[]
-        for basic_file in basic_source_files:
-            was_success, file_path=basic_file.create_copy_to_another_directory(self.settings[GENERATED_FILES])
-            if not was_success:
+        """
+        Incremental hard link - only subtrees containing changed files are spliced again
+        and main.tex isn't rewritten at all, if nothing has changed since it was written
+        """
+        link_cache: LinkCache = self._get_link_cache()
+        root, result = self._build_include_tree(link_cache)
+        if root is None or not result[1]:
+            return result
+
+        output_path: str = self.get_output_path_of_hard_link()
+        if not link_cache.is_main_up_to_date(root.key, output_path):
+            # main.tex is replaced only when it is written completely
+            transaction: SourceFilesTransaction = SourceFilesTransaction()
+            output: TextIO | None = transaction.open(output_path)
+            if output is None:
                 return False, False
-            else:
-                changed_source_files.append(SourceFile(file_path))
+            try:
+                with output:
+                    self._stream_include_tree(root, [output], link_cache)
+            except Exception:
+                transaction.rollback()
+                raise
+            if not transaction.commit():
+                return False, False
+            link_cache.set_main(root.key, output_path)
 
-        if basic_source_files==[]:
-            return True, True
+        self._evict_link_cache(root, link_cache)
+        return result[0], self.sync_referenced_assets()
+
+    def _evict_link_cache(self, root: IncludeNode, link_cache: LinkCache) -> None:
+        link_cache.evict(SourceFilesLinker._collect_subtree_keys(root, set()),
+                         {source_file.filepath for source_file in self.source_files_manager.create_source_files_instances()})
+        link_cache.save()
+
+    @staticmethod
+    def _contains_file(node: IncludeNode, filepaths: set[str]) -> bool:
+        return (os.path.abspath(node.source_file.filepath) in filepaths
+                or any(SourceFilesLinker._contains_file(child, filepaths) for child in node.children.values()))
+
+    def _get_unit_name(self, mark: str) -> str:
+        # LaTeX paths use forward slashes on every platform
+        return f'{SourceFilesLinker.UNITS_DIRECTORY}/{mark}'
+
+    def hard_link_partial(self, selected_filepaths: list[str]) -> tuple[bool, bool]:
+        """
+        Hard link for partial build - every file linked to mark of the first source file is written
+        as separate unit and included by \\include, only units containing selected files are compiled
+        (\\includeonly), other units keep their pages and labels from auxiliary files of previous partial build.
+        The first partial build compiles all units, so their auxiliary files exist.
+        Linking fails (last_error is set), if no selected file is in unit or the first source file.
+        """
+        self.last_error = ''
+        link_cache: LinkCache = self._get_link_cache()
+        root, result = self._build_include_tree(link_cache)
+        if root is None or not result[1]:
+            return result
+
+        selected: set[str] = {os.path.abspath(filepath) for filepath in selected_filepaths}
+        is_root_selected: bool = os.path.abspath(root.source_file.filepath) in selected
+        marks_of_children: dict[int, str] = {id(child): mark for mark, child in root.children.items()}
+        units_directory: str = os.path.join(self.settings[GENERATED_FILES], SourceFilesLinker.UNITS_DIRECTORY)
+        os.makedirs(units_directory, exist_ok=True)
+        transaction: SourceFilesTransaction = SourceFilesTransaction()
+        document: io.StringIO = io.StringIO()
+        compiled_units: list[str] = []
+        are_units_built: bool = True
+        is_in_body: bool = False
+        # end of previous chunk, beginning of document can be split between chunks
+        previous_tail: str = ''
+        try:
+            for part in root.iter_parts():
+                if not isinstance(part, IncludeNode):
+                    document.write(part)
+                    window: str = f'{previous_tail}{part}'
+                    is_in_body = is_in_body or SourceFilesLinker.DOCUMENT_BEGIN in window
+                    previous_tail = window[-len(SourceFilesLinker.DOCUMENT_BEGIN):]
+                    continue
+                previous_tail = ''
+                if not is_in_body:
+                    # \include can't be used in preamble, files linked there stay in document
+                    self._stream_include_tree(part, [document], link_cache)
+                    continue
+                mark: str = marks_of_children[id(part)]
+                output: TextIO | None = transaction.open(os.path.join(units_directory, f'{mark}.{SourceFile.EXTENSION}'))
+                if output is None:
+                    transaction.rollback()
+                    return False, False
+                with output:
+                    self._stream_include_tree(part, [output], link_cache)
+                document.write(f'\\{SourceFilesLinker.INCLUDE_COMMAND_NAME}{{{self._get_unit_name(mark)}}}')
+                if is_root_selected or SourceFilesLinker._contains_file(part, selected):
+                    compiled_units.append(self._get_unit_name(mark))
+                are_units_built = are_units_built and os.path.isfile(os.path.join(units_directory, f'{mark}.aux'))
+        except Exception:
+            transaction.rollback()
+            raise
 
-        initial_result: tuple[bool, bool] = self._link(linkage, list(changed_source_files))
+        if not (is_root_selected or compiled_units):
+            transaction.rollback()
+            self.last_error = SourceFilesLinker.NOTHING_TO_BUILD_MESSAGE
+            return result[0], False
 
-        change_name_result: bool=changed_source_files[0].rename(SourceFilesLinker.HARD_LINK_NAME)
-        if not change_name_result:
+        document_text: str = document.getvalue()
+        document_begin: int = document_text.find(SourceFilesLinker.DOCUMENT_BEGIN)
+        if are_units_built and document_begin != -1:
+            document_text = (f'{document_text[:document_begin]}\\includeonly{{{",".join(compiled_units)}}}\n'
+                             f'{document_text[document_begin:]}')
+        transaction.write(self.get_output_path_of_partial_link(), document_text)
+        if not transaction.commit():
             return False, False
 
-        for changed_file in changed_source_files[1:]:
-            remove_result: bool=changed_file.remove()
-            if not remove_result:
-                return False, False
+        self._evict_link_cache(root, link_cache)
+        return result[0], self.sync_referenced_assets(self.get_output_path_of_partial_link())
 
-        return initial_result
+    @staticmethod
+    def is_outside_reference(reference: str) -> bool:
+        """
+        :return: bool - is reference absolute or relative to parent of directory of document
+        """
+        return os.path.isabs(reference) or reference.startswith(os.pardir)
+
+    @staticmethod
+    def get_referenced_assets(document_text: str, should_include_outside: bool = False) -> list[tuple[str, list[str]]]:
+        """
+        :param should_include_outside: references outside of directory of document (absolute or with ..)
+        are included too, they aren't synchronized, but they affect result of build
+        :return: list[tuple[str, list[str]]] - paths of files referenced by document (graphics and inputs)
+        with extensions, which LaTeX tries for them
+        """
+        references: list[tuple[str, list[str]]] = []
+        for command_name, extensions in SourceFilesLinker.ASSETS_EXTENSIONS.items():
+            for token in LatexTokenizer.find_commands(document_text, command_name, LatexTokenizer.PATH_PATTERN, True):
+                reference: str = os.path.normpath(token.argument)
+                if should_include_outside or not SourceFilesLinker.is_outside_reference(reference):
+                    references.append((reference, extensions))
+        return references
+
+    def sync_referenced_assets(self, document_path: str | None = None) -> bool:
+        """
+        Base files referenced by hard linked document relatively to generated files directory
+        (e.g. \\includegraphics{plot}) are synchronized into it, only changed assets are copied
+        :param document_path: hard linked document, main.tex if None, units of document are searched too
+        :return: bool - were all referenced assets synchronized
+        """
+        output_path: str = document_path if document_path is not None else self.get_output_path_of_hard_link()
+        was_success, document_text = SourceFile(output_path).read_content_of_file()
+        if not was_success:
+            return False
+        references: list[tuple[str, list[str]]] = SourceFilesLinker.get_referenced_assets(document_text)
+        # units are generated with document, they aren't base files
+        units: set[str] = set()
+        for token in LatexTokenizer.find_commands(document_text, SourceFilesLinker.INCLUDE_COMMAND_NAME,
+                                                  LatexTokenizer.PATH_PATTERN):
+            units.add(os.path.normpath(token.argument))
+            unit_path: str = os.path.join(self.settings[GENERATED_FILES], f'{token.argument}.{SourceFile.EXTENSION}')
+            was_success, unit_text = SourceFile(unit_path).read_content_of_file()
+            if was_success:
+                references += SourceFilesLinker.get_referenced_assets(unit_text)
+        assets_paths: dict[str, str] = {}
+        for reference, extensions in references:
+            if reference in units:
+                continue
+            for extension in extensions:
+                asset_path: str = os.path.join(self.settings[BASE_FILES], f'{reference}{extension}')
+                if os.path.isfile(asset_path):
+                    assets_paths[f'{reference}{extension}'] = asset_path
+                    break
+        assets_paths.pop(SourceFilesLinker.HARD_LINK_NAME, None)
+        assets_paths.pop(SourceFilesLinker.PARTIAL_LINK_NAME, None)
+        return self.directories_manager.sync_files_to_directory(
+            list(assets_paths.values()), GENERATED_FILES, list(assets_paths),
+            FilesSynchronizer(SourceFilesLinker.ASSETS_SYNC_METHODS))
 
     def get_output_path_of_hard_link(self)->str:
         return os.path.join(self.settings[GENERATED_FILES], SourceFilesLinker.HARD_LINK_NAME)
 
+    def get_output_path_of_partial_link(self) -> str:
+        return os.path.join(self.settings[GENERATED_FILES], SourceFilesLinker.PARTIAL_LINK_NAME)
+
     def get_main_filepath(self)->str:
         instances: list[SourceFile]=self.source_files_manager.create_source_files_instances()
         if instances:
@@ -1,8 +1,11 @@
 import os.path
 import re
+import threading
 
 from Model.FilesDirectoriesManager import FilesDirectoriesManager
 from Model.SourceFiles.SourceFile import SourceFile
+from Model.SourceFiles.SourceFilesIndex import SourceFilesIndex
+from Model.SourceFiles.SourceFilesTransaction import SourceFilesTransaction
 from settings_namespace import SOURCE_FILES
 
 
@@ -11,29 +14,39 @@ class SourceFilesManager:
     EXTENSION: str = SourceFile.EXTENSION
     NAME_FORMAT: str = r'([\w ]+)'
     FILE_FORMAT: str = fr'^(\d+)_{NAME_FORMAT}\.{EXTENSION}$'
+    NAME_PATTERN: re.Pattern = re.compile(NAME_FORMAT)
+    FILE_PATTERN: re.Pattern = re.compile(FILE_FORMAT)
     BAD_FORMAT_NUMER: int = -1
     BAD_FILE_NAME: str = ''
     START_COUNT: int = 0
+    # creators running concurrently (see RecipeExecutor) mustn't take the same number of new source file
+    _numbering_lock: threading.Lock = threading.Lock()
 
     def __init__(self, settings: dict[str, str]):
         self.settings = settings
         self.source_files_directory = settings[SOURCE_FILES]
         self.files_list: list[str] = []
-        self.sorting_key: callable = lambda file: int(self.file_name_decomposer(file)[0])
         self.directories_manager = FilesDirectoriesManager(self.settings)
+        self.index: SourceFilesIndex = SourceFilesIndex.for_directory(self.source_files_directory,
+                                                                      SourceFilesManager.FILE_PATTERN)
+        # name of source file saved last (e.g. by save_next_source_file)
+        self.last_saved_file_name: str | None = None
+
+    def _refresh_index(self) -> None:
+        # files are renumbered only when directory has really changed
+        if self.index.refresh() and not self.index.is_ordered_by_manifest:
+            self.renumber_source_files()
 
     def _get_list_of_files(self) -> None:
-        files_directories_manager = FilesDirectoriesManager(self.settings)
-        self.files_list = list(
-            filter(lambda file_name: re.fullmatch(SourceFilesManager.FILE_FORMAT, file_name) is not None,
-                   files_directories_manager.read_files_from_directory(SOURCE_FILES)))
+        self.index.refresh()
+        self.files_list = list(self.index.file_names)
 
     def get_list_of_files(self) -> None:
-        self._get_list_of_files()
-        self.renumber_source_files()
+        self._refresh_index()
+        self.files_list = list(self.index.file_names)
 
     def file_name_decomposer(self, file_name: str) -> tuple[int, str]:
-        match_result = re.fullmatch(SourceFilesManager.FILE_FORMAT, file_name)
+        match_result = SourceFilesManager.FILE_PATTERN.fullmatch(file_name)
         if match_result:
             return match_result.group(1), match_result.group(2)
         else:
@@ -41,26 +54,20 @@ class SourceFilesManager:
 
     def _return_ordered_files(self) -> list[str]:
         self._get_list_of_files()
-        return sorted(self.files_list, key=self.sorting_key)
+        return list(self.files_list)
 
     def return_ordered_files(self) -> list[str]:
         self.get_list_of_files()
-        return sorted(self.files_list, key=self.sorting_key)
-
-    def _find_file(self, method: callable) -> str | None:
-        self.get_list_of_files()
-        if len(self.files_list) > 0:
-            last_file = method(self.files_list, key=self.sorting_key)
-            return last_file
-        else:
-            return None
+        return list(self.files_list)
 
     def find_the_last_file(self) -> str | None:
-        return self._find_file(max)
+        self._refresh_index()
+        return self.index.get_last_file()
 
     def get_first_file(self) -> str | None:
         # it should be {START_COUNT}_...
-        return self._find_file(min)
+        self._refresh_index()
+        return self.index.get_first_file()
 
     def get_filepath(self, base_name: str) -> str:
         return os.path.join(self.settings[SOURCE_FILES], base_name)
@@ -69,36 +76,45 @@ class SourceFilesManager:
         return f'{num}_{name_part}.{SourceFilesManager.EXTENSION}'
 
     def save_next_source_file(self, filename: str, content: str) -> bool:
-        self.get_list_of_files()
-        files_directories_manager = FilesDirectoriesManager(self.settings)
-        filename = self.next_file_name(filename)
-        return files_directories_manager.save_file_to_directory(SOURCE_FILES, filename, content)
+        with SourceFilesManager._numbering_lock:
+            filename = self.next_file_name(filename)
+            return self.save_source_file(filename, content)
 
     def next_file_name(self, name_part: str) -> str:
-        if re.fullmatch(SourceFilesManager.NAME_FORMAT, name_part) is None:
+        if SourceFilesManager.NAME_PATTERN.fullmatch(name_part) is None:
             return SourceFilesManager.BAD_FILE_NAME
-        last_file = self.find_the_last_file()
-        if last_file is None:
+        self._refresh_index()
+        # with ordering manifest number is only identifier, so new file still takes the highest number
+        max_number: int | None = self.index.get_max_number()
+        if max_number is None:
             return self.create_source_file_name(SourceFilesManager.START_COUNT, name_part)
-        num, _ = self.file_name_decomposer(last_file)
-        return self.create_source_file_name(int(num) + 1, name_part)
+        return self.create_source_file_name(max_number + 1, name_part)
 
     def save_source_file(self, file_name: str, content: str) -> bool:
-        return self.directories_manager.save_file_to_directory(SOURCE_FILES, file_name, content)
+        result: bool = self.directories_manager.save_file_to_directory(SOURCE_FILES, file_name, content)
+        self.index.invalidate()
+        if result:
+            self.last_saved_file_name = file_name
+        return result
 
     def renumber_source_files(self) -> bool:
-        self._get_list_of_files()
-        files_directories_manager = FilesDirectoriesManager(self.settings)
-        sorted_files: list[str] = self._return_ordered_files()
-        for i in range(len(sorted_files)):
-            num, name = self.file_name_decomposer(sorted_files[i])
-            file_path: str = self.get_filepath(self.create_source_file_name(int(num), name))
-            new_path: str = self.get_filepath(self.create_source_file_name(i + SourceFilesManager.START_COUNT, name))
-            if file_path != new_path:
-                if not files_directories_manager.rename_file(file_path, new_path):
-                    return False
-        self._get_list_of_files()
-        return True
+        self.index.refresh()
+        if self.index.is_ordered_by_manifest:
+            # order is owned by manifest, names of files stay stable
+            self.files_list = list(self.index.file_names)
+            return True
+        # all files are renamed together or none of them
+        transaction: SourceFilesTransaction = SourceFilesTransaction()
+        for i, ((_, name), file_name) in enumerate(zip(self.index.entries, self.index.file_names)):
+            new_file_name: str = self.create_source_file_name(i + SourceFilesManager.START_COUNT, name)
+            transaction.rename(self.get_filepath(file_name), self.get_filepath(new_file_name))
+        result: bool = True
+        if not transaction.is_empty():
+            result = transaction.commit()
+            self.index.invalidate()
+            self.index.refresh()
+        self.files_list = list(self.index.file_names)
+        return result
 
     def _has_file_number_checker(self, number: int) -> callable:
         def file_number_checker(filename: str) -> bool:
@@ -125,27 +141,36 @@ class SourceFilesManager:
         return True
 
     def _rename_as_ordered(self, source_files: list[str]) -> bool:
-        files_directories_manager = FilesDirectoriesManager(self.settings)
-        result: bool
-
+        # files with the same name part could swap their numbers, transaction renames them at once
+        transaction: SourceFilesTransaction = SourceFilesTransaction()
         for i, source_file in enumerate(source_files):
             num, name = self.file_name_decomposer(source_file)
             if int(num) - SourceFilesManager.START_COUNT != i:
-                old_path: str = self.get_filepath(source_file)
-                new_path: str = self.get_filepath(
-                    self.create_source_file_name(i + SourceFilesManager.START_COUNT, name))
-                result = files_directories_manager.rename_file(old_path, new_path)
-                if not result:
-                    return False
-        return True
+                transaction.rename(self.get_filepath(source_file),
+                                   self.get_filepath(self.create_source_file_name(i + SourceFilesManager.START_COUNT, name)))
+        result: bool = transaction.commit()
+        self.index.invalidate()
+        return result
+
+    def _change_position_in_manifest(self, current_position: int, next_position: int) -> bool:
+        ordered_files: list[str] = list(self.files_list)
+        if not self._shift(ordered_files, current_position - SourceFilesManager.START_COUNT,
+                           next_position - SourceFilesManager.START_COUNT):
+            return False
+        result: bool = self.index.order.save(ordered_files)
+        self.index.invalidate()
+        return result
 
     def change_position_of_file(self, current_position: int, next_position: int) -> bool:
         self.get_list_of_files()
 
+        if self.index.is_ordered_by_manifest:
+            return self._change_position_in_manifest(current_position, next_position)
+
         if not len(list(filter(self._has_file_number_checker(current_position), self.files_list))) == 1:
             return False
 
-        sorted_files: list[str] = self._return_ordered_files()
+        sorted_files: list[str] = list(self.files_list)
 
         current_index: int = current_position - SourceFilesManager.START_COUNT
         next_index: int = next_position - SourceFilesManager.START_COUNT
@@ -155,12 +180,41 @@ class SourceFilesManager:
 
         return self._rename_as_ordered(sorted_files)
 
+    def is_ordered_by_manifest(self) -> bool:
+        self.index.refresh()
+        return self.index.is_ordered_by_manifest
+
+    def enable_order_manifest(self) -> bool:
+        """
+        Migrate from numbered scheme - current order of numbered files is saved in manifest,
+        no file is renamed
+        """
+        self.get_list_of_files()
+        if self.index.is_ordered_by_manifest:
+            return True
+        result: bool = self.index.order.save(list(self.files_list))
+        self.index.invalidate()
+        return result
+
+    def disable_order_manifest(self) -> bool:
+        """
+        Migrate back to numbered scheme - files are renamed in order of manifest, then manifest is removed
+        """
+        self.get_list_of_files()
+        if not self.index.is_ordered_by_manifest:
+            return True
+        if not self._rename_as_ordered(list(self.files_list)):
+            return False
+        result: bool = self.index.order.remove()
+        self.index.invalidate()
+        return result
+
     def create_source_files_instances(self) -> list[SourceFile]:
         return [SourceFile(os.path.join(self.settings[SOURCE_FILES], file)) for file in self.return_ordered_files()]
 
     def are_source_files_empty(self)->bool:
-        self.get_list_of_files()
-        return self.files_list==[]
+        self._refresh_index()
+        return len(self.index) == 0
 
 
 if __name__ == '__main__':
@@ -0,0 +1,68 @@
+import json
+import os
+
+from settings_namespace import ENCODING, ORDER_MANIFEST_NAME
+
+
+class SourceFilesOrder:
+    """
+    Optional ordering manifest of source files. If manifest exists in source files directory,
+    it owns order of source files and names of files stay stable - number in name of file
+    is then only its identifier. Files missing in manifest are placed after ordered ones.
+    """
+    ORDER_FIELD: str = 'order'
+    TEMPORARY_SUFFIX: str = '.tmp'
+
+    def __init__(self, directory: str) -> None:
+        self.manifest_path: str = os.path.join(directory, ORDER_MANIFEST_NAME)
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.manifest_path)
+
+    def get_mtime(self) -> int | None:
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def read(self) -> list[str] | None:
+        """
+        :return: list[str] - ordered names of files or None, if there is no valid manifest
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding=ENCODING) as manifest_file:
+                order: list[str] = json.load(manifest_file)[SourceFilesOrder.ORDER_FIELD]
+                return [file_name for file_name in order if isinstance(file_name, str)]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    def save(self, file_names: list[str]) -> bool:
+        # manifest is replaced at once, so it is never left half-written
+        temporary_path: str = f'{self.manifest_path}{SourceFilesOrder.TEMPORARY_SUFFIX}'
+        try:
+            with open(temporary_path, 'w', encoding=ENCODING) as manifest_file:
+                json.dump({SourceFilesOrder.ORDER_FIELD: file_names}, manifest_file, ensure_ascii=False, indent=1)
+            os.replace(temporary_path, self.manifest_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def remove(self) -> bool:
+        try:
+            os.remove(self.manifest_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def apply(order: list[str], file_names: list[str]) -> list[str]:
+        """
+        Order files as manifest says
+        :param order: names of files from manifest
+        :param file_names: files present in directory, ordered by their numbers
+        :return: list[str] - files ordered by manifest, files absent in manifest are appended in given order
+        """
+        present_files: set[str] = set(file_names)
+        ordered: list[str] = list(dict.fromkeys(file_name for file_name in order if file_name in present_files))
+        ordered_set: set[str] = set(ordered)
+        return ordered + [file_name for file_name in file_names if file_name not in ordered_set]
@@ -0,0 +1,200 @@
+import os
+from typing import TextIO
+
+from Model.SourceFiles.SourceFile import SourceFile
+from settings_namespace import ENCODING
+
+
+class SourceFilesTransaction:
+    """
+    Transaction buffers writes, renames and removals of files and applies them together at commit,
+    so multi-file operation doesn't leave project half-modified. Writes go to temporary files first
+    (written content is never visible partially) and they replace original files only if all of them
+    were written. Nothing is changed on disk before commit, rollback just discards buffered operations.
+
+    At commit renames are applied first (all at once, so files can swap their names),
+    then writes and then removals, so paths of writes and removals are paths after renames.
+    If any write can't replace its file, already replaced files get their previous content back
+    and renames are undone.
+    """
+    TEMPORARY_SUFFIX: str = '.transaction'
+    RENAMING_SUFFIX: str = '.renaming'
+    BACKUP_SUFFIX: str = '.backup'
+
+    def __init__(self) -> None:
+        # filepath -> content, the last write of the same file wins
+        self.writes: dict[str, str] = {}
+        # filepath -> temporary file already written by stream
+        self.streams: dict[str, TextIO] = {}
+        # old filepath -> new filepath
+        self.renames: dict[str, str] = {}
+        self.removals: list[str] = []
+        # (source, destination) of every move made by renames of current commit, in order
+        self._applied_renames: list[tuple[str, str]] = []
+
+    @staticmethod
+    def _get_temporary_path(filepath: str) -> str:
+        return f'{filepath}{SourceFilesTransaction.TEMPORARY_SUFFIX}'
+
+    def write(self, filepath: str, content: str) -> None:
+        self._discard_stream(filepath)
+        self.writes[filepath] = content
+
+    def open(self, filepath: str) -> TextIO | None:
+        """
+        Open stream for content of file, which is written into temporary file immediately
+        (content isn't kept in memory), file is replaced at commit
+        :return: text stream or None if temporary file couldn't be created
+        """
+        self.writes.pop(filepath, None)
+        self._discard_stream(filepath)
+        try:
+            stream: TextIO = open(SourceFilesTransaction._get_temporary_path(filepath), 'w', encoding=ENCODING)
+        except OSError:
+            return None
+        self.streams[filepath] = stream
+        return stream
+
+    def rename(self, filepath: str, new_filepath: str) -> None:
+        if filepath != new_filepath:
+            self.renames[filepath] = new_filepath
+
+    def remove(self, filepath: str) -> None:
+        self.writes.pop(filepath, None)
+        self._discard_stream(filepath)
+        self.removals.append(filepath)
+
+    def is_empty(self) -> bool:
+        return not (self.writes or self.streams or self.renames or self.removals)
+
+    def _discard_stream(self, filepath: str) -> None:
+        stream: TextIO | None = self.streams.pop(filepath, None)
+        if stream is not None:
+            stream.close()
+            SourceFilesTransaction._remove_silently(SourceFilesTransaction._get_temporary_path(filepath))
+
+    @staticmethod
+    def _remove_silently(filepath: str) -> None:
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass
+
+    def _prepare_writes(self) -> bool:
+        """
+        Write buffered contents into temporary files
+        :return: bool - were all temporary files written
+        """
+        for stream in self.streams.values():
+            stream.close()
+        try:
+            for filepath, content in self.writes.items():
+                with open(SourceFilesTransaction._get_temporary_path(filepath), 'w', encoding=ENCODING) as file:
+                    file.write(content)
+            return True
+        except OSError:
+            return False
+
+    def _apply_renames(self) -> bool:
+        # files are firstly moved aside, so they don't overwrite each other when they swap their names
+        self._applied_renames = []
+        try:
+            for filepath in self.renames:
+                aside_path: str = f'{filepath}{SourceFilesTransaction.RENAMING_SUFFIX}'
+                os.rename(filepath, aside_path)
+                self._applied_renames.append((filepath, aside_path))
+            for filepath, new_filepath in self.renames.items():
+                aside_path: str = f'{filepath}{SourceFilesTransaction.RENAMING_SUFFIX}'
+                os.replace(aside_path, new_filepath)
+                self._applied_renames.append((aside_path, new_filepath))
+        except OSError:
+            self._undo_renames()
+            return False
+        finally:
+            self._update_caches_of_renames()
+        return True
+
+    def _undo_renames(self) -> None:
+        for source_path, destination_path in reversed(self._applied_renames):
+            try:
+                os.replace(destination_path, source_path)
+            except OSError:
+                pass
+        self._applied_renames = []
+
+    def _update_caches_of_renames(self) -> None:
+        for filepath, new_filepath in self.renames.items():
+            SourceFile.update_caches(filepath)
+            SourceFile.update_caches(new_filepath)
+
+    def _replace_files(self) -> bool:
+        """
+        Replace files by their temporary files, previous files are kept aside until all of them are replaced
+        :return: bool - were all files replaced (otherwise no file is replaced)
+        """
+        # filepath -> path of its previous version or None, if file didn't exist
+        replaced: dict[str, str | None] = {}
+        try:
+            for filepath in list(self.streams) + list(self.writes):
+                backup_path: str | None = None
+                if os.path.isfile(filepath):
+                    backup_path = f'{filepath}{SourceFilesTransaction.BACKUP_SUFFIX}'
+                    os.replace(filepath, backup_path)
+                replaced[filepath] = backup_path
+                os.replace(SourceFilesTransaction._get_temporary_path(filepath), filepath)
+        except OSError:
+            for filepath, backup_path in reversed(replaced.items()):
+                try:
+                    if backup_path is not None:
+                        os.replace(backup_path, filepath)
+                    else:
+                        SourceFilesTransaction._remove_silently(filepath)
+                except OSError:
+                    pass
+                SourceFile.update_caches(filepath)
+            return False
+        for filepath, backup_path in replaced.items():
+            if backup_path is not None:
+                SourceFilesTransaction._remove_silently(backup_path)
+            SourceFile.update_caches(filepath, self.writes.get(filepath))
+        return True
+
+    def commit(self) -> bool:
+        """
+        Apply buffered operations, if any of temporary files can't be written, renames fail
+        or any file can't be replaced, no file is changed
+        :return: bool - were all operations applied
+        """
+        if not self._prepare_writes() or not self._apply_renames():
+            self.rollback()
+            return False
+        if not self._replace_files():
+            self._undo_renames()
+            self._update_caches_of_renames()
+            self.rollback()
+            return False
+
+        result: bool = True
+        for filepath in self.removals:
+            try:
+                os.remove(filepath)
+            except OSError:
+                result = False
+            SourceFile.update_caches(filepath)
+
+        self._clear()
+        return result
+
+    def rollback(self) -> None:
+        for stream in self.streams.values():
+            stream.close()
+        for filepath in list(self.streams) + list(self.writes):
+            SourceFilesTransaction._remove_silently(SourceFilesTransaction._get_temporary_path(filepath))
+        self._clear()
+
+    def _clear(self) -> None:
+        self.writes = {}
+        self.streams = {}
+        self.renames = {}
+        self.removals = []
+        self._applied_renames = []
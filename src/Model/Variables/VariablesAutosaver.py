@@ -0,0 +1,47 @@
+import threading
+
+from Model.Variables.VariablesStore import VariablesStore
+
+
+class VariablesAutosaver:
+    """
+    Saver of variables independent of GUI - variables set or removed since last saving are written
+    periodically in background thread (see VariablesStore), so crash of application loses only last changes.
+    Stopping of autosaver saves remaining changes.
+    """
+    INTERVAL: float = 30.0
+
+    def __init__(self, store: VariablesStore, interval: float = INTERVAL) -> None:
+        self.store: VariablesStore = store
+        self.interval: float = interval
+        self._thread: threading.Thread | None = None
+        self._stop_event: threading.Event = threading.Event()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            if self.store.is_dirty:
+                self.store.save()
+
+    def start(self) -> bool:
+        """
+        :return: bool - was autosave started (only one autosave thread runs at once)
+        """
+        if self.is_running():
+            return False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self) -> bool:
+        """
+        Stop autosave thread and save remaining changes
+        :return: bool - were all variables saved
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.store.save()
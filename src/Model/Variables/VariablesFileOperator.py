@@ -1,26 +1,23 @@
-import os.path
 from typing import Any
-import pickle
 
-from settings_namespace import VARIABLES_FILE_NAME
+from Model.Variables.VariablesStore import VariablesStore
 
 
 class VariablesFileOperator:
     def __init__(self, selected_directory: str) -> None:
         self.selected_directory = selected_directory
-        self.variables_filepath = os.path.join(self.selected_directory, VARIABLES_FILE_NAME)
 
-    def save_variables(self, variables: dict[str, Any]) -> bool:
-        try:
-            with open(self.variables_filepath, 'wb') as file:
-                pickle.dump(variables, file)
-                return True
-        except (FileNotFoundError, pickle.PicklingError):
-            return False
+    def save_variables(self, variables: dict[str, Any] | VariablesStore) -> bool:
+        if isinstance(variables, VariablesStore) and variables.project_directory == self.selected_directory:
+            return variables.save()
+        store: VariablesStore = VariablesStore(self.selected_directory)
+        store.update(variables)
+        return store.save()
 
-    def read_variables(self) -> dict[str, Any]:
-        try:
-            with open(self.variables_filepath, 'rb') as file:
-                return pickle.load(file)
-        except (FileNotFoundError, pickle.UnpicklingError):
-            return {}
+    def read_variables(self) -> VariablesStore:
+        """
+        :return: variables of project, which are read on first access (empty, if they can't be read)
+        """
+        store: VariablesStore = VariablesStore(self.selected_directory)
+        store.read()
+        return store
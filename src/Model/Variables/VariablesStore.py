@@ -0,0 +1,363 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+import pickle
+import re
+import sys
+import threading
+from collections.abc import MutableMapping, Iterator
+from typing import Any
+
+from settings_namespace import ENCODING, VARIABLES_FILE_NAME, VARIABLES_DIRECTORY_NAME
+
+
+class VariablesStore(MutableMapping):
+    """
+    Variables of project stored one per file in variables directory of project - DataFrames and Series
+    as Parquet (if pyarrow or fastparquet is installed), numpy arrays as .npy, other values pickled.
+    Manifest (name of variable -> file and its format) is read on opening, value of variable is read
+    on its first access, so opening of project doesn't load all variables.
+    Store records variables, which were set or removed since last saving, and saving writes only them.
+    Value changed in place isn't noticed - it has to be set again (or marked by mark_changed or mark_changed_since).
+    Values are serialized only while no operation (see operation) changes them, so saving in another thread
+    never writes half changed value.
+    Project with variables.pkl of previous versions is migrated by the first saving.
+    """
+    VERSION: int = 1
+    MANIFEST_FILE_NAME: str = 'manifest.json'
+    TEMPORARY_SUFFIX: str = '.saving'
+    PARQUET_FORMAT: str = 'parquet'
+    SERIES_FORMAT: str = 'parquet_series'
+    NUMPY_FORMAT: str = 'npy'
+    PICKLE_FORMAT: str = 'pickle'
+    EXTENSIONS: dict[str, str] = {PARQUET_FORMAT: '.parquet', SERIES_FORMAT: '.parquet', NUMPY_FORMAT: '.npy',
+                                  PICKLE_FORMAT: '.pkl'}
+    # Series is saved as frame with one column
+    SERIES_COLUMN: str = 'series'
+    FILE_NAME_INVALID_CHARACTERS: str = r'[^\w.-]'
+    MAX_FILE_NAME_LENGTH: int = 64
+    NAME_HASH_LENGTH: int = 8
+
+    def __init__(self, project_directory: str) -> None:
+        self.project_directory: str = project_directory
+        self.directory: str = os.path.join(project_directory, VARIABLES_DIRECTORY_NAME)
+        # name of variable -> {"file": name of file, "format": format of file, "series_name": name of Series}
+        self._entries: dict[str, dict[str, Any]] = {}
+        # values, which were read or set
+        self._values: dict[str, Any] = {}
+        # variables set or removed since last saving
+        self._dirty: set[str] = set()
+        # variables are changed by thread of application, while they are saved by autosave thread
+        self._lock: threading.RLock = threading.RLock()
+        self._saving_lock: threading.Lock = threading.Lock()
+        # identifier of thread -> number of operations with variables running in it
+        self._operations: dict[int, int] = {}
+        self._operations_ended: threading.Condition = threading.Condition(self._lock)
+
+    @staticmethod
+    def get_manifest_path(project_directory: str) -> str:
+        return os.path.join(project_directory, VARIABLES_DIRECTORY_NAME, VariablesStore.MANIFEST_FILE_NAME)
+
+    def read(self) -> bool:
+        """
+        Read manifest of variables (values are read on access) or all variables of previous variables.pkl
+        :return: bool - were variables read (False also for project without variables)
+        """
+        self._entries = {}
+        self._values = {}
+        self._dirty = set()
+        try:
+            with open(VariablesStore.get_manifest_path(self.project_directory), encoding=ENCODING) as manifest_file:
+                manifest: dict = json.load(manifest_file)
+            if manifest.get('version') == VariablesStore.VERSION:
+                self._entries = manifest.get('variables', {})
+                return True
+        except (OSError, json.JSONDecodeError, AttributeError):
+            pass
+        try:
+            with open(os.path.join(self.project_directory, VARIABLES_FILE_NAME), 'rb') as legacy_file:
+                self._values = pickle.load(legacy_file)
+            self._dirty = set(self._values)
+            return True
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            self._values = {}
+            return False
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._values
+
+    @property
+    def is_dirty(self) -> bool:
+        return len(self._dirty) > 0
+
+    def mark_changed(self, name: str) -> None:
+        """
+        Variable will be saved, even if it wasn't set again (its value was changed in place)
+        """
+        with self._lock:
+            if name in self._values:
+                self._dirty.add(name)
+
+    @contextlib.contextmanager
+    def operation(self) -> Iterator['VariablesStore']:
+        """
+        Mark operation, which can change values in place (script, creator...), values aren't serialized
+        by saving until it ends. Operations in different threads can run at once.
+        """
+        thread_id: int = threading.get_ident()
+        with self._lock:
+            self._operations[thread_id] = self._operations.get(thread_id, 0) + 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._operations[thread_id] -= 1
+                if self._operations[thread_id] == 0:
+                    del self._operations[thread_id]
+                self._operations_ended.notify_all()
+
+    def _are_others_operating(self) -> bool:
+        return any(thread_id != threading.get_ident() for thread_id in self._operations)
+
+    @staticmethod
+    def get_fingerprint(value: Any) -> str | None:
+        """
+        :return: hash of pickled value or None, if value can't be pickled
+        """
+        try:
+            return hashlib.sha256(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).hexdigest()
+        except Exception:
+            return None
+
+    def get_fingerprints(self) -> dict[str, str | None]:
+        """
+        :return: fingerprints of loaded values (values, which weren't read, can't be changed in place)
+        """
+        with self._lock:
+            return {name: VariablesStore.get_fingerprint(value) for name, value in self._values.items()}
+
+    def mark_changed_since(self, fingerprints: dict[str, str | None]) -> list[str]:
+        """
+        Mark variables, whose values were changed in place since fingerprints were taken,
+        values loaded meanwhile and values, which can't be fingerprinted, are taken as changed
+        :return: names of marked variables
+        """
+        with self._lock:
+            changed: list[str] = [name for name, value in self._values.items()
+                                  if fingerprints.get(name) is None
+                                  or VariablesStore.get_fingerprint(value) != fingerprints[name]]
+            self._dirty.update(changed)
+        return changed
+
+    def _load(self, name: str) -> Any:
+        entry: dict[str, Any] = self._entries[name]
+        path: str = os.path.join(self.directory, entry['file'])
+        if entry['format'] in [VariablesStore.PARQUET_FORMAT, VariablesStore.SERIES_FORMAT]:
+            import pandas as pd
+            frame = pd.read_parquet(path)
+            if entry['format'] == VariablesStore.SERIES_FORMAT:
+                return frame[VariablesStore.SERIES_COLUMN].rename(entry.get('series_name'))
+            return frame
+        if entry['format'] == VariablesStore.NUMPY_FORMAT:
+            import numpy as np
+            return np.load(path, allow_pickle=False)
+        with open(path, 'rb') as value_file:
+            return pickle.load(value_file)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values:
+            if name not in self._entries:
+                raise KeyError(name)
+            try:
+                self._values[name] = self._load(name)
+            except Exception as exception:
+                raise KeyError(name) from exception
+        return self._values[name]
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        with self._lock:
+            self._values[name] = value
+            self._dirty.add(name)
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            if name not in self:
+                raise KeyError(name)
+            self._values.pop(name, None)
+            self._entries.pop(name, None)
+            self._dirty.add(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._values or name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(dict.fromkeys([*self._entries, *self._values])))
+
+    def __len__(self) -> int:
+        return len(self._entries.keys() | self._values.keys())
+
+    def clear(self) -> None:
+        # values aren't loaded only to be removed
+        with self._lock:
+            self._dirty.update(self)
+            self._entries = {}
+            self._values = {}
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self)})'
+
+    @staticmethod
+    def get_formats(value: Any) -> list[str]:
+        """
+        :return: formats, in which value can be saved, in order of preference
+        """
+        # value can't be DataFrame or array, if library isn't imported, so libraries aren't imported for check
+        pandas = sys.modules.get('pandas')
+        if pandas is not None:
+            if (isinstance(value, pandas.DataFrame)
+                    and all(isinstance(column, str) for column in value.columns)):
+                return [VariablesStore.PARQUET_FORMAT, VariablesStore.PICKLE_FORMAT]
+            if isinstance(value, pandas.Series) and (value.name is None or isinstance(value.name, str)):
+                return [VariablesStore.SERIES_FORMAT, VariablesStore.PICKLE_FORMAT]
+        numpy = sys.modules.get('numpy')
+        if numpy is not None and type(value) is numpy.ndarray and value.dtype != object:
+            return [VariablesStore.NUMPY_FORMAT, VariablesStore.PICKLE_FORMAT]
+        return [VariablesStore.PICKLE_FORMAT]
+
+    @staticmethod
+    def get_file_name(name: str, value_format: str) -> str:
+        readable_name: str = re.sub(VariablesStore.FILE_NAME_INVALID_CHARACTERS, '_', name)
+        name_hash: str = hashlib.sha1(name.encode(ENCODING)).hexdigest()[:VariablesStore.NAME_HASH_LENGTH]
+        return (f'{readable_name[:VariablesStore.MAX_FILE_NAME_LENGTH]}-{name_hash}'
+                f'{VariablesStore.EXTENSIONS[value_format]}')
+
+    @staticmethod
+    def _serialize(value: Any, value_format: str) -> bytes:
+        buffer: io.BytesIO = io.BytesIO()
+        if value_format == VariablesStore.PARQUET_FORMAT:
+            value.to_parquet(buffer)
+        elif value_format == VariablesStore.SERIES_FORMAT:
+            value.to_frame(VariablesStore.SERIES_COLUMN).to_parquet(buffer)
+        elif value_format == VariablesStore.NUMPY_FORMAT:
+            import numpy as np
+            np.save(buffer, value, allow_pickle=False)
+        else:
+            pickle.dump(value, buffer)
+        return buffer.getvalue()
+
+    @staticmethod
+    def serialize(value: Any) -> tuple[str, bytes] | None:
+        """
+        :return: format and serialized value or None, if value can't be serialized
+        """
+        for value_format in VariablesStore.get_formats(value):
+            try:
+                return value_format, VariablesStore._serialize(value, value_format)
+            except Exception:
+                # library for format is missing or value isn't supported by format (mixed types of column...)
+                continue
+        return None
+
+    def _take_serialized(self, name: str) -> tuple[bool, tuple[str, bytes] | None, Any]:
+        """
+        Serialize value of variable, when no operation of other thread can change it
+        :return: is variable still set, its format and serialized value (None if it can't be serialized)
+        and its value
+        """
+        with self._lock:
+            self._operations_ended.wait_for(lambda: not self._are_others_operating())
+            if name not in self._values:
+                return False, None, None
+            value: Any = self._values[name]
+            return True, VariablesStore.serialize(value), value
+
+    def write_variable(self, name: str, value: Any, value_format: str, data: bytes) -> dict[str, Any] | None:
+        """
+        Write serialized value of variable to its file (file is replaced at once)
+        :return: entry of variable in manifest or None, if file can't be written
+        """
+        file_name: str = VariablesStore.get_file_name(name, value_format)
+        path: str = os.path.join(self.directory, file_name)
+        temporary_path: str = f'{path}{VariablesStore.TEMPORARY_SUFFIX}'
+        try:
+            with open(temporary_path, 'wb') as value_file:
+                value_file.write(data)
+            os.replace(temporary_path, path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return None
+        entry: dict[str, Any] = {'file': file_name, 'format': value_format}
+        if value_format == VariablesStore.SERIES_FORMAT:
+            entry['series_name'] = value.name
+        return entry
+
+    def write_manifest(self, entries: dict[str, dict[str, Any]]) -> bool:
+        manifest_path: str = VariablesStore.get_manifest_path(self.project_directory)
+        temporary_path: str = f'{manifest_path}{VariablesStore.TEMPORARY_SUFFIX}'
+        try:
+            with open(temporary_path, 'w', encoding=ENCODING) as manifest_file:
+                json.dump({'version': VariablesStore.VERSION, 'variables': entries}, manifest_file, indent=4)
+            os.replace(temporary_path, manifest_path)
+            return True
+        except OSError:
+            return False
+
+    def remove_unused_files(self, entries: dict[str, dict[str, Any]]) -> None:
+        used_files: set[str] = {entry['file'] for entry in entries.values()} | {VariablesStore.MANIFEST_FILE_NAME}
+        for file_name in os.listdir(self.directory):
+            if file_name not in used_files:
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except OSError:
+                    pass
+
+    def save(self) -> bool:
+        """
+        Write variables set since last saving and manifest, files of removed variables are removed.
+        Variables, which weren't saved, stay marked to be saved next time
+        :return: bool - were all variables saved
+        """
+        with self._saving_lock:
+            manifest_path: str = VariablesStore.get_manifest_path(self.project_directory)
+            with self._lock:
+                if not self._dirty and os.path.exists(manifest_path):
+                    return True
+                dirty: set[str] = self._dirty
+                self._dirty = set()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+            except OSError:
+                with self._lock:
+                    self._dirty.update(dirty)
+                return False
+            written: dict[str, dict[str, Any]] = {}
+            failed: set[str] = set()
+            for name in dirty:
+                # only one serialized value is held at once, values set later are saved next time
+                is_set, serialized, value = self._take_serialized(name)
+                if not is_set:
+                    continue
+                entry: dict[str, Any] | None = (self.write_variable(name, value, *serialized)
+                                                if serialized is not None else None)
+                if entry is None:
+                    failed.add(name)
+                else:
+                    written[name] = entry
+            with self._lock:
+                for name, entry in written.items():
+                    if name in self:
+                        self._entries[name] = entry
+                self._dirty.update(failed)
+                entries: dict[str, dict[str, Any]] = dict(self._entries)
+            if not self.write_manifest(entries):
+                with self._lock:
+                    self._dirty.update(dirty)
+                return False
+            self.remove_unused_files(entries)
+            legacy_path: str = os.path.join(self.project_directory, VARIABLES_FILE_NAME)
+            if not failed and os.path.exists(legacy_path):
+                os.remove(legacy_path)
+            return not failed
@@ -0,0 +1,42 @@
+from collections.abc import MutableMapping, Iterator
+from typing import Any
+
+
+class VariablesWriteRecorder(MutableMapping):
+    """
+    View of variables, which records names of variables set through it - variables set by others
+    (concurrent steps of recipe...) or only read aren't recorded
+    """
+
+    def __init__(self, variables: dict[str, Any] | MutableMapping) -> None:
+        self.variables: dict[str, Any] | MutableMapping = variables
+        self.written_names: dict[str, None] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        return self.variables[name]
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self.variables[name] = value
+        self.record(name)
+
+    def record(self, name: str) -> None:
+        """
+        Record variable changed without setting (its value was changed in place)
+        """
+        self.written_names[name] = None
+
+    def __delitem__(self, name: str) -> None:
+        del self.variables[name]
+        self.written_names.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.variables
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.variables)
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def get_written_names(self) -> list[str]:
+        return list(self.written_names)
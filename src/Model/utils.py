@@ -3,10 +3,31 @@ import os
 from importlib.machinery import ModuleSpec
 from types import ModuleType
 
+from Model.SourceFiles.FileStateCache import FileStateCache
+
+SCRIPTS_CACHE_CAPACITY: int = 64
+# executed scripts are reused only by long-lived daemon (see DaemonServer), every other caller executes script again,
+# as its module level code can read data files or set up state
+scripts_cache: FileStateCache | None = None
+
+
+def set_scripts_reuse(is_enabled: bool) -> None:
+    """
+    :param is_enabled: should unchanged scripts be reused instead of being executed again
+    """
+    global scripts_cache
+    scripts_cache = FileStateCache(SCRIPTS_CACHE_CAPACITY) if is_enabled else None
+
 
 def path_to_module(module_path: str) -> ModuleType:
+    cache: FileStateCache | None = scripts_cache
+    state: tuple[int, int, int] | None = FileStateCache.get_file_state(module_path) if cache is not None else None
+    if cache is not None and (script := cache.get(module_path, state)) is not None:
+        return script
     module_name: str = os.path.basename(module_path)
     spec: ModuleSpec = importlib.util.spec_from_file_location(module_name, module_path)
     script: ModuleType = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(script)
+    if cache is not None:
+        cache.put(module_path, state, script)
     return script
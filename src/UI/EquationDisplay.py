@@ -0,0 +1,15 @@
+from PySide6.QtWidgets import QWidget, QPushButton, QDialog, QVBoxLayout, QLineEdit
+
+
+class EquationDisplay(QDialog):
+    def __init__(self, parent_widget: QWidget, equation: str) -> None:
+        super().__init__(parent_widget)
+        self.setWindowTitle('Equation')
+        self.setLayout(QVBoxLayout())
+        self.display: QLineEdit = QLineEdit()
+        self.display.setReadOnly(True)
+        self.display.setText(equation)
+        self.layout().addWidget(self.display)
+        self.ok_button: QPushButton = QPushButton('OK')
+        self.ok_button.clicked.connect(self.accept)
+        self.layout().addWidget(self.ok_button)
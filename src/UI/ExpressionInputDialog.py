@@ -0,0 +1,30 @@
+from PySide6.QtWidgets import QWidget, QGridLayout, QPushButton, QCheckBox
+
+from UI.PairInputsDialog import PairInputsDialog
+
+
+class ExpressionInputDialog(PairInputsDialog):
+    def __init__(self, parent_widget: QWidget) -> None:
+        super().__init__(parent_widget)
+        layout: QGridLayout = QGridLayout()
+        _, self.equation_varname = self.add_pair(0, 'Input variable name of equation: ', layout)
+        _, self.expression = self.add_pair(1, 'Input your equation: ', layout)
+        self.should_save_into_source_file: QCheckBox = QCheckBox('Save equation in source file')
+        self.add_one_element(2, self.should_save_into_source_file, layout)
+        self.should_display_in_dialog: QCheckBox = QCheckBox('Display on screen')
+        self.add_one_element(3, self.should_display_in_dialog, layout)
+        self.should_expand_with_existing_variables: QCheckBox = QCheckBox('Expand equation')
+        self.add_one_element(4, self.should_expand_with_existing_variables, layout)
+
+        self.ok_button: QPushButton = QPushButton('OK')
+        layout.addWidget(self.ok_button, 5, 0, 1, 2)
+
+        self.ok_button.clicked.connect(self.accept)
+        self.setLayout(layout)
+
+    def get_user_input(self) -> tuple[str, str, bool, bool, bool]:
+        return (self.equation_varname.text(),
+                self.expression.text(),
+                self.should_save_into_source_file.isChecked(),
+                self.should_display_in_dialog.isChecked(),
+                self.should_expand_with_existing_variables.isChecked())
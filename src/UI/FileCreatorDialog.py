@@ -0,0 +1,28 @@
+from PySide6.QtWidgets import QWidget, QDialog, QGridLayout, QLabel, QLineEdit, QPushButton
+
+
+class FileCreatorDialog(QDialog):
+    def __init__(self, parent_widget: QWidget):
+        super().__init__(parent_widget)
+        self.setWindowTitle('Document creator')
+        layout = QGridLayout()
+
+        self.title_label = QLabel('Title:')
+        self.title_input = QLineEdit(self)
+        layout.addWidget(self.title_label, 0, 0)
+        layout.addWidget(self.title_input, 0, 1)
+
+        self.extension_label = QLabel('Extension:')
+        self.extension_input = QLineEdit(self)
+        layout.addWidget(self.extension_label, 1, 0)
+        layout.addWidget(self.extension_input, 1, 1)
+
+        self.ok_button = QPushButton('OK', self)
+
+        layout.addWidget(self.ok_button, 2, 0, 1, 2)
+
+        self.setLayout(layout)
+        self.ok_button.clicked.connect(self.accept)
+
+    def get_user_input(self) -> tuple[str, str]:
+        return self.title_input.text().strip(), self.extension_input.text().strip()
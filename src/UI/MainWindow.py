@@ -4,10 +4,10 @@ from typing import Any
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import QMainWindow, QMenu, QGridLayout, QFrame, QVBoxLayout, QListWidget, QPushButton, QWidget, \
     QHBoxLayout, QLabel, QLineEdit, QCheckBox, QGroupBox, QListWidgetItem, QDialog, QMessageBox, QTextEdit, \
-    QTableWidget, QTableWidgetItem, QScrollArea
+    QTableWidget, QTableWidgetItem, QScrollArea, QAbstractItemView
 
 from Controller.Wrappers import FilepathWrapper, CreatorWrapper
-from Model.Creators.Creator import Creator
+from Model.Creators.CreatorsRegistry import CreatorEntry
 
 
 class DisplayPanel(QGroupBox):
@@ -86,6 +86,8 @@ class SourceFilesPanel(DisplayPanel):
 
     def __init__(self) -> None:
         super().__init__()
+        # several source files can be selected for partial build
+        self.list_widget.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.files_operations_section: AddRemButtonsSection = AddRemButtonsSection()
         self.layout().addWidget(self.files_operations_section)
 
@@ -150,6 +152,9 @@ class MainWindow(QMainWindow):
 
     GENERATE_TEX_TITLE: str = 'Generate .tex'
     GENERATE_TEX_AND_PDF: str = 'Generate .tex and pdf'
+    GENERATE_PARTIAL_PDF_TITLE: str = 'Generate pdf of selected source files'
+    CANCEL_BUILD_TITLE: str = 'Cancel pdf build'
+    BUILD_STARTED_MESSAGE: str = 'Building pdf...'
 
     SET_BASE_FILES_TITLE: str = 'Base files dir'
     SET_SOURCE_FILES_TITLE: str = 'Source files dir'
@@ -204,6 +209,13 @@ class MainWindow(QMainWindow):
         self.generate_tex_and_pdf: QAction = QAction(MainWindow.GENERATE_TEX_AND_PDF)
         self.generate_menu.addAction(self.generate_tex_and_pdf)
 
+        self.generate_partial_pdf: QAction = QAction(MainWindow.GENERATE_PARTIAL_PDF_TITLE)
+        self.generate_menu.addAction(self.generate_partial_pdf)
+
+        self.cancel_build: QAction = QAction(MainWindow.CANCEL_BUILD_TITLE)
+        self.cancel_build.setEnabled(False)
+        self.generate_menu.addAction(self.cancel_build)
+
     def _create_content_layout(self) -> None:
         self.main_widget = QWidget()
         self.setCentralWidget(self.main_widget)
@@ -229,19 +241,46 @@ class MainWindow(QMainWindow):
         self.generate_report_button.setMinimumHeight(MainWindow.MIN_HEIGHT_OF_LOWER_BAR)
         main_layout.addWidget(self.generate_report_button, 1, 1, 1, 2)
 
+    def set_build_running(self, is_running: bool) -> None:
+        # window stays responsive during build, only linking (it rewrites document being compiled)
+        # and starting another build are blocked
+        self.link_marks.setEnabled(not is_running)
+        self.generate_tex.setEnabled(not is_running)
+        self.generate_tex_and_pdf.setEnabled(not is_running)
+        self.generate_partial_pdf.setEnabled(not is_running)
+        self.generate_report_button.setEnabled(not is_running)
+        self.cancel_build.setEnabled(is_running)
+        if is_running:
+            self.show_status(MainWindow.BUILD_STARTED_MESSAGE)
+
+    def show_status(self, message: str) -> None:
+        self.statusBar().showMessage(message)
+
+    def _update_panel(self, panel: DisplayPanel, new_list: list[QListWidgetItem]) -> None:
+        panel.list_widget.clear()
+        for element in new_list:
+            panel.list_widget.addItem(element)
+
+    def update_creators_panel(self, creators_list: list[CreatorWrapper]) -> None:
+        self._update_panel(self.creators_panel, creators_list)
+
+    def update_base_files_panel(self, base_files: list[FilepathWrapper]) -> None:
+        self._update_panel(self.base_files_panel, base_files)
+
+    def update_source_files_panel(self, source_files: list[FilepathWrapper]) -> None:
+        self._update_panel(self.source_files_panel, source_files)
+
     def update_panels(self, creators_list: list[CreatorWrapper], base_files: list[FilepathWrapper],
                       source_files: list[FilepathWrapper]) -> None:
-        for panel, new_list in zip([self.creators_panel, self.base_files_panel, self.source_files_panel],
-                                   [creators_list, base_files, source_files]):
-            panel.list_widget.clear()
-            for element in new_list:
-                panel.list_widget.addItem(element)
+        self.update_creators_panel(creators_list)
+        self.update_base_files_panel(base_files)
+        self.update_source_files_panel(source_files)
 
     def _get_selected_items(self, panel: DisplayPanel) -> list[QListWidgetItem]:
         return panel.list_widget.selectedItems()
 
     @property
-    def selected_creator(self) -> Creator | None:
+    def selected_creator(self) -> CreatorEntry | None:
         selected_items = self._get_selected_items(self.creators_panel)
         if selected_items == []:
             return None
@@ -261,6 +300,10 @@ class MainWindow(QMainWindow):
             return None
         return selected_items[0].filepath
 
+    @property
+    def selected_source_files(self) -> list[str]:
+        return [item.filepath for item in self._get_selected_items(self.source_files_panel)]
+
     def create_failure_message_box(self, additional_message='') -> QDialog:
         OPERATION_FAILED_TEXT: str = 'Operation failure - tried operation couldn\'t be completed'
         WINDOW_TITLE: str = "Operation failure"
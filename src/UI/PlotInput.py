@@ -0,0 +1,31 @@
+from PySide6.QtWidgets import QWidget, QGridLayout, QPushButton, QCheckBox
+
+from UI.PairInputsDialog import PairInputsDialog
+
+
+class PlotInput(PairInputsDialog):
+    def __init__(self, parent_widget: QWidget) -> None:
+        super().__init__(parent_widget)
+        layout: QGridLayout = QGridLayout()
+        self.add_pair(0, 'Input output name:', layout)
+        self.add_pair(1, 'Input variable of x data:', layout)
+        self.add_pair(2, 'Input variable x axis label:', layout)
+        self.add_pair(3, 'Input variable of y data:', layout)
+        self.add_pair(4, 'Input y axis label:', layout)
+        self.add_pair(5, 'Input x errors variable name:', layout)
+        self.add_pair(6, 'Input y errors variable name:', layout)
+        self.add_pair(7, 'Input variable of regression result:', layout)
+
+        self.include_in_source_check_box: QCheckBox = QCheckBox('Include in source')
+        layout.addWidget(self.include_in_source_check_box, 8, 0, 1, 2)
+
+        self.ok_button: QPushButton = QPushButton('OK')
+        layout.addWidget(self.ok_button, 9, 0, 1, 2)
+
+        self.setLayout(layout)
+
+        self.ok_button.clicked.connect(self.accept)
+
+    def get_input(self) -> tuple[list[str], bool]:
+        return [self.layout().itemAtPosition(i, 1).widget().text() for i in
+                range(8)], self.include_in_source_check_box.isChecked()
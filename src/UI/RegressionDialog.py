@@ -0,0 +1,45 @@
+from PySide6.QtWidgets import QWidget, QGridLayout, QPushButton, QCheckBox
+
+from UI.PairInputsDialog import PairInputsDialog
+
+
+class RegressionDialog(PairInputsDialog):
+    def __init__(self, parent_widget: QWidget):
+        super().__init__(parent_widget)
+        self.setWindowTitle('Conduct regression')
+        layout = QGridLayout()
+
+        self.add_pair(0, 'Input name of variable with data:', layout)
+        self.add_pair(1, 'Input name of variable with prediction results:', layout)
+        self.add_pair(2, 'Input name of saved results:', layout)
+
+        self.save_as_source_file_check: QCheckBox = QCheckBox('Save in source file')
+        layout.addWidget(self.save_as_source_file_check, 3, 0, 1, 2)
+
+        self.changing_visible_rows_start_index = 4
+
+        self.add_pair(4, 'Input coefficient header:', layout)
+        self.add_pair(5, 'Input coefficient error header:', layout)
+        self.add_pair(6, 'Input intercept header:', layout)
+        self.add_pair(7, 'Input intercept error header:', layout)
+
+        self.changing_visible_rows_end_index = 7
+
+        self.ok_button: QPushButton = QPushButton('OK')
+        layout.addWidget(self.ok_button, 8, 0, 1, 2)
+
+        self.setLayout(layout)
+
+        self.change_visibility(False)
+
+        self.save_as_source_file_check.clicked.connect(
+            lambda: self.change_visibility(self.save_as_source_file_check.isChecked()))
+        self.ok_button.clicked.connect(self.accept)
+
+    def change_visibility(self, new_visible_stance: bool):
+        for i in range(self.changing_visible_rows_start_index, self.changing_visible_rows_end_index + 1):
+            self.layout().itemAtPosition(i, 0).widget().setVisible(new_visible_stance)
+            self.layout().itemAtPosition(i, 1).widget().setVisible(new_visible_stance)
+
+    def get_user_input(self) -> list[str]:
+        return [self.layout().itemAtPosition(i, 1).widget().text() for i in range(9) if i!=3 and i!=8]
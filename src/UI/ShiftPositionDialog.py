@@ -0,0 +1,36 @@
+from PySide6.QtGui import QIntValidator
+from PySide6.QtWidgets import QDialog, QGridLayout, QLabel, QLineEdit, QPushButton
+
+
+class ShiftPositionDialog(QDialog):
+    def __init__(self, lower_bound: int, upper_bound: int) -> None:
+        super().__init__()
+        self.setWindowTitle('Source file shifter')
+        self.layout = QGridLayout()
+
+        self.current_position_label: QLabel = QLabel('Current position of file')
+        self.current_position_input: QLineEdit = QLineEdit(self)
+        self.current_position_input.setValidator(QIntValidator(self))
+        self.layout.addWidget(self.current_position_label, 0, 0)
+        self.layout.addWidget(self.current_position_input, 0, 1)
+
+        self.next_position_label: QLabel = QLabel('Next position of file')
+        self.next_position_input: QLineEdit = QLineEdit(self)
+        self.next_position_input.setValidator(QIntValidator(self))
+        self.layout.addWidget(self.next_position_label, 1, 0)
+        self.layout.addWidget(self.next_position_input, 1, 1)
+
+        self.ok_button = QPushButton('OK', self)
+
+        self.layout.addWidget(self.ok_button, 2, 0, 1, 2)
+
+        self.setLayout(self.layout)
+        self.ok_button.clicked.connect(self.accept)
+        self.set_bounds(lower_bound, upper_bound)
+
+    def set_bounds(self, lower_bound: int, upper_bound: int) -> None:
+        for position_input in [self.current_position_input, self.next_position_input]:
+            position_input.validator().setRange(lower_bound, upper_bound)
+
+    def get_user_input(self) -> tuple[str, str]:
+        return self.current_position_input.text(), self.next_position_input.text()
@@ -0,0 +1,24 @@
+from PySide6.QtWidgets import QDialog, QWidget, QGridLayout, QLabel, QLineEdit, QPushButton
+
+from Model.Creators.TextEditorSelector import TextEditorSelector
+
+
+class TextEditorCommandDialog(QDialog):
+    def __init__(self, parent_widget: QWidget):
+        super().__init__(parent_widget)
+        self.setWindowTitle(TextEditorSelector.TITLE)
+        layout = QGridLayout()
+
+        self.title_label = QLabel('Code editor command:')
+        self.text_editor_command_input = QLineEdit(self)
+        layout.addWidget(self.title_label, 0, 0)
+        layout.addWidget(self.text_editor_command_input, 0, 1)
+
+        self.ok_button = QPushButton('OK', self)
+        layout.addWidget(self.ok_button, 4, 0, 1, 2)
+
+        self.setLayout(layout)
+        self.ok_button.clicked.connect(self.accept)
+
+    def get_user_input(self) -> str:
+        return self.text_editor_command_input.text().strip()
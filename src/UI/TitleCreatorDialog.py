@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from PySide6.QtCore import QDate
+from PySide6.QtWidgets import QWidget, QDialog, QGridLayout, QLabel, QLineEdit, QPushButton, QDateEdit
+
+
+class TitleCreatorDialog(QDialog):
+    def __init__(self, parent_widget: QWidget):
+        super().__init__(parent_widget)
+        self.setWindowTitle('Document creator')
+        layout = QGridLayout()
+
+        self.title_label = QLabel('Title:')
+        self.title_input = QLineEdit(self)
+        layout.addWidget(self.title_label, 0, 0)
+        layout.addWidget(self.title_input, 0, 1)
+
+        self.author_label = QLabel('Author:')
+        self.author_input = QLineEdit(self)
+        layout.addWidget(self.author_label, 1, 0)
+        layout.addWidget(self.author_input, 1, 1)
+
+        self.group_label = QLabel('Group:')
+        self.group_input = QLineEdit(self)
+        layout.addWidget(self.group_label, 2, 0)
+        layout.addWidget(self.group_input, 2, 1)
+
+        self.date_label = QLabel('Date:')
+        self.date_input: QDateEdit = QDateEdit(self)
+        self.date_input.setDate(QDate.currentDate())
+        layout.addWidget(self.date_label, 3, 0)
+        layout.addWidget(self.date_input, 3, 1)
+
+        self.ok_button = QPushButton('OK', self)
+
+        layout.addWidget(self.ok_button, 4, 0, 1, 2)
+
+        self.setLayout(layout)
+        self.ok_button.clicked.connect(self.accept)
+
+    def get_user_input(self) -> tuple[str, str, str, datetime]:
+        return self.title_input.text().strip(), self.author_input.text().strip(), self.group_input.text().strip(), self.date_input.date().toPython()
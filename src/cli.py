@@ -0,0 +1,7 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.Controller.CommandLineController import command_line_function
+
+if __name__ == '__main__':
+    sys.exit(command_line_function())
@@ -2,6 +2,8 @@ ENCODING='utf-8'
 SETTINGS_FILE_NAME = "settings.json"
 
 VARIABLES_FILE_NAME="variables.pkl"
+VARIABLES_DIRECTORY_NAME="variables"
+ORDER_MANIFEST_NAME="order.json"
 
 BASE_FILES: str = "baseFiles"
 SOURCE_FILES: str = "sourceFiles"
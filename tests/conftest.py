@@ -0,0 +1,5 @@
+import os
+import sys
+
+# modules of application are imported as in src/main.py - relatively to src
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,51 @@
+import os
+import time
+
+from Model.Building.BuildCache import BuildCache
+
+
+def write(filepath: str, content: str) -> None:
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as file:
+        file.write(content)
+
+
+def test_key_changes_with_asset_outside_of_output_directory(tmp_path):
+    generated_directory: str = os.path.join(tmp_path, 'generatedFiles')
+    plot_path: str = os.path.join(tmp_path, 'baseFiles', 'plot.png')
+    document_path: str = os.path.join(generated_directory, 'main.tex')
+    write(plot_path, 'first plot')
+    write(document_path, '\\includegraphics[width=0.5\\linewidth]{../baseFiles/plot}\n')
+    cache: BuildCache = BuildCache(generated_directory)
+
+    assert os.path.join('..', 'baseFiles', 'plot.png') in cache.find_assets(document_path)
+    first_key: str | None = cache.compute_key(document_path)
+    # modification time differs even on file systems with coarse timestamps
+    time.sleep(0.01)
+    write(plot_path, 'second plot')
+    assert cache.compute_key(document_path) != first_key
+
+
+def test_key_changes_with_absolute_input(tmp_path):
+    generated_directory: str = os.path.join(tmp_path, 'generatedFiles')
+    input_path: str = os.path.join(tmp_path, 'chapter.tex')
+    document_path: str = os.path.join(generated_directory, 'main.tex')
+    write(input_path, 'first')
+    write(document_path, f'\\input{{{input_path}}}\n')
+    cache: BuildCache = BuildCache(generated_directory)
+
+    first_key: str | None = cache.compute_key(document_path)
+    time.sleep(0.01)
+    write(input_path, 'second version')
+    assert cache.compute_key(document_path) != first_key
+    assert not any(name.startswith('..') or os.path.isabs(name) for name in cache.get_output_names(document_path))
+
+
+def test_key_changes_with_version_of_compiler(tmp_path):
+    generated_directory: str = os.path.join(tmp_path, 'generatedFiles')
+    document_path: str = os.path.join(generated_directory, 'main.tex')
+    write(document_path, 'document\n')
+    cache: BuildCache = BuildCache(generated_directory)
+
+    assert (cache.compute_key(document_path, [], 'pdfTeX 3.141592653-2.6-1.40.25')
+            != cache.compute_key(document_path, [], 'pdfTeX 3.141592653-2.6-1.40.26'))
@@ -0,0 +1,78 @@
+import os
+from typing import Any
+
+from Model.Creators.Creator import Creator
+from Model.Variables.VariablesConsumer import VariablesConsumer
+from settings_namespace import BASE_FILES, SOURCE_FILES, GENERATED_FILES
+
+
+class ScaleCreator(Creator, VariablesConsumer):
+    PARAMETERS: list[str] = ['factor']
+
+    def __init__(self, settings: dict[str, str]) -> None:
+        super().__init__(settings, None)
+        self.factor: int = 1
+        self.runs: int = 0
+
+    def get_title(self) -> str:
+        return 'scale'
+
+    def create_use_dialog(self) -> None:
+        pass
+
+    def set_data(self) -> None:
+        pass
+
+    def validate_data(self) -> bool:
+        return True
+
+    def get_input_fingerprint(self) -> str | None:
+        return self.create_fingerprint(['x'], [])
+
+    def perform_operations(self) -> bool:
+        self.runs += 1
+        # value only read by creator isn't its output
+        _ = self.variables['unrelated']
+        self.variables['y'] = self.variables['x'] * self.factor
+        with open(os.path.join(self.settings[SOURCE_FILES], 'scaled.tex'), 'w', encoding='utf-8') as file:
+            file.write(str(self.variables['y']))
+        self.record_written_file(SOURCE_FILES, 'scaled.tex')
+        return True
+
+
+def create_settings(directory: str) -> dict[str, str]:
+    settings: dict[str, str] = {directory_type: os.path.join(directory, directory_type)
+                                for directory_type in [BASE_FILES, SOURCE_FILES, GENERATED_FILES]}
+    for path in settings.values():
+        os.makedirs(path)
+    return settings
+
+
+def run(settings: dict[str, str], variables: dict[str, Any]) -> ScaleCreator:
+    creator: ScaleCreator = ScaleCreator(settings)
+    creator.set_variables(variables)
+    assert creator.perform_with_parameters({'factor': 2})
+    return creator
+
+
+def test_cached_result_contains_only_outputs_of_creator(tmp_path):
+    settings: dict[str, str] = create_settings(str(tmp_path))
+    variables: dict[str, Any] = {'x': 3, 'unrelated': 'first'}
+    assert run(settings, variables).runs == 1
+
+    variables['y'] = 0
+    # variable set meanwhile by someone else isn't restored from cache
+    variables['unrelated'] = 'second'
+    assert run(settings, variables).runs == 0
+    assert variables == {'x': 3, 'unrelated': 'second', 'y': 6}
+
+
+def test_edited_output_isnt_overwritten(tmp_path):
+    settings: dict[str, str] = create_settings(str(tmp_path))
+    variables: dict[str, Any] = {'x': 3, 'unrelated': None}
+    run(settings, variables)
+    output_path: str = os.path.join(settings[SOURCE_FILES], 'scaled.tex')
+    with open(output_path, 'w', encoding='utf-8') as file:
+        file.write('edited by user')
+
+    assert run(settings, variables).runs == 1
@@ -0,0 +1,17 @@
+from Model.Creators.CreatorsRegistry import CreatorsRegistry, CreatorEntry
+
+
+def test_titles_are_read_from_creators_without_importing_them():
+    registry: CreatorsRegistry = CreatorsRegistry()
+    entry: CreatorEntry | None = registry.find('Linear regression creator')
+    assert entry is not None and entry.class_name == 'RegressionConductor' and not entry.is_loaded
+    assert registry.find('TableCreator').title == 'Table Creator'
+    # every creator of application declares its title
+    assert all(entry.title != entry.class_name for entry in registry.list_creators())
+
+
+def test_title_of_creator_without_title_constant_is_not_read(tmp_path):
+    module_path: str = str(tmp_path / 'MyCreator.py')
+    with open(module_path, 'w') as module_file:
+        module_file.write('class MyCreator:\n    PARAMETERS: list[str] = []\n')
+    assert CreatorsRegistry.read_title(module_path) is None
@@ -0,0 +1,47 @@
+import os
+
+from Model.Building.BuildResult import BuildResult
+from Model.Building.BuildRunner import BuildRunner
+from Model.Building.FragmentsCompiler import FragmentsCompiler
+
+
+def test_only_errors_of_fragment_are_remembered_as_failure():
+    assert FragmentsCompiler.is_failure_of_fragment(
+        BuildResult(1, errors=['./fragment.tex:3: Undefined control sequence.']))
+    assert not FragmentsCompiler.is_failure_of_fragment(BuildResult(errors=[BuildRunner.COMPILER_NOT_FOUND_ERROR]))
+    assert not FragmentsCompiler.is_failure_of_fragment(
+        BuildResult(1, errors=["./fragment.tex:2: LaTeX Error: File `siunitx.sty' not found."]))
+    assert not FragmentsCompiler.is_failure_of_fragment(BuildResult(1, was_cancelled=True, errors=['Emergency stop.']))
+
+
+def test_caption_rows_of_longtable_stay_in_document():
+    body: str = ('\\begin{longtable}{lr}\n\\caption{Results} \\label{tab:Results} \\\\\n\\toprule\n\\endfirsthead\n'
+                 '\\caption[]{Results} \\\\\n\\toprule\n\\endhead\n0 & 1 \\\\\n\\end{longtable}\n')
+    assert FragmentsCompiler.is_page_fragment(body)
+    compiled_body, caption_rows = FragmentsCompiler.split_caption_rows(body)
+    assert '\\caption' not in compiled_body and '\\label' not in compiled_body
+    assert caption_rows == ['\\caption{Results} \\label{tab:Results} \\\\', '\\caption[]{Results} \\\\']
+    pages_table: str = FragmentsCompiler.create_pages_table('.fragments/table.pdf', 2, caption_rows)
+    assert pages_table.startswith('\\begin{longtable}')
+    assert '\\label{tab:Results}' in pages_table
+    assert '\\includegraphics[page=2]{.fragments/table.pdf}' in pages_table
+
+
+def test_fragments_of_other_documents_are_evicted_only_over_size_limit(tmp_path):
+    compiler: FragmentsCompiler = FragmentsCompiler(str(tmp_path), max_cache_size=30)
+    os.makedirs(compiler.directory)
+    names: list[str] = [character * 64 for character in 'abc']
+    for age, name in enumerate(names):
+        for extension in ['pdf', 'tex']:
+            path: str = os.path.join(compiler.directory, f'{name}.{extension}')
+            with open(path, 'w') as fragment_file:
+                fragment_file.write('x' * 5)
+            os.utime(path, ns=(age * 10 ** 9, age * 10 ** 9))
+    # fragments of other document fit into cache
+    compiler.evict({names[0]})
+    assert len(os.listdir(compiler.directory)) == 6
+    # the oldest fragment, which isn't used, is evicted first
+    compiler.max_cache_size = 25
+    compiler.evict({names[0]})
+    assert sorted(os.listdir(compiler.directory)) == sorted(f'{name}.{extension}' for name in [names[0], names[2]]
+                                                            for extension in ['pdf', 'tex'])
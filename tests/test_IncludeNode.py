@@ -0,0 +1,28 @@
+import os
+
+from Model.SourceFiles.FileStateCache import FileStateCache
+from Model.SourceFiles.IncludeNode import IncludeNode
+from Model.SourceFiles.SourceFile import SourceFile
+
+
+def test_linked_content_is_taken_from_content_cache_and_read_file_is_cached(tmp_path):
+    main_path: str = str(tmp_path / 'main.tex')
+    with open(main_path, 'w') as main_file:
+        main_file.write('begin \\input{part} end')
+    part_path: str = str(tmp_path / 'part.tex')
+    with open(part_path, 'w') as part_file:
+        part_file.write('part')
+    # state of file modified just now isn't trusted by cache
+    os.utime(part_path, (0, 0))
+    SourceFile.content_cache.clear()
+    SourceFile.update_caches(main_path, 'begin \\input{part} end')
+    node: IncludeNode = IncludeNode(SourceFile(main_path))
+    child: IncludeNode = IncludeNode(SourceFile(part_path))
+    node.attach('part', child)
+    # part.tex isn't cached yet, it is read and put to cache while tree is walked
+    assert ''.join(node.iter_chunks()) == 'begin part end'
+    assert SourceFile.content_cache.get(part_path, FileStateCache.get_file_state(part_path)) == 'part'
+    # cached content of main.tex is used instead of file
+    SourceFile.content_cache.put(main_path, FileStateCache.get_file_state(main_path), 'BEGIN \\input{part} END',
+                                 is_recent_trusted=True)
+    assert ''.join(node.iter_chunks()) == 'BEGIN part END'
@@ -0,0 +1,16 @@
+from Model.Building.LatexLogParser import LatexLogParser
+from Model.Building.PreambleFormat import PreambleFormat
+
+
+def test_format_of_upgraded_compiler_has_another_name():
+    preamble: str = f'\\documentclass{{article}}\n{PreambleFormat.END_OF_DUMP}'
+    assert (PreambleFormat.get_format_name(preamble, 'pdfTeX 3.141592653-2.6-1.40.25 (TeX Live 2023)')
+            != PreambleFormat.get_format_name(preamble, 'pdfTeX 3.141592653-2.6-1.40.26 (TeX Live 2024)'))
+
+
+def test_format_which_cant_be_loaded_is_reported():
+    parser: LatexLogParser = LatexLogParser()
+    parser.feed('---! /project/generatedFiles/.formats/preamble-0123456789abcdef.fmt was written by pdftex\n')
+    parser.feed("(Fatal format file error; I'm stymied)\n")
+    assert parser.has_format_error
+    assert parser.errors
@@ -0,0 +1,10 @@
+from Model.Pipeline.RecipeStep import RecipeStep
+
+
+def test_script_runs_concurrently_only_if_it_opted_in_without_output_files():
+    script: dict = {'name': 'prepare', 'script': 'baseFiles/prepare.py', 'outputs': {'variables': ['x']}}
+    assert not RecipeStep.from_dict(script).can_run_concurrently
+    assert RecipeStep.from_dict({**script, 'concurrent': True}).can_run_concurrently
+    assert not RecipeStep.from_dict({**script, 'concurrent': True,
+                                     'outputs': {'files': ['baseFiles/x.csv']}}).can_run_concurrently
+    assert RecipeStep.from_dict({**script, 'concurrent': 'yes'}) is None
@@ -0,0 +1,20 @@
+import os
+
+from Model.SourceFiles.SourceFilesTransaction import SourceFilesTransaction
+
+
+def test_failed_replacement_restores_already_replaced_files_and_renames(tmp_path):
+    first_path: str = str(tmp_path / 'first.tex')
+    renamed_path: str = str(tmp_path / 'renamed.tex')
+    with open(first_path, 'w') as first_file:
+        first_file.write('previous')
+    # file can't replace non-empty directory
+    os.makedirs(tmp_path / 'second.tex' / 'nested')
+    transaction: SourceFilesTransaction = SourceFilesTransaction()
+    transaction.write(first_path, 'new')
+    transaction.write(str(tmp_path / 'second.tex'), 'new')
+    transaction.rename(first_path, renamed_path)
+    assert not transaction.commit()
+    with open(first_path) as first_file:
+        assert first_file.read() == 'previous'
+    assert sorted(os.listdir(tmp_path)) == ['first.tex', 'second.tex']
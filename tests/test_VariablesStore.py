@@ -0,0 +1,15 @@
+from Model.Variables.VariablesStore import VariablesStore
+
+
+def test_only_variables_changed_in_place_are_saved_again(tmp_path):
+    store: VariablesStore = VariablesStore(str(tmp_path))
+    store['changed'] = [1]
+    store['unchanged'] = {'x': 1}
+    assert store.save()
+    fingerprints: dict[str, str | None] = store.get_fingerprints()
+    store['changed'].append(2)
+    assert store.mark_changed_since(fingerprints) == ['changed']
+    assert store.save()
+    reopened: VariablesStore = VariablesStore(str(tmp_path))
+    assert reopened.read()
+    assert reopened['changed'] == [1, 2]